@@ -0,0 +1,3 @@
+"""
+Micro-benchmarks for performance-sensitive code paths
+"""
@@ -0,0 +1,104 @@
+"""
+Compare the dict decoding path with typed record decoding.
+
+Builds synthetic SuiVision pool and collection payloads shaped like the real
+responses (including the fields the bot never reads), then measures decode
+time, peak traced memory while decoding, and memory retained by the result
+for:
+
+* ``dict``    - ``json.loads`` and keep the nested dicts (the old path)
+* ``records`` - ``decode_list`` into ``__slots__`` records
+
+Usage:
+    python -m benchmarks.decoding_benchmark [--items 50000] [--repeat 5]
+"""
+import argparse
+import gc
+import json
+import random
+import time
+import tracemalloc
+from typing import Callable, Dict, Tuple
+
+from src.blockchain.decoding import JSON_BACKEND, FarmingPool, NftCollection, decode_list
+
+
+def make_pools(count: int) -> bytes:
+    rng = random.Random(1)
+    return json.dumps({"pools": [{
+        "name": f"POOL-{i}",
+        "apr": rng.uniform(0, 200),
+        "tvl": rng.uniform(1e3, 1e8),
+        "pool_id": f"0x{i:064x}",
+        "coin_type_a": "0x2::sui::SUI",
+        "coin_type_b": f"0x{i:040x}::coin::COIN",
+        "fee_rate": 2500,
+        "volume_24h": rng.uniform(0, 1e7),
+        "rewards": [{"coin": "0x2::sui::SUI", "apr": rng.uniform(0, 50)}],
+        "created_at": "2024-03-27T12:00:00Z"
+    } for i in range(count)]}).encode()
+
+
+def make_collections(count: int) -> bytes:
+    rng = random.Random(2)
+    return json.dumps({"collections": [{
+        "name": f"Collection {i}",
+        "volume": rng.uniform(0, 1e6),
+        "floor_price": rng.uniform(0, 1e3),
+        "collection_id": f"0x{i:064x}",
+        "description": "A collection of capybaras " * 4,
+        "image_url": f"https://example.com/{i}.png",
+        "holders": rng.randint(1, 10000),
+        "supply": rng.randint(1, 10000)
+    } for i in range(count)]}).encode()
+
+
+def measure(fn: Callable[[], object], repeat: int) -> Tuple[float, int, int]:
+    """Return (best decode seconds, peak traced bytes, bytes retained by the result)."""
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+        del result
+
+    gc.collect()
+    tracemalloc.start()
+    result = fn()
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return best, peak, retained
+
+
+def run(items: int, repeat: int) -> Dict[str, Dict[str, Tuple[float, int, int]]]:
+    payloads = {
+        "pools": (make_pools(items), "pools", FarmingPool),
+        "collections": (make_collections(items), "collections", NftCollection)
+    }
+    results = {}
+    for label, (raw, key, record_type) in payloads.items():
+        results[label] = {
+            "dict": measure(lambda: json.loads(raw)[key], repeat),
+            "records": measure(lambda: decode_list(raw, key, record_type), repeat)
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"items={args.items} repeat={args.repeat} json_backend={JSON_BACKEND}")
+    for label, paths in run(args.items, args.repeat).items():
+        for path, (seconds, peak, retained) in paths.items():
+            print(f"{label:<12} {path:<8} decode={seconds * 1000:8.1f} ms  "
+                  f"peak={peak / 1e6:7.1f} MB  retained={retained / 1e6:7.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -24,6 +24,9 @@ setup(
         "textblob==0.17.1"
     ],
     extras_require={
+        'fast': [
+            "orjson>=3.8.0"
+        ],
         'dev': [
             "pytest>=7.0.0",
             "pytest-asyncio>=0.21.0",
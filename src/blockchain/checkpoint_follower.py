@@ -0,0 +1,228 @@
+"""
+Incremental on-chain ingestion from Sui checkpoints.
+
+The follower pages through ``sui_getCheckpoints`` from a saved cursor and
+loads each checkpoint's transactions with ``sui_multiGetTransactionBlocks``.
+Up to ``prefetch`` checkpoints are fetched ahead concurrently; a semaphore
+applies backpressure so a slow consumer pauses fetching instead of
+buffering without limit. Checkpoints are handed to consumers strictly in
+order and the cursor is persisted only after every consumer saw a
+checkpoint, so a restart resumes where it stopped without re-reading history.
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from src.config.settings import (
+    CHECKPOINT_CURSOR_PATH,
+    CHECKPOINT_PAGE_SIZE,
+    CHECKPOINT_PREFETCH,
+    CHECKPOINT_POLL_INTERVAL,
+    VOLUME_STATS_WINDOW
+)
+from src.blockchain.decoding import BalanceChange, RpcError, SuiTransaction
+from src.utils.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+FOLLOWER_CURSOR = registry.gauge("checkpoint_follower_cursor", "Last checkpoint handed to all consumers")
+CHECKPOINTS_PROCESSED = registry.counter("checkpoints_processed_total", "Checkpoints ingested")
+TRANSACTIONS_INGESTED = registry.counter("transactions_ingested_total", "Transactions ingested from checkpoints")
+
+# sui_multiGetTransactionBlocks accepts at most this many digests per call
+MULTI_GET_LIMIT = 50
+TX_OPTIONS = {"showInput": True, "showEffects": True, "showBalanceChanges": True}
+
+Consumer = Callable[[int, List[SuiTransaction]], Awaitable[None]]
+
+
+class CheckpointFollower:
+    """Follow the chain checkpoint by checkpoint and fan transactions out to consumers."""
+
+    def __init__(self, rpc, cursor_path: str = CHECKPOINT_CURSOR_PATH,
+                 page_size: int = CHECKPOINT_PAGE_SIZE, prefetch: int = CHECKPOINT_PREFETCH,
+                 poll_interval: float = CHECKPOINT_POLL_INTERVAL):
+        """
+        Args:
+            rpc: Client exposing ``call(method, params)`` and ``batch_call(calls)``, e.g. SuiTool
+            cursor_path: JSON file holding the last processed checkpoint
+            page_size: Checkpoints requested per ``sui_getCheckpoints`` page
+            prefetch: Checkpoints whose transactions may be in flight ahead of the consumers
+            poll_interval: Seconds to wait for new checkpoints once caught up
+        """
+        self.rpc = rpc
+        self.cursor_path = cursor_path
+        self.page_size = page_size
+        self.prefetch = prefetch
+        self.poll_interval = poll_interval
+        self.cursor: Optional[int] = self._load_cursor()
+        self._consumers: List[Consumer] = []
+
+    def subscribe(self, consumer: Consumer):
+        """Register a coroutine called as ``consumer(checkpoint, transactions)``."""
+        self._consumers.append(consumer)
+
+    def _load_cursor(self) -> Optional[int]:
+        try:
+            with open(self.cursor_path) as f:
+                return int(json.load(f)["checkpoint"])
+        except FileNotFoundError:
+            return None
+        except (ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable checkpoint cursor {self.cursor_path}: {str(e)}")
+            return None
+
+    def _save_cursor(self):
+        directory = os.path.dirname(self.cursor_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.cursor_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"checkpoint": self.cursor, "saved_at": time.time()}, f)
+        os.replace(tmp_path, self.cursor_path)
+
+    async def _fetch_transactions(self, checkpoint: Dict[str, Any]) -> List[SuiTransaction]:
+        sequence = int(checkpoint["sequenceNumber"])
+        digests = checkpoint.get("transactions") or []
+        if not digests:
+            return []
+        calls = [
+            ("sui_multiGetTransactionBlocks", [digests[i:i + MULTI_GET_LIMIT], TX_OPTIONS])
+            for i in range(0, len(digests), MULTI_GET_LIMIT)
+        ]
+        transactions = []
+        for result in await self.rpc.batch_call(calls):
+            if isinstance(result, RpcError):
+                raise result
+            transactions.extend(SuiTransaction.from_rpc(block, sequence) for block in result or [])
+        return transactions
+
+    async def _produce(self, queue: "asyncio.Queue[Tuple[Dict[str, Any], asyncio.Future]]",
+                       slots: asyncio.Semaphore):
+        """Page through checkpoints, starting a transaction fetch for each one."""
+        cursor = self.cursor
+        while True:
+            try:
+                page = await self.rpc.call("sui_getCheckpoints", [str(cursor), self.page_size, False])
+            except Exception as e:
+                logger.warning(f"Error fetching checkpoints after {cursor}: {str(e)}")
+                await asyncio.sleep(self.poll_interval)
+                continue
+            checkpoints = (page or {}).get("data") or []
+            for checkpoint in checkpoints:
+                # Blocks while ``prefetch`` checkpoints are fetched but not yet consumed
+                await slots.acquire()
+                queue.put_nowait((checkpoint, asyncio.ensure_future(self._fetch_transactions(checkpoint))))
+                cursor = int(checkpoint["sequenceNumber"])
+            if not (page or {}).get("hasNextPage"):
+                await asyncio.sleep(self.poll_interval)
+
+    async def _dispatch(self, sequence: int, transactions: List[SuiTransaction]):
+        results = await asyncio.gather(
+            *(consumer(sequence, transactions) for consumer in self._consumers),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Error in checkpoint consumer at {sequence}: {str(result)}")
+
+    async def run(self):
+        """Follow the chain until cancelled."""
+        # First run: start at the tip rather than replaying history
+        while self.cursor is None:
+            try:
+                self.cursor = int(await self.rpc.call("sui_getLatestCheckpointSequenceNumber", []))
+            except Exception as e:
+                logger.warning(f"Error fetching the latest checkpoint: {str(e)}")
+                await asyncio.sleep(self.poll_interval)
+                continue
+            self._save_cursor()
+            logger.info(f"Checkpoint follower starting at {self.cursor}")
+
+        queue: "asyncio.Queue[Tuple[Dict[str, Any], asyncio.Future]]" = asyncio.Queue()
+        slots = asyncio.Semaphore(self.prefetch)
+        producer = asyncio.ensure_future(self._produce(queue, slots))
+        try:
+            while True:
+                checkpoint, fetch = await queue.get()
+                sequence = int(checkpoint["sequenceNumber"])
+                while True:
+                    try:
+                        transactions = await fetch
+                        break
+                    except Exception as e:
+                        # The cursor cannot move past a checkpoint we failed to read
+                        logger.warning(f"Error fetching transactions for checkpoint {sequence}: {str(e)}")
+                        await asyncio.sleep(self.poll_interval)
+                        fetch = asyncio.ensure_future(self._fetch_transactions(checkpoint))
+
+                await self._dispatch(sequence, transactions)
+                slots.release()
+                self.cursor = sequence
+                self._save_cursor()
+                FOLLOWER_CURSOR.set(sequence)
+                CHECKPOINTS_PROCESSED.inc()
+                TRANSACTIONS_INGESTED.inc(len(transactions))
+        finally:
+            producer.cancel()
+            while not queue.empty():
+                queue.get_nowait()[1].cancel()
+
+
+class VolumeStats:
+    """Rolling per-coin volume over the last ``window`` seconds of ingested transactions."""
+
+    def __init__(self, window: float = VOLUME_STATS_WINDOW):
+        self.window = window
+        self._events: Deque[Tuple[float, str, int]] = deque()
+        self._totals: Dict[str, int] = {}
+        self._counts: Dict[str, int] = {}
+
+    async def __call__(self, checkpoint: int, transactions: List[SuiTransaction]):
+        latest = 0.0
+        for tx in transactions:
+            latest = max(latest, tx.timestamp)
+            for change in tx.balance_changes:
+                # Count each transfer once, on the receiving side
+                if change.amount > 0:
+                    self._events.append((tx.timestamp, change.coin_type, change.amount))
+                    self._totals[change.coin_type] = self._totals.get(change.coin_type, 0) + change.amount
+                    self._counts[change.coin_type] = self._counts.get(change.coin_type, 0) + 1
+        if latest:
+            self._expire(latest - self.window)
+
+    def _expire(self, cutoff: float):
+        while self._events and self._events[0][0] < cutoff:
+            _, coin_type, amount = self._events.popleft()
+            self._totals[coin_type] -= amount
+            self._counts[coin_type] -= 1
+            if not self._counts[coin_type]:
+                del self._totals[coin_type], self._counts[coin_type]
+
+    def volume(self, coin_type: str) -> int:
+        return self._totals.get(coin_type, 0)
+
+    def top(self, n: int = 5) -> List[Tuple[str, int]]:
+        return sorted(self._totals.items(), key=lambda item: item[1], reverse=True)[:n]
+
+
+WhaleCallback = Callable[[SuiTransaction, BalanceChange], Awaitable[None]]
+
+
+class WhaleTracker:
+    """Report balance changes at or above a per-coin threshold."""
+
+    def __init__(self, thresholds: Dict[str, int], callback: WhaleCallback):
+        self.thresholds = dict(thresholds)
+        self.callback = callback
+
+    async def __call__(self, checkpoint: int, transactions: List[SuiTransaction]):
+        for tx in transactions:
+            for change in tx.balance_changes:
+                threshold = self.thresholds.get(change.coin_type)
+                if threshold is not None and change.amount >= threshold:
+                    await self.callback(tx, change)
@@ -0,0 +1,124 @@
+"""
+Persistent registry of coin types and their metadata.
+
+Coins are looked up by full type (in any spelling), symbol or alias in
+O(1). Tracking a coin only records its canonical type and aliases;
+``suix_getCoinMetadata`` is called lazily, the first time a coin's metadata
+is needed, and batched with every other coin still missing it. Loaded
+metadata is written to disk and the file is read on first use, so
+tracking thousands of coins costs nothing at startup.
+"""
+import json
+import logging
+import os
+from typing import Dict, Iterable, List, Optional
+
+from src.config.settings import COIN_REGISTRY_PATH
+from src.blockchain.decoding import CoinMetadata, RpcError, canonical_coin_type
+
+logger = logging.getLogger(__name__)
+
+
+class CoinRegistry:
+    """Canonical coin types, aliases and lazily loaded metadata."""
+
+    def __init__(self, rpc=None, path: Optional[str] = COIN_REGISTRY_PATH):
+        """
+        Args:
+            rpc: Client exposing ``batch_call(calls)``, e.g. SuiTool; without one
+                only persisted metadata is available
+            path: JSON file metadata is persisted to, or None to keep it in memory
+        """
+        self.rpc = rpc
+        self.path = path
+        self._metadata: Dict[str, CoinMetadata] = {}
+        # Lowercase alias or symbol -> canonical type; explicit aliases win over symbols
+        self._aliases: Dict[str, str] = {}
+        self._symbols: Dict[str, str] = {}
+        self._loaded = False
+
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.path:
+            return
+        try:
+            with open(self.path) as f:
+                entries = json.load(f)
+        except FileNotFoundError:
+            return
+        except ValueError as e:
+            logger.warning(f"Ignoring unreadable coin registry {self.path}: {str(e)}")
+            return
+        for entry in entries:
+            self._add_metadata(CoinMetadata.from_dict(entry))
+
+    def _save(self):
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump([metadata.to_dict() for metadata in self._metadata.values()], f)
+        os.replace(tmp_path, self.path)
+
+    def _add_metadata(self, metadata: CoinMetadata):
+        self._metadata[metadata.coin_type] = metadata
+        if metadata.symbol:
+            self._symbols.setdefault(metadata.symbol.lower(), metadata.coin_type)
+
+    def track(self, coin_type: str, aliases: Iterable[str] = ()) -> str:
+        """Register a coin under extra names without fetching anything; returns its canonical type."""
+        canonical = canonical_coin_type(coin_type)
+        for alias in aliases:
+            self._aliases[alias.lower()] = canonical
+        return canonical
+
+    def coin_type(self, key: str) -> Optional[str]:
+        """Canonical type for a type string, alias or symbol."""
+        self._load()
+        name = key.strip().lower()
+        if name in self._aliases:
+            return self._aliases[name]
+        if "::" in name:
+            try:
+                return canonical_coin_type(key)
+            except ValueError:
+                return None
+        return self._symbols.get(name)
+
+    def lookup(self, key: str) -> Optional[CoinMetadata]:
+        """Metadata already known for ``key``; never calls the node."""
+        coin_type = self.coin_type(key)
+        return self._metadata.get(coin_type) if coin_type else None
+
+    async def resolve(self, keys: Iterable[str]) -> Dict[str, CoinMetadata]:
+        """Metadata per key, loading every unknown coin type in one batch."""
+        keys = list(keys)
+        types = {key: self.coin_type(key) for key in keys}
+        missing = sorted({t for t in types.values() if t and t not in self._metadata})
+        if missing and self.rpc is not None:
+            await self._fetch(missing)
+        return {key: self._metadata[t] for key, t in types.items() if t in self._metadata}
+
+    async def get(self, key: str) -> Optional[CoinMetadata]:
+        return (await self.resolve([key])).get(key)
+
+    async def _fetch(self, coin_types: List[str]):
+        results = await self.rpc.batch_call([("suix_getCoinMetadata", [coin]) for coin in coin_types])
+        added = False
+        for coin, data in zip(coin_types, results):
+            if isinstance(data, RpcError) or not data:
+                logger.warning(f"No coin metadata for {coin}: {data}")
+                continue
+            self._add_metadata(CoinMetadata.from_rpc(coin, data))
+            added = True
+        if added:
+            self._save()
+
+    def __len__(self) -> int:
+        self._load()
+        return len(self._metadata)
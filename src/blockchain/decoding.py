@@ -0,0 +1,315 @@
+"""
+Typed, allocation-light response decoding.
+
+Large SuiVision and BlockVision list payloads and Sui RPC results are
+decoded into compact ``__slots__`` records that keep only the fields the bot
+reads; everything else is dropped right after parsing. JSON parsing uses ``orjson`` when it is installed and falls
+back to the standard library otherwise.
+"""
+import json
+import re
+from typing import Any, Dict, Iterable, List, Optional, Type, TypeVar, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+T = TypeVar("T", bound="Record")
+
+
+def json_loads(raw: Union[bytes, str]) -> Any:
+    """Parse JSON with the fastest available backend."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _number(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class Record:
+    """Base for compact response records.
+
+    Subclasses list their fields in ``__slots__``, the subset of those that
+    hold numbers in ``_numeric`` and payload keys that differ from the field
+    name in ``_aliases``; missing fields default to ``""`` or ``0.0``.
+    """
+
+    __slots__ = ()
+    _numeric: frozenset = frozenset()
+    _aliases: Dict[str, str] = {}
+
+    @classmethod
+    def from_dict(cls: Type[T], data: Dict[str, Any]) -> T:
+        record = cls.__new__(cls)
+        for name in cls.__slots__:
+            value = data.get(cls._aliases.get(name, name))
+            if name in cls._numeric:
+                value = _number(value)
+            elif value is None:
+                value = ""
+            setattr(record, name, value)
+        return record
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __eq__(self, other) -> bool:
+        return type(other) is type(self) and self.to_dict() == other.to_dict()
+
+    # Records are mutable and compare by value, so they are deliberately unhashable
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class TvlProject(Record):
+    """Entry of SuiVision ``/defi/tvl``."""
+    __slots__ = ("name", "tvl", "growth")
+    _numeric = frozenset({"tvl", "growth"})
+
+
+class ProjectStat(Record):
+    """Entry of SuiVision ``/defi/projects``."""
+    __slots__ = ("name", "volume", "growth")
+    _numeric = frozenset({"volume", "growth"})
+
+
+class TradingPair(Record):
+    """Entry of SuiVision ``/coins/pairs``."""
+    __slots__ = ("pair", "volume", "price_change")
+    _numeric = frozenset({"volume", "price_change"})
+
+
+class FarmingPool(Record):
+    """Entry of SuiVision ``/defi/pools``."""
+    __slots__ = ("name", "apr", "tvl")
+    _numeric = frozenset({"apr", "tvl"})
+
+
+class NftCollection(Record):
+    """Entry of SuiVision ``/nfts/collections``."""
+    __slots__ = ("name", "volume", "floor_price")
+    _numeric = frozenset({"volume", "floor_price"})
+
+
+class WhaleTransfer(Record):
+    """Entry of BlockVision ``/whales/activity`` ``large_transactions`` or ``whale_movements``.
+
+    Fields match the transfers the local transaction index returns.
+    """
+    __slots__ = ("digest", "timestamp", "sender", "recipient", "coin_type", "amount")
+    _numeric = frozenset({"amount"})
+    _aliases = {"sender": "from", "recipient": "to"}
+
+
+def decode_records(items: Iterable[Dict[str, Any]], record_type: Type[T]) -> List[T]:
+    """Convert already-parsed dicts into records."""
+    from_dict = record_type.from_dict
+    return [from_dict(item) for item in items]
+
+
+def decode_list(raw: Union[bytes, str], key: str, record_type: Type[T]) -> List[T]:
+    """Parse a ``{key: [...]}`` payload straight into a list of records.
+
+    The intermediate dicts are released as soon as the records are built.
+    """
+    return decode_records(json_loads(raw).get(key) or [], record_type)
+
+
+def _owner_address(owner: Any) -> str:
+    """Flatten a Sui owner (``{"AddressOwner": "0x.."}``, ``"Immutable"``, ...) to a string."""
+    if isinstance(owner, dict):
+        for value in owner.values():
+            if isinstance(value, str):
+                return value
+        return ""
+    return str(owner or "")
+
+
+class BalanceChange(Record):
+    """Entry of a transaction block's ``balanceChanges``; ``amount`` is in raw coin units."""
+    __slots__ = ("owner", "coin_type", "amount")
+
+    @classmethod
+    def from_rpc(cls, data: Dict[str, Any]) -> "BalanceChange":
+        change = cls.__new__(cls)
+        change.owner = _owner_address(data.get("owner"))
+        change.coin_type = data.get("coinType") or ""
+        change.amount = int(data.get("amount") or 0)
+        return change
+
+
+class SuiTransaction(Record):
+    """Transaction block from ``sui_multiGetTransactionBlocks`` reduced to what analytics read."""
+    __slots__ = ("digest", "checkpoint", "timestamp", "sender", "status", "balance_changes")
+
+    @classmethod
+    def from_rpc(cls, block: Dict[str, Any], checkpoint: Optional[int] = None) -> "SuiTransaction":
+        tx = cls.__new__(cls)
+        tx.digest = block.get("digest") or ""
+        tx.checkpoint = int(block.get("checkpoint") or checkpoint or 0)
+        tx.timestamp = int(block.get("timestampMs") or 0) / 1000.0
+        tx.sender = ((block.get("transaction") or {}).get("data") or {}).get("sender") or ""
+        tx.status = ((block.get("effects") or {}).get("status") or {}).get("status") or ""
+        tx.balance_changes = [BalanceChange.from_rpc(c) for c in block.get("balanceChanges") or []]
+        return tx
+
+
+_AMOUNT_FIELDS = ("amount", "amount_in", "amountIn", "amount_x", "amount_a")
+_COIN_TYPE_FIELDS = ("coin_type", "coinType", "coin_type_in", "type_in")
+
+
+class SuiEvent(Record):
+    """Move event from ``suix_queryEvents`` with the amount and coin type pulled out of its payload."""
+    __slots__ = ("tx_digest", "event_seq", "event_type", "sender", "timestamp", "coin_type", "amount", "parsed")
+
+    @classmethod
+    def from_rpc(cls, data: Dict[str, Any]) -> "SuiEvent":
+        event = cls.__new__(cls)
+        event_id = data.get("id") or {}
+        parsed = data.get("parsedJson") or {}
+        event.tx_digest = event_id.get("txDigest") or ""
+        event.event_seq = str(event_id.get("eventSeq") or "0")
+        event.event_type = data.get("type") or ""
+        event.sender = data.get("sender") or ""
+        event.timestamp = int(data.get("timestampMs") or 0) / 1000.0
+        event.parsed = parsed
+        event.amount = next((int(parsed[f]) for f in _AMOUNT_FIELDS if str(parsed.get(f, "")).isdigit()), 0)
+        coin_type = next((parsed[f] for f in _COIN_TYPE_FIELDS if parsed.get(f)), "")
+        if isinstance(coin_type, dict):
+            coin_type = coin_type.get("name", "")
+        if not coin_type and "<" in event.event_type:
+            # Generic events such as ``...::CoinEvent<0x2::sui::SUI>``
+            coin_type = event.event_type[event.event_type.index("<") + 1:-1].split(",")[0].strip()
+        event.coin_type = coin_type
+        return event
+
+    @property
+    def cursor(self) -> Dict[str, str]:
+        return {"txDigest": self.tx_digest, "eventSeq": self.event_seq}
+
+
+_ADDRESS = re.compile(r"0x([0-9a-fA-F]+)(?=::)")
+
+
+def normalize_type(type_tag: str) -> str:
+    """Spell every address in a Move type tag as 64 lowercase hex digits."""
+    return _ADDRESS.sub(lambda m: "0x" + m.group(1).lower().zfill(64), type_tag.strip())
+
+
+def type_params(type_tag: str) -> List[str]:
+    """Top-level generic parameters of a Move type tag, e.g. the two coins of ``Pool<A, B>``."""
+    if "<" not in type_tag:
+        return []
+    params, depth, current = [], 0, ""
+    for char in type_tag[type_tag.index("<") + 1:type_tag.rindex(">")]:
+        if char == "," and depth == 0:
+            params.append(current.strip())
+            current = ""
+            continue
+        depth += (char == "<") - (char == ">")
+        current += char
+    params.append(current.strip())
+    return params
+
+
+def canonical_coin_type(coin_type: str) -> str:
+    """Canonical spelling of a coin type: ``0x`` plus 64 hex digits, then ``::module::Name``.
+
+    Raises:
+        ValueError: The string is not a ``address::module::Name`` type
+    """
+    text = coin_type.strip()
+    parts = text.split("::")
+    if len(parts) < 3 or not parts[1] or not parts[2]:
+        raise ValueError(f"Not a coin type: {coin_type!r}")
+    if not text.lower().startswith("0x"):
+        text = "0x" + text
+    try:
+        int(text.split("::", 1)[0], 16)
+    except ValueError:
+        raise ValueError(f"Not a coin type: {coin_type!r}") from None
+    return normalize_type(text)
+
+
+class CoinMetadata(Record):
+    """``suix_getCoinMetadata`` result for one coin type."""
+    __slots__ = ("coin_type", "symbol", "name", "decimals", "icon_url")
+
+    @classmethod
+    def from_rpc(cls, coin_type: str, data: Dict[str, Any]) -> "CoinMetadata":
+        metadata = cls.__new__(cls)
+        metadata.coin_type = coin_type
+        metadata.symbol = data.get("symbol") or ""
+        metadata.name = data.get("name") or ""
+        metadata.decimals = int(data.get("decimals") or 0)
+        metadata.icon_url = data.get("iconUrl") or data.get("icon_url") or ""
+        return metadata
+
+
+class ClmmPool(Record):
+    """Concentrated-liquidity pool object (Cetus, Turbos) from ``sui_multiGetObjects``.
+
+    ``sqrt_price`` is the Q64.64 square root of the price of ``coin_a`` in
+    raw units of ``coin_b``.
+    """
+    __slots__ = ("pool_id", "pool_type", "coin_a", "coin_b", "sqrt_price", "liquidity")
+
+    @classmethod
+    def from_rpc(cls, obj: Dict[str, Any]) -> "ClmmPool":
+        """
+        Raises:
+            ValueError: The object is missing or is not a CLMM pool
+        """
+        data = obj.get("data") or {}
+        content = data.get("content") or {}
+        fields = content.get("fields") or {}
+        sqrt_price = fields.get("current_sqrt_price", fields.get("sqrt_price"))
+        coins = type_params(data.get("type") or content.get("type") or "")
+        if sqrt_price is None or len(coins) < 2:
+            raise ValueError(f"Object {data.get('objectId') or obj.get('error')} is not a CLMM pool")
+        pool = cls.__new__(cls)
+        pool.pool_id = data.get("objectId") or ""
+        pool.pool_type = data.get("type") or content.get("type") or ""
+        pool.coin_a = normalize_type(coins[0])
+        pool.coin_b = normalize_type(coins[1])
+        pool.sqrt_price = int(sqrt_price)
+        pool.liquidity = int(fields.get("liquidity") or 0)
+        return pool
+
+
+class RpcError(Exception):
+    """JSON-RPC error object returned by a Sui fullnode."""
+
+    def __init__(self, code: int, message: str, data: Any = None):
+        super().__init__(f"RPC error {code}: {message}")
+        self.code = code
+        self.message = message
+        self.data = data
+
+
+class BatchTooLargeError(Exception):
+    """The node refused a JSON-RPC batch because it exceeds its size limit."""
+
+
+def decode_rpc_response(payload: Union[bytes, str, Dict[str, Any]]) -> Any:
+    """Return the ``result`` of a Sui JSON-RPC response.
+
+    Raises:
+        RpcError: The response carries an ``error`` object
+    """
+    data = json_loads(payload) if isinstance(payload, (bytes, str)) else payload
+    error: Optional[Dict[str, Any]] = data.get("error")
+    if error:
+        raise RpcError(error.get("code", 0), error.get("message", ""), error.get("data"))
+    return data.get("result")
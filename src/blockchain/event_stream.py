@@ -0,0 +1,201 @@
+"""
+Streaming Move events by long-polling ``suix_queryEvents``.
+
+Each followed event query keeps its own cursor and asks the fullnode for
+everything after it; once caught up it waits ``poll_interval`` and asks
+again, so new events reach subscribers within seconds. Events are checked
+against in-memory filters (event type, sender, coin type, minimum amount)
+and only matches are delivered.
+
+DEX swap events carry raw amounts of whichever coin went in, so whale swaps
+are judged by :class:`WhaleSwaps` against a per-coin threshold once the
+input coin has been resolved from the pool's type.
+
+Fullnodes have deprecated WebSocket event subscriptions, so the cursor
+long-poll is the transport; it also resumes cleanly after a dropped
+connection because the cursor is kept client-side.
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from src.config.settings import EVENT_POLL_INTERVAL, EVENT_PAGE_SIZE, EVENT_BUFFER_SIZE
+from src.blockchain.decoding import SuiEvent, canonical_coin_type, normalize_type, type_params
+from src.utils.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+EVENTS_RECEIVED = registry.counter("events_received_total", "Move events read from suix_queryEvents")
+EVENTS_MATCHED = registry.counter("events_matched_total", "Move events delivered to at least one subscriber")
+EVENT_LAG = registry.histogram(
+    "event_delivery_lag_seconds", "Time from an event's checkpoint timestamp to its delivery"
+)
+
+EventCallback = Callable[[SuiEvent], Awaitable[None]]
+# (event, input coin type, raw input amount)
+WhaleSwapCallback = Callable[[SuiEvent, str, int], Awaitable[None]]
+
+
+class EventFilter:
+    """In-memory predicate over decoded events; unset criteria match everything."""
+
+    def __init__(self, event_types: Optional[Iterable[str]] = None,
+                 senders: Optional[Iterable[str]] = None,
+                 coin_types: Optional[Iterable[str]] = None,
+                 min_amount: int = 0):
+        self.event_types = frozenset(event_types) if event_types else None
+        self.senders = frozenset(senders) if senders else None
+        self.coin_types = frozenset(coin_types) if coin_types else None
+        self.min_amount = min_amount
+
+    def matches(self, event: SuiEvent) -> bool:
+        if self.event_types is not None and event.event_type not in self.event_types:
+            return False
+        if self.senders is not None and event.sender not in self.senders:
+            return False
+        if self.coin_types is not None and event.coin_type not in self.coin_types:
+            return False
+        return event.amount >= self.min_amount
+
+
+class EventStream:
+    """Follow Move event queries and deliver filtered events to subscribers."""
+
+    def __init__(self, rpc, queries: List[Dict[str, Any]], page_size: int = EVENT_PAGE_SIZE,
+                 poll_interval: float = EVENT_POLL_INTERVAL, buffer_size: int = EVENT_BUFFER_SIZE):
+        """
+        Args:
+            rpc: Client exposing ``call(method, params)``, e.g. SuiTool
+            queries: ``suix_queryEvents`` filters to follow, e.g. ``{"MoveEventType": "0x..::pool::SwapEvent"}``
+            page_size: Events requested per poll
+            poll_interval: Seconds to wait once a query is caught up
+            buffer_size: Matched events kept for :meth:`recent`
+        """
+        self.rpc = rpc
+        self.queries = list(queries)
+        self.page_size = page_size
+        self.poll_interval = poll_interval
+        self.cursors: Dict[int, Optional[Dict[str, str]]] = {}
+        self._subscriptions: List[Tuple[EventFilter, EventCallback]] = []
+        self._recent: Deque[SuiEvent] = deque(maxlen=buffer_size)
+
+    def subscribe(self, callback: EventCallback, event_filter: Optional[EventFilter] = None):
+        """Call ``callback(event)`` for every event ``event_filter`` accepts."""
+        self._subscriptions.append((event_filter or EventFilter(), callback))
+
+    def recent(self, limit: int = 20) -> List[SuiEvent]:
+        """Most recently matched events, newest first."""
+        return list(self._recent)[::-1][:limit]
+
+    async def _tip(self, query: Dict[str, Any]) -> Optional[Dict[str, str]]:
+        """Cursor of the newest existing event, so following starts from now."""
+        page = await self.rpc.call("suix_queryEvents", [query, None, 1, True])
+        data = (page or {}).get("data") or []
+        return data[0]["id"] if data else None
+
+    async def _dispatch(self, event: SuiEvent):
+        callbacks = [callback for event_filter, callback in self._subscriptions if event_filter.matches(event)]
+        if not callbacks:
+            return
+        EVENTS_MATCHED.inc()
+        if event.timestamp:
+            EVENT_LAG.observe(max(0.0, time.time() - event.timestamp))
+        self._recent.append(event)
+        for result in await asyncio.gather(*(callback(event) for callback in callbacks),
+                                           return_exceptions=True):
+            if isinstance(result, Exception):
+                logger.error(f"Error in event subscriber: {str(result)}")
+
+    async def _follow(self, index: int, query: Dict[str, Any]):
+        while index not in self.cursors:
+            try:
+                self.cursors[index] = await self._tip(query)
+            except Exception as e:
+                logger.warning(f"Error locating the newest event for {query}: {str(e)}")
+                await asyncio.sleep(self.poll_interval)
+
+        while True:
+            try:
+                page = await self.rpc.call(
+                    "suix_queryEvents", [query, self.cursors[index], self.page_size, False]
+                )
+            except Exception as e:
+                logger.warning(f"Error polling events for {query}: {str(e)}")
+                await asyncio.sleep(self.poll_interval)
+                continue
+
+            data = (page or {}).get("data") or []
+            EVENTS_RECEIVED.inc(len(data))
+            for raw in data:
+                event = SuiEvent.from_rpc(raw)
+                await self._dispatch(event)
+                self.cursors[index] = event.cursor
+            if not (page or {}).get("hasNextPage"):
+                await asyncio.sleep(self.poll_interval)
+
+    async def run(self):
+        """Follow every query until cancelled."""
+        await asyncio.gather(*(self._follow(i, query) for i, query in enumerate(self.queries)))
+
+
+def swap_input(parsed: Dict[str, Any]) -> Optional[Tuple[str, bool, int]]:
+    """(pool id, whether coin A went in, raw input amount) of a Cetus or Turbos swap event."""
+    pool_id = parsed.get("pool")
+    if not pool_id:
+        return None
+    if "atob" in parsed:
+        # Cetus: amount_in is always in the input coin
+        a_to_b = bool(parsed["atob"])
+        amount = parsed.get("amount_in")
+    elif "a_to_b" in parsed:
+        # Turbos: amount_a / amount_b are per side of the pool
+        a_to_b = bool(parsed["a_to_b"])
+        amount = parsed.get("amount_a" if a_to_b else "amount_b")
+    else:
+        return None
+    if not str(amount or "").isdigit():
+        return None
+    return pool_id, a_to_b, int(amount)
+
+
+class WhaleSwaps:
+    """Report swaps whose input reaches the threshold of the coin that went in.
+
+    Raw amounts of different coins have different decimals, so thresholds are
+    per coin type; a pool's coin types are read once from its object type.
+    """
+
+    def __init__(self, objects, thresholds: Dict[str, int], callback: WhaleSwapCallback):
+        """
+        Args:
+            objects: ObjectFetcher used to look up pool objects
+            thresholds: Smallest raw input amount reported, per coin type
+            callback: Called with ``(event, coin_type, amount)`` for every whale swap
+        """
+        self.objects = objects
+        self.thresholds = {canonical_coin_type(coin): amount for coin, amount in thresholds.items()}
+        self.callback = callback
+        self._pools: Dict[str, Tuple[str, str]] = {}
+
+    async def _pool_coins(self, pool_id: str) -> Tuple[str, str]:
+        if pool_id not in self._pools:
+            (obj,) = await self.objects.get_objects([pool_id])
+            data = obj.get("data") or {}
+            coins = type_params(data.get("type") or "")
+            if len(coins) < 2:
+                raise ValueError(f"Object {pool_id} is not a two-coin pool")
+            self._pools[pool_id] = (normalize_type(coins[0]), normalize_type(coins[1]))
+        return self._pools[pool_id]
+
+    async def __call__(self, event: SuiEvent):
+        swap = swap_input(event.parsed)
+        if swap is None:
+            return
+        pool_id, a_to_b, amount = swap
+        coin_a, coin_b = await self._pool_coins(pool_id)
+        coin_type = coin_a if a_to_b else coin_b
+        threshold = self.thresholds.get(coin_type)
+        if threshold is not None and amount >= threshold:
+            await self.callback(event, coin_type, amount)
@@ -0,0 +1,162 @@
+"""
+Version-aware Sui object cache and bulk fetcher.
+
+An object's contents never change at a given version, so every object read
+is stored under ``(object_id, version)`` and never refetched. Lookups of
+the latest version remember which version was current for a short TTL;
+immutable objects have no later version, so their latest lookup never
+expires. Misses are grouped into ``sui_multiGetObjects`` calls of at most
+the node's per-call limit, sent together as one JSON-RPC batch.
+
+The cache is bounded by an approximate memory budget and evicts the least
+recently used versions first.
+"""
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.config.settings import OBJECT_CACHE_MAX_BYTES, OBJECT_LATEST_TTL
+from src.blockchain.decoding import RpcError
+from src.utils.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+OBJECT_CACHE_REQUESTS = registry.counter(
+    "object_cache_requests_total", "Object lookups by kind (latest, versioned) and result (hit, miss)"
+)
+OBJECT_CACHE_BYTES = registry.gauge("object_cache_bytes", "Approximate size of cached Sui objects")
+
+# sui_multiGetObjects and sui_tryMultiGetPastObjects accept at most this many objects per call
+MULTI_GET_LIMIT = 50
+OBJECT_OPTIONS = {"showType": True, "showContent": True, "showOwner": True, "showDisplay": True}
+
+ObjectRef = Tuple[str, int]
+
+
+class ObjectFetcher:
+    """Fetch Sui objects in bulk through a shared ``(id, version)`` cache."""
+
+    def __init__(self, rpc, latest_ttl: float = OBJECT_LATEST_TTL,
+                 max_bytes: int = OBJECT_CACHE_MAX_BYTES, batch_limit: int = MULTI_GET_LIMIT):
+        """
+        Args:
+            rpc: Client exposing ``batch_call(calls)``, e.g. SuiTool
+            latest_ttl: Seconds a latest-version lookup is reused
+            max_bytes: Approximate memory budget for cached objects
+            batch_limit: Objects per multi-get call
+        """
+        self.rpc = rpc
+        self.latest_ttl = latest_ttl
+        self.max_bytes = max_bytes
+        self.batch_limit = batch_limit
+        self._versions: "OrderedDict[ObjectRef, Tuple[Dict[str, Any], int]]" = OrderedDict()
+        # object_id -> (version, expires_at); immutable objects never expire
+        self._latest: Dict[str, Tuple[int, float]] = {}
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _store(self, obj: Dict[str, Any]) -> Dict[str, Any]:
+        data = obj["data"]
+        ref = (data["objectId"], int(data["version"]))
+        if ref not in self._versions:
+            size = len(json.dumps(obj, separators=(",", ":")))
+            self._versions[ref] = (obj, size)
+            self.size += size
+            self._evict()
+        return obj
+
+    def _evict(self):
+        while self.size > self.max_bytes and len(self._versions) > 1:
+            (object_id, version), (_, size) = self._versions.popitem(last=False)
+            self.size -= size
+            if self._latest.get(object_id, (None,))[0] == version:
+                del self._latest[object_id]
+        OBJECT_CACHE_BYTES.set(self.size)
+
+    def _cached(self, ref: ObjectRef) -> Optional[Dict[str, Any]]:
+        entry = self._versions.get(ref)
+        if entry is None:
+            return None
+        self._versions.move_to_end(ref)
+        return entry[0]
+
+    def _cached_latest(self, object_id: str) -> Optional[Dict[str, Any]]:
+        latest = self._latest.get(object_id)
+        if latest is None or latest[1] < time.monotonic():
+            return None
+        return self._cached((object_id, latest[0]))
+
+    def _count(self, kind: str, hits: int, misses: int):
+        self.hits += hits
+        self.misses += misses
+        OBJECT_CACHE_REQUESTS.inc(hits, kind=kind, result="hit")
+        OBJECT_CACHE_REQUESTS.inc(misses, kind=kind, result="miss")
+
+    async def _multi_get(self, method: str, keys: List[Any]) -> List[Dict[str, Any]]:
+        calls = [(method, [keys[i:i + self.batch_limit], OBJECT_OPTIONS])
+                 for i in range(0, len(keys), self.batch_limit)]
+        objects = []
+        for chunk, result in zip(calls, await self.rpc.batch_call(calls)):
+            if isinstance(result, RpcError):
+                # Keep positions aligned; callers see a per-object error
+                objects.extend({"error": {"code": result.code, "message": result.message}}
+                               for _ in chunk[1][0])
+            else:
+                objects.extend(result or [])
+        return objects
+
+    async def get_objects(self, object_ids: Iterable[str]) -> List[Dict[str, Any]]:
+        """Latest version of each object, in request order, as ``sui_multiGetObjects`` returns them."""
+        object_ids = list(object_ids)
+        found: Dict[str, Dict[str, Any]] = {}
+        for object_id in object_ids:
+            obj = self._cached_latest(object_id)
+            if obj is not None:
+                found[object_id] = obj
+        missing = list(dict.fromkeys(i for i in object_ids if i not in found))
+        self._count("latest", len(object_ids) - len(missing), len(missing))
+
+        if missing:
+            now = time.monotonic()
+            for object_id, obj in zip(missing, await self._multi_get("sui_multiGetObjects", missing)):
+                found[object_id] = obj
+                data = obj.get("data")
+                if not data:
+                    continue
+                self._store(obj)
+                immutable = data.get("owner") == "Immutable"
+                expires = float("inf") if immutable else now + self.latest_ttl
+                self._latest[object_id] = (int(data["version"]), expires)
+        return [found[object_id] for object_id in object_ids]
+
+    async def get_past_objects(self, refs: Iterable[ObjectRef]) -> List[Dict[str, Any]]:
+        """Objects at exact versions, in request order; cached versions are never refetched."""
+        refs = [(object_id, int(version)) for object_id, version in refs]
+        found: Dict[ObjectRef, Dict[str, Any]] = {}
+        for ref in refs:
+            obj = self._cached(ref)
+            if obj is not None:
+                found[ref] = obj
+        missing = list(dict.fromkeys(ref for ref in refs if ref not in found))
+        self._count("versioned", len(refs) - len(missing), len(missing))
+
+        if missing:
+            keys = [{"objectId": object_id, "version": str(version)} for object_id, version in missing]
+            for ref, result in zip(missing, await self._multi_get("sui_tryMultiGetPastObjects", keys)):
+                if result.get("status") == "VersionFound":
+                    found[ref] = self._store({"data": result["details"]})
+                else:
+                    found[ref] = {"error": {"code": result.get("status", "unknown"), "object_id": ref[0]}}
+        return [found[ref] for ref in refs]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "versions": len(self._versions),
+            "bytes": self.size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses
+        }
@@ -0,0 +1,122 @@
+"""
+Streaming iteration over paginated Sui RPC queries.
+
+Large on-chain tables (pool registries, participant tables, kiosks) are
+read through cursor-paginated methods such as ``suix_getDynamicFields``,
+``suix_getOwnedObjects`` and ``suix_queryEvents``. :func:`paginate` streams
+their pages while fetching up to ``prefetch`` pages ahead, and
+:func:`with_objects` loads each page's child objects with a bounded number
+of fetches in flight. Only a fixed number of pages is ever held, so memory
+stays constant whatever the table size, and when the caller stops
+iterating the background fetches are cancelled.
+"""
+import asyncio
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Deque, Dict, List, Optional, Tuple
+
+from src.config.settings import PAGINATION_PAGE_SIZE, PAGINATION_PREFETCH, CHILD_FETCH_CONCURRENCY
+from src.blockchain.object_cache import ObjectFetcher
+from src.utils.metrics import registry
+
+PAGES_FETCHED = registry.counter("rpc_pages_fetched_total", "Pages read from paginated RPC queries")
+
+Cursor = Any
+ParamsBuilder = Callable[[Optional[Cursor]], list]
+
+_DONE = object()
+
+
+async def paginate(rpc, method: str, build_params: ParamsBuilder,
+                   prefetch: int = PAGINATION_PREFETCH) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Yield each page's ``data`` list, fetching up to ``prefetch`` pages ahead.
+
+    Args:
+        rpc: Client exposing ``call(method, params)``, e.g. SuiTool
+        method: Cursor-paginated RPC method
+        build_params: Returns the method's params for a cursor (``None`` for the first page)
+        prefetch: Pages fetched ahead of the consumer
+
+    Raises:
+        Exception: Whatever fetching a page raised, once the pages before it were consumed
+    """
+    queue: "asyncio.Queue[Any]" = asyncio.Queue(maxsize=max(1, prefetch))
+
+    async def produce():
+        cursor = None
+        try:
+            while True:
+                page = await rpc.call(method, build_params(cursor)) or {}
+                PAGES_FETCHED.inc(method=method)
+                await queue.put(page.get("data") or [])
+                if not page.get("hasNextPage") or page.get("nextCursor") is None:
+                    break
+                cursor = page["nextCursor"]
+        except Exception as e:
+            await queue.put(e)
+            return
+        await queue.put(_DONE)
+
+    producer = asyncio.ensure_future(produce())
+    try:
+        while True:
+            page = await queue.get()
+            if page is _DONE:
+                return
+            if isinstance(page, Exception):
+                raise page
+            yield page
+    finally:
+        producer.cancel()
+
+
+async def flatten(pages: AsyncIterator[List[Dict[str, Any]]]) -> AsyncIterator[Dict[str, Any]]:
+    """Yield the items of each page in order."""
+    try:
+        async for page in pages:
+            for item in page:
+                yield item
+    finally:
+        await pages.aclose()
+
+
+async def with_objects(pages: AsyncIterator[List[Dict[str, Any]]], objects: ObjectFetcher,
+                       concurrency: int = CHILD_FETCH_CONCURRENCY,
+                       object_id: Callable[[Dict[str, Any]], str] = lambda item: item["objectId"]
+                       ) -> AsyncIterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """Yield ``(item, object)`` pairs, loading each page's objects with at most ``concurrency`` pages in flight."""
+    pending: Deque[Tuple[List[Dict[str, Any]], asyncio.Future]] = deque()
+    try:
+        async for page in pages:
+            pending.append((page, asyncio.ensure_future(objects.get_objects([object_id(i) for i in page]))))
+            while len(pending) >= concurrency:
+                page, fetch = pending.popleft()
+                for pair in zip(page, await fetch):
+                    yield pair
+        while pending:
+            page, fetch = pending.popleft()
+            for pair in zip(page, await fetch):
+                yield pair
+    finally:
+        for _, fetch in pending:
+            fetch.cancel()
+        await pages.aclose()
+
+
+def dynamic_fields(rpc, parent_id: str, page_size: int = PAGINATION_PAGE_SIZE,
+                   prefetch: int = PAGINATION_PREFETCH) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Pages of a table, bag or kiosk's dynamic fields."""
+    return paginate(rpc, "suix_getDynamicFields", lambda cursor: [parent_id, cursor, page_size], prefetch)
+
+
+def owned_objects(rpc, owner: str, query: Optional[Dict[str, Any]] = None,
+                  page_size: int = PAGINATION_PAGE_SIZE,
+                  prefetch: int = PAGINATION_PREFETCH) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Pages of the objects an address owns; ``query`` takes a filter and options."""
+    return paginate(rpc, "suix_getOwnedObjects", lambda cursor: [owner, query or {}, cursor, page_size], prefetch)
+
+
+def query_events(rpc, query: Dict[str, Any], descending: bool = False,
+                 page_size: int = PAGINATION_PAGE_SIZE,
+                 prefetch: int = PAGINATION_PREFETCH) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Pages of events matching an event filter."""
+    return paginate(rpc, "suix_queryEvents", lambda cursor: [query, cursor, page_size, descending], prefetch)
@@ -0,0 +1,123 @@
+"""
+Token prices read straight from on-chain CLMM pools.
+
+Cetus and Turbos pools store the square root of their price as a Q64.64
+fixed-point number. All pools needed for a lookup (the token's pools plus
+the SUI/stablecoin pools used to convert SUI-quoted prices into USD) are
+read with a single ``sui_multiGetObjects`` call and converted together in
+one NumPy pass.
+
+The first lookup for a token checks its configured pools and loads coin
+decimals through the coin registry; both are cached, so every later lookup
+is one round-trip.
+"""
+import logging
+from typing import Dict, Iterable, List, Sequence
+
+import numpy as np
+
+from src.config.settings import DEX_POOLS, USD_STABLECOINS
+from src.blockchain.decoding import ClmmPool, normalize_type
+from src.blockchain.coin_registry import CoinRegistry
+from src.blockchain.object_cache import ObjectFetcher
+
+logger = logging.getLogger(__name__)
+
+SUI_TYPE = normalize_type("0x2::sui::SUI")
+Q64 = float(2 ** 64)
+
+
+def sqrt_prices_to_prices(sqrt_prices: Sequence[int], decimals_a: Sequence[int],
+                          decimals_b: Sequence[int]) -> np.ndarray:
+    """Price of coin A in whole units of coin B for each Q64.64 ``sqrt_price``."""
+    # u128 values fit float64's range; the 53-bit mantissa is ample for a price
+    sqrt = np.array([float(s) for s in sqrt_prices], dtype=np.float64) / Q64
+    scale = np.power(10.0, np.asarray(decimals_a, dtype=np.float64) - np.asarray(decimals_b, dtype=np.float64))
+    return sqrt * sqrt * scale
+
+
+class PoolPriceOracle:
+    """USD prices for tokens from their most liquid configured DEX pool."""
+
+    def __init__(self, rpc, pools: Dict[str, List[str]] = DEX_POOLS,
+                 stablecoins: Iterable[str] = USD_STABLECOINS, objects: ObjectFetcher = None,
+                 coins: CoinRegistry = None):
+        """
+        Args:
+            rpc: Client exposing ``batch_call``, e.g. SuiTool
+            pools: Candidate pool object IDs per lowercase token symbol; ``"sui"``
+                pools must be quoted in a stablecoin
+            stablecoins: Coin types treated as worth one USD
+            objects: Shared object fetcher (defaults to a private one over ``rpc``)
+            coins: Coin registry supplying decimals (defaults to an in-memory one over ``rpc``)
+        """
+        self.rpc = rpc
+        self.objects = objects or ObjectFetcher(rpc)
+        self.coins = coins or CoinRegistry(rpc, path=None)
+        self.pools = {token.lower(): list(ids) for token, ids in pools.items()}
+        self.stablecoins = frozenset(normalize_type(coin) for coin in stablecoins)
+        # Pools confirmed to pair the token with a quote coin
+        self._pool_ids: Dict[str, List[str]] = {}
+
+    def _quote_coin(self, pool: ClmmPool) -> str:
+        """The side the price is expressed in: a stablecoin, else SUI, else nothing usable."""
+        for coin in (pool.coin_b, pool.coin_a):
+            if coin in self.stablecoins:
+                return coin
+        return SUI_TYPE if SUI_TYPE in (pool.coin_a, pool.coin_b) else ""
+
+    async def prices(self, tokens: Iterable[str]) -> Dict[str, float]:
+        """USD price per token symbol; tokens without a readable pool are left out."""
+        tokens = [token.lower() for token in tokens]
+        wanted = list(dict.fromkeys(["sui"] + tokens))
+        candidates = {token: self._pool_ids.get(token, self.pools.get(token, [])) for token in wanted}
+        pool_ids = list(dict.fromkeys(pid for ids in candidates.values() for pid in ids))
+        if not pool_ids:
+            return {}
+
+        pools: Dict[str, ClmmPool] = {}
+        for obj in await self.objects.get_objects(pool_ids):
+            try:
+                pool = ClmmPool.from_rpc(obj)
+            except ValueError as e:
+                logger.warning(f"Skipping DEX pool: {str(e)}")
+                continue
+            if self._quote_coin(pool):
+                pools[pool.pool_id] = pool
+        for token, ids in candidates.items():
+            if token not in self._pool_ids and any(pid in pools for pid in ids):
+                self._pool_ids[token] = [pid for pid in ids if pid in pools]
+
+        metadata = await self.coins.resolve({coin for pool in pools.values() for coin in (pool.coin_a, pool.coin_b)})
+        ordered = [p for p in pools.values() if p.coin_a in metadata and p.coin_b in metadata]
+        if not ordered:
+            return {}
+
+        a_in_b = sqrt_prices_to_prices(
+            [p.sqrt_price for p in ordered],
+            [metadata[p.coin_a].decimals for p in ordered],
+            [metadata[p.coin_b].decimals for p in ordered]
+        )
+        quote_is_a = np.array([self._quote_coin(p) == p.coin_a for p in ordered])
+        with np.errstate(divide="ignore"):
+            in_quote = np.where(quote_is_a, 1.0 / a_in_b, a_in_b)
+        index = {p.pool_id: i for i, p in enumerate(ordered)}
+
+        def best(token: str, sui_usd: float = 0.0) -> float:
+            # The most liquid pool gives the least manipulable price
+            usable = [pid for pid in candidates[token] if pid in index]
+            if token != "sui":
+                usable = [pid for pid in usable if sui_usd or self._quote_coin(pools[pid]) != SUI_TYPE]
+            if not usable:
+                return 0.0
+            pid = max(usable, key=lambda p: pools[p].liquidity)
+            factor = sui_usd if self._quote_coin(pools[pid]) == SUI_TYPE else 1.0
+            return float(in_quote[index[pid]] * factor)
+
+        sui_usd = best("sui")
+        prices = {}
+        for token in tokens:
+            price = sui_usd if token == "sui" else best(token, sui_usd)
+            if price and np.isfinite(price):
+                prices[token] = price
+        return prices
@@ -0,0 +1,159 @@
+"""
+In-process price alert engine.
+
+Thresholds are kept per token in two sorted arrays: "above" alerts by
+descending target and "below" alerts by ascending target. On each price tick
+the triggered alerts form a suffix of both arrays, so finding and removing
+them costs O(log n + fired) with ``bisect``.
+
+Alerts compare against the price level, not the previous tick: they are
+one-shot and fire on the first tick at or beyond their target, then are
+removed. An alert registered while the price is already beyond its target
+therefore fires on the next tick.
+"""
+import asyncio
+import itertools
+import logging
+from bisect import bisect_left, insort
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from src.utils.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+ALERTS_FIRED = registry.counter("price_alerts_fired_total", "Price alerts fired")
+ALERTS_ACTIVE = registry.gauge("price_alerts_active", "Price alerts waiting to fire")
+
+AlertCallback = Callable[["PriceAlert", float], Awaitable[None]]
+
+
+class PriceAlert:
+    """A single one-shot price threshold."""
+
+    __slots__ = ("alert_id", "token", "target", "is_above", "callback", "created_at")
+
+    def __init__(self, alert_id: int, token: str, target: float, is_above: bool,
+                 callback: Optional[AlertCallback] = None):
+        self.alert_id = alert_id
+        self.token = token
+        self.target = target
+        self.is_above = is_above
+        self.callback = callback
+        self.created_at = datetime.now()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "alert_id": self.alert_id,
+            "token_address": self.token,
+            "price_target": self.target,
+            "is_above": self.is_above,
+            "created_at": self.created_at.isoformat()
+        }
+
+
+class _TokenAlerts:
+    """Sorted alert arrays for one token: ``(-target, alert_id)`` above, ``(target, alert_id)`` below."""
+
+    __slots__ = ("above", "below")
+
+    def __init__(self):
+        self.above: List[Tuple[float, int]] = []
+        self.below: List[Tuple[float, int]] = []
+
+
+class PriceAlertEngine:
+    """Evaluates price ticks against indexed thresholds and fires async callbacks."""
+
+    def __init__(self):
+        self._tokens: Dict[str, _TokenAlerts] = {}
+        self._alerts: Dict[int, PriceAlert] = {}
+        self._subscribers: List[AlertCallback] = []
+        self._ids = itertools.count(1)
+
+    def subscribe(self, callback: AlertCallback):
+        """Register a coroutine called as ``callback(alert, price)`` for every fired alert."""
+        self._subscribers.append(callback)
+
+    def add_alert(self, token: str, target: float, is_above: bool = True,
+                  callback: Optional[AlertCallback] = None) -> PriceAlert:
+        """Register a threshold for ``token``.
+
+        Args:
+            token: Token address the alert watches
+            target: Price threshold
+            is_above: True to fire when price reaches or exceeds ``target``, False for at or below
+            callback: Optional coroutine called only for this alert
+
+        Returns:
+            The registered PriceAlert
+        """
+        alert = PriceAlert(next(self._ids), token, float(target), is_above, callback)
+        book = self._tokens.setdefault(token, _TokenAlerts())
+        if is_above:
+            insort(book.above, (-alert.target, alert.alert_id))
+        else:
+            insort(book.below, (alert.target, alert.alert_id))
+        self._alerts[alert.alert_id] = alert
+        ALERTS_ACTIVE.inc()
+        return alert
+
+    def remove_alert(self, alert_id: int) -> bool:
+        """Cancel an alert; returns False when it does not exist or already fired."""
+        alert = self._alerts.pop(alert_id, None)
+        if alert is None:
+            return False
+        book = self._tokens[alert.token]
+        side = book.above if alert.is_above else book.below
+        entry = (-alert.target if alert.is_above else alert.target, alert.alert_id)
+        index = bisect_left(side, entry)
+        if index < len(side) and side[index] == entry:
+            del side[index]
+        ALERTS_ACTIVE.dec()
+        return True
+
+    def alerts_for(self, token: str) -> List[PriceAlert]:
+        book = self._tokens.get(token)
+        if book is None:
+            return []
+        return [self._alerts[alert_id] for _, alert_id in book.above[::-1] + book.below]
+
+    def _crossed(self, book: _TokenAlerts, price: float) -> List[PriceAlert]:
+        # Above alerts with target <= price are the suffix with -target >= -price;
+        # reversed so they fire lowest target first
+        cut = bisect_left(book.above, (-price, -1))
+        fired = book.above[cut:][::-1]
+        del book.above[cut:]
+        # Below alerts with target >= price are a suffix
+        cut = bisect_left(book.below, (price, -1))
+        fired.extend(book.below[cut:])
+        del book.below[cut:]
+        return [self._alerts.pop(alert_id) for _, alert_id in fired]
+
+    async def on_price(self, token: str, price: float) -> List[PriceAlert]:
+        """Feed a price tick and fire every alert whose target it has reached.
+
+        Returns:
+            Alerts fired by this tick
+        """
+        book = self._tokens.get(token)
+        if book is None:
+            return []
+        fired = self._crossed(book, price)
+        if not fired:
+            return []
+
+        ALERTS_FIRED.inc(len(fired))
+        ALERTS_ACTIVE.dec(len(fired))
+        calls = []
+        for alert in fired:
+            if alert.callback is not None:
+                calls.append(alert.callback(alert, price))
+            calls.extend(subscriber(alert, price) for subscriber in self._subscribers)
+        for result in await asyncio.gather(*calls, return_exceptions=True):
+            if isinstance(result, Exception):
+                logger.error(f"Error in price alert callback: {str(result)}")
+        return fired
+
+    def __len__(self) -> int:
+        return len(self._alerts)
@@ -0,0 +1,182 @@
+"""
+Incremental local store for token price history.
+
+Each token's history lives in an append-only file of ``(timestamp, price)``
+float64 pairs that is memory-mapped read-only with NumPy. Range queries use
+``searchsorted`` on the timestamp column and return views into the mapping,
+so nothing is copied. After a restart the files are simply re-mapped.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+RECORD_DTYPE = np.dtype([("ts", "<f8"), ("price", "<f8")])
+
+
+def parse_timestamp(value: Any) -> float:
+    """Convert an API timestamp (epoch seconds/milliseconds or ISO string) to epoch seconds."""
+    if isinstance(value, (int, float)):
+        return float(value) / 1000.0 if value > 1e12 else float(value)
+    text = str(value)
+    if text.replace(".", "", 1).isdigit():
+        return parse_timestamp(float(text))
+    return datetime.fromisoformat(text.replace("Z", "+00:00")).timestamp()
+
+
+class _TokenSeries:
+    """Memory-mapped history file plus coverage metadata for one token."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.meta_path = path + ".meta.json"
+        self.covered_from: Optional[float] = None
+        self._map: Optional[np.memmap] = None
+        self._load()
+
+    def _load(self):
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path) as f:
+                self.covered_from = json.load(f).get("covered_from")
+        self._remap()
+
+    def _remap(self):
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        count = size // RECORD_DTYPE.itemsize
+        self._map = np.memmap(self.path, dtype=RECORD_DTYPE, mode="r", shape=(count,)) if count else None
+
+    @property
+    def records(self) -> np.ndarray:
+        return self._map if self._map is not None else np.empty(0, dtype=RECORD_DTYPE)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def write(self, records: np.ndarray, append: bool):
+        # Drop the mapping before touching the file so it can be extended or replaced
+        self._map = None
+        if append:
+            with open(self.path, "ab") as f:
+                f.write(records.tobytes())
+        else:
+            # Views handed out by range() still map the old file; replacing it
+            # instead of truncating keeps their pages valid
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(records.tobytes())
+            os.replace(tmp_path, self.path)
+        self._remap()
+
+    def save_meta(self):
+        with open(self.meta_path, "w") as f:
+            json.dump({"covered_from": self.covered_from}, f)
+
+
+class PriceHistoryStore:
+    """Per-token, append-only price history backed by memory-mapped NumPy arrays."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._series: Dict[str, _TokenSeries] = {}
+
+    def _path(self, token: str) -> str:
+        safe = re.sub(r"[^A-Za-z0-9_.-]", "_", token)[:48]
+        digest = hashlib.sha1(token.encode()).hexdigest()[:10]
+        return os.path.join(self.directory, f"{safe}-{digest}.f8")
+
+    def _get(self, token: str) -> _TokenSeries:
+        series = self._series.get(token)
+        if series is None:
+            os.makedirs(self.directory, exist_ok=True)
+            series = _TokenSeries(self._path(token))
+            self._series[token] = series
+        return series
+
+    def last_timestamp(self, token: str) -> Optional[float]:
+        records = self._get(token).records
+        return float(records["ts"][-1]) if len(records) else None
+
+    def covers(self, token: str, start: float) -> bool:
+        """True when the store holds history back to ``start``."""
+        covered_from = self._get(token).covered_from
+        return covered_from is not None and covered_from <= start
+
+    def append(self, token: str, points: Iterable[Tuple[float, float]],
+               covered_from: Optional[float] = None) -> int:
+        """Add ``(timestamp, price)`` points newer than the stored tail.
+
+        If ``covered_from`` reaches further back than the current coverage the
+        series is rebuilt from the merged data instead of appended to.
+
+        Returns:
+            Number of points written
+        """
+        series = self._get(token)
+        new = np.array(sorted(points), dtype=np.float64).reshape(-1, 2)
+        records = np.empty(len(new), dtype=RECORD_DTYPE)
+        records["ts"], records["price"] = new[:, 0], new[:, 1]
+
+        rebuild = covered_from is not None and (series.covered_from is None or covered_from < series.covered_from)
+        if rebuild:
+            old = np.array(series.records)
+            head = records[records["ts"] < old["ts"][0]] if len(old) else records
+            tail = records[records["ts"] > old["ts"][-1]] if len(old) else records[:0]
+            merged = np.concatenate([head, old, tail])
+            series.write(merged, append=False)
+            series.covered_from = covered_from
+            series.save_meta()
+            return len(head) + len(tail)
+
+        last = self.last_timestamp(token)
+        if last is not None:
+            records = records[records["ts"] > last]
+        if len(records):
+            series.write(records, append=True)
+        return len(records)
+
+    def range(self, token: str, start: float, end: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Return zero-copy timestamp and price views for ``start <= ts <= end``."""
+        records = self._get(token).records
+        ts = records["ts"]
+        lo = int(np.searchsorted(ts, start, side="left"))
+        hi = len(ts) if end is None else int(np.searchsorted(ts, end, side="right"))
+        return ts[lo:hi], records["price"][lo:hi]
+
+    def price_at(self, token: str, when: float) -> Optional[float]:
+        """Latest price recorded at or before ``when``."""
+        records = self._get(token).records
+        index = int(np.searchsorted(records["ts"], when, side="right")) - 1
+        return float(records["price"][index]) if index >= 0 else None
+
+    def price_change(self, token: str, hours: int, max_lag: float,
+                     now: Optional[float] = None) -> Optional[Dict[str, float]]:
+        """Compute the price change over ``hours`` from local data.
+
+        Returns None when the store is missing the window or its tail is older
+        than ``max_lag`` seconds.
+        """
+        now = time.time() if now is None else now
+        last = self.last_timestamp(token)
+        start = now - hours * 3600
+        if last is None or now - last > max_lag or not self.covers(token, start):
+            return None
+        current = self.price_at(token, now)
+        past = self.price_at(token, start)
+        if not current or not past:
+            return None
+        return {
+            "price_change_percent": (current - past) / past * 100,
+            "current_price": current
+        }
+
+    def to_records(self, token: str, start: float, end: Optional[float] = None) -> List[Dict[str, float]]:
+        ts, prices = self.range(token, start, end)
+        return [{"timestamp": float(t), "price": float(p)} for t, p in zip(ts, prices)]
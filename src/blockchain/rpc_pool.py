@@ -0,0 +1,260 @@
+"""
+Latency-aware pool of Sui fullnode endpoints.
+
+Each endpoint keeps an exponentially weighted moving average of its latency
+and error rate. Calls go to the healthy endpoint with the best score; a node
+that fails several times in a row is marked down and probed again in the
+background until it answers. Tail-sensitive calls can be hedged: when the
+chosen node has not answered within its recent p95 latency, the same call is
+sent to the runner-up and whichever answers first wins.
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+import aiohttp
+
+from src.config.settings import (
+    RPC_EWMA_ALPHA,
+    RPC_FAILURE_THRESHOLD,
+    RPC_RECHECK_INTERVAL,
+    RPC_PROBE_TIMEOUT,
+    RPC_HEDGE_QUANTILE,
+    RPC_HEDGE_DEFAULT_DELAY
+)
+from src.utils.http_pool import ConnectionPoolManager, pool_manager
+from src.utils.metrics import registry
+from src.blockchain.decoding import BatchTooLargeError, RpcError
+
+logger = logging.getLogger(__name__)
+
+ENDPOINT_LATENCY = registry.gauge("rpc_endpoint_latency_seconds", "EWMA latency per RPC endpoint")
+ENDPOINT_HEALTHY = registry.gauge("rpc_endpoint_healthy", "1 when the RPC endpoint is in rotation")
+HEDGED_CALLS = registry.counter(
+    "rpc_hedged_calls_total", "Hedged RPC calls by winner (primary or hedge)"
+)
+
+PROBE_BODY = {"jsonrpc": "2.0", "id": 0, "method": "sui_getLatestCheckpointSequenceNumber", "params": []}
+# Latency samples needed before the observed quantile replaces the default hedge delay
+MIN_HEDGE_SAMPLES = 20
+
+EndpointCall = Callable[[str], Awaitable[Any]]
+
+
+class RpcEndpoint:
+    """Health and latency statistics for one fullnode URL."""
+
+    def __init__(self, url: str, window: int = 200):
+        self.url = url
+        self.latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.consecutive_failures = 0
+        self.healthy = True
+        self.samples: Deque[float] = deque(maxlen=window)
+
+    def score(self) -> float:
+        """Lower is better; endpoints without samples score 0 so each is tried once."""
+        if self.latency is None:
+            return 0.0
+        return self.latency * (1.0 + 10.0 * self.error_rate)
+
+    def quantile(self, q: float) -> Optional[float]:
+        if len(self.samples) < MIN_HEDGE_SAMPLES:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "url": self.url,
+            "healthy": self.healthy,
+            "latency": round(self.latency, 4) if self.latency is not None else None,
+            "error_rate": round(self.error_rate, 3),
+            "consecutive_failures": self.consecutive_failures
+        }
+
+
+class RpcEndpointPool:
+    """Route RPC calls to the fastest healthy fullnode."""
+
+    def __init__(self, urls: List[str], pool: ConnectionPoolManager = None,
+                 alpha: float = RPC_EWMA_ALPHA,
+                 failure_threshold: int = RPC_FAILURE_THRESHOLD,
+                 recheck_interval: float = RPC_RECHECK_INTERVAL,
+                 probe_timeout: float = RPC_PROBE_TIMEOUT,
+                 hedge_quantile: float = RPC_HEDGE_QUANTILE,
+                 hedge_default_delay: float = RPC_HEDGE_DEFAULT_DELAY):
+        """
+        Args:
+            urls: Candidate fullnode URLs, in preference order for ties
+            pool: Connection pool used for health probes (defaults to the shared pool)
+            alpha: EWMA weight of the newest sample
+            failure_threshold: Consecutive failures before a node is taken out of rotation
+            recheck_interval: Seconds between background probes of down nodes
+            probe_timeout: Deadline for a single health probe
+            hedge_quantile: Latency quantile after which a hedged call fires
+            hedge_default_delay: Hedge delay used until a node has enough samples
+        """
+        if not urls:
+            raise ValueError("RpcEndpointPool needs at least one URL")
+        self.endpoints = [RpcEndpoint(url) for url in urls]
+        self.pool = pool or pool_manager
+        self.alpha = alpha
+        self.failure_threshold = failure_threshold
+        self.recheck_interval = recheck_interval
+        self.probe_timeout = probe_timeout
+        self.hedge_quantile = hedge_quantile
+        self.hedge_default_delay = hedge_default_delay
+        self._recheck_task: Optional[asyncio.Task] = None
+        for endpoint in self.endpoints:
+            ENDPOINT_HEALTHY.set(1, endpoint=endpoint.url)
+
+    def ranked(self) -> List[RpcEndpoint]:
+        """Healthy endpoints, best first; every endpoint when none is healthy."""
+        order = {endpoint.url: i for i, endpoint in enumerate(self.endpoints)}
+        candidates = [e for e in self.endpoints if e.healthy] or list(self.endpoints)
+        return sorted(candidates, key=lambda e: (e.score(), order[e.url]))
+
+    def best(self) -> RpcEndpoint:
+        return self.ranked()[0]
+
+    def hedge_delay(self, endpoint: RpcEndpoint) -> float:
+        observed = endpoint.quantile(self.hedge_quantile)
+        return observed if observed is not None else self.hedge_default_delay
+
+    def _observe_latency(self, endpoint: RpcEndpoint, latency: float):
+        endpoint.latency = latency if endpoint.latency is None else (
+            self.alpha * latency + (1 - self.alpha) * endpoint.latency
+        )
+        ENDPOINT_LATENCY.set(endpoint.latency, endpoint=endpoint.url)
+
+    def record_success(self, endpoint: RpcEndpoint, latency: float):
+        endpoint.samples.append(latency)
+        self._observe_latency(endpoint, latency)
+        endpoint.error_rate *= (1 - self.alpha)
+        endpoint.consecutive_failures = 0
+        if not endpoint.healthy:
+            logger.info(f"RPC endpoint {endpoint.url} is back in rotation")
+        endpoint.healthy = True
+        ENDPOINT_HEALTHY.set(1, endpoint=endpoint.url)
+
+    def record_failure(self, endpoint: RpcEndpoint, latency: float):
+        # A failure costs at least as much as its elapsed time in the latency average
+        endpoint.latency = latency if endpoint.latency is None else max(
+            endpoint.latency, self.alpha * latency + (1 - self.alpha) * endpoint.latency
+        )
+        endpoint.error_rate = self.alpha + (1 - self.alpha) * endpoint.error_rate
+        endpoint.consecutive_failures += 1
+        if endpoint.healthy and endpoint.consecutive_failures >= self.failure_threshold:
+            logger.warning(f"RPC endpoint {endpoint.url} marked down after "
+                           f"{endpoint.consecutive_failures} failures")
+            endpoint.healthy = False
+            ENDPOINT_HEALTHY.set(0, endpoint=endpoint.url)
+        ENDPOINT_LATENCY.set(endpoint.latency, endpoint=endpoint.url)
+
+    async def _attempt(self, endpoint: RpcEndpoint, fn: EndpointCall) -> Any:
+        start = time.monotonic()
+        try:
+            result = await fn(endpoint.url)
+        except asyncio.CancelledError:
+            # A hedged loser was still slower than the winner; let its average show it
+            self._observe_latency(endpoint, time.monotonic() - start)
+            raise
+        except (RpcError, BatchTooLargeError):
+            # A JSON-RPC error object means the node answered; the request was at fault
+            self.record_success(endpoint, time.monotonic() - start)
+            raise
+        except Exception:
+            # Transport failures, HTTP error statuses and unreadable bodies all
+            # count against the node, so one that rejects everything leaves rotation
+            self.record_failure(endpoint, time.monotonic() - start)
+            raise
+        self.record_success(endpoint, time.monotonic() - start)
+        return result
+
+    async def call(self, fn: EndpointCall, hedge: bool = False) -> Any:
+        """Run ``fn(url)`` against the best endpoint.
+
+        Args:
+            fn: Coroutine function performing the request against a base URL
+            hedge: Send a duplicate to the runner-up once the best endpoint is
+                slower than its recent p95, and take whichever answers first
+
+        Raises:
+            Exception: Whatever ``fn`` raised on the endpoint(s) tried
+        """
+        self._ensure_recheck()
+        ranked = self.ranked()
+        primary = ranked[0]
+        if not hedge or len(ranked) < 2:
+            return await self._attempt(primary, fn)
+
+        first = asyncio.ensure_future(self._attempt(primary, fn))
+        pending = {first}
+        error: Optional[BaseException] = None
+        try:
+            # Cancelling the caller during either wait must not leak the attempts
+            done, _ = await asyncio.wait(pending, timeout=self.hedge_delay(primary))
+            if done:
+                return first.result()
+
+            second = asyncio.ensure_future(self._attempt(ranked[1], fn))
+            pending = {first, second}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        HEDGED_CALLS.inc(winner="hedge" if task is second else "primary")
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def probe(self, endpoint: RpcEndpoint, timeout: Optional[float] = None) -> bool:
+        """Send a cheap RPC to ``endpoint`` and record the outcome."""
+        timeout = self.probe_timeout if timeout is None else timeout
+        session = await self.pool.get_session("sui_rpc")
+
+        async def send(url: str):
+            async with session.post(url, json=PROBE_BODY,
+                                    timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                response.raise_for_status()
+                return await response.json()
+
+        try:
+            await self._attempt(endpoint, send)
+            return True
+        except Exception as e:
+            logger.debug(f"Probe of {endpoint.url} failed: {str(e)}")
+            return False
+
+    def _ensure_recheck(self):
+        if self._recheck_task is None or self._recheck_task.done():
+            self._recheck_task = asyncio.ensure_future(self._recheck_loop())
+
+    async def _recheck_loop(self):
+        while True:
+            await asyncio.sleep(self.recheck_interval)
+            down = [e for e in self.endpoints if not e.healthy]
+            if down:
+                await asyncio.gather(*(self.probe(e) for e in down))
+
+    async def close(self):
+        """Stop the background recheck task."""
+        if self._recheck_task is not None:
+            self._recheck_task.cancel()
+            try:
+                await self._recheck_task
+            except asyncio.CancelledError:
+                pass
+            self._recheck_task = None
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Return per-endpoint health, in routing order."""
+        healthy = self.ranked()
+        rest = [e for e in self.endpoints if e not in healthy]
+        return [e.to_dict() for e in healthy + rest]
@@ -1,11 +1,40 @@
 import aiohttp
+import asyncio
 import logging
-from typing import Dict, List, Any
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Callable, Optional, Type
 from datetime import datetime, timedelta
 from src.config.settings import (
     SUI_RPC_URL,
     BLOCKVISION_API_BASE,
-    SUIVISION_API_BASE
+    SUIVISION_API_BASE,
+    DASHBOARD_ENDPOINT_TIMEOUT,
+    RESPONSE_CACHE_DEFAULT_TTL,
+    RESPONSE_CACHE_MAX_STALE,
+    RESPONSE_CACHE_TTLS,
+    PRICE_BATCH_WINDOW,
+    PRICE_BATCH_MAX_SIZE,
+    PRICE_HISTORY_DIR,
+    PRICE_HISTORY_MAX_LAG
+)
+from src.utils.http_pool import ConnectionPoolManager, pool_manager
+from src.utils.response_cache import ResponseCache
+from src.utils.singleflight import SingleFlight
+from src.utils.batcher import MicroBatcher
+from src.utils.resilience import ResilienceRegistry, resilience as shared_resilience
+from src.utils.rate_limiter import RateLimiterRegistry, rate_limiters as shared_rate_limiters
+from src.blockchain.price_alerts import PriceAlertEngine
+from src.blockchain.price_history import PriceHistoryStore, parse_timestamp
+from src.blockchain.decoding import (
+    TvlProject,
+    ProjectStat,
+    TradingPair,
+    FarmingPool,
+    NftCollection,
+    Record,
+    decode_list
 )
 
 # Configure logging
@@ -15,103 +44,215 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Dashboard field -> (SuiVision path, response list key, record type)
+DASHBOARD_ENDPOINTS = {
+    "tvl_data": ("/defi/tvl", "projects", TvlProject),
+    "top_projects": ("/defi/projects", "projects", ProjectStat),
+    "trading_pairs": ("/coins/pairs", "pairs", TradingPair),
+    "farming_pools": ("/defi/pools", "pools", FarmingPool),
+    "nft_collections": ("/nfts/collections", "collections", NftCollection)
+}
+
+
+class SuiClientError(Exception):
+    """Raised when an upstream API call fails."""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class DashboardSnapshot:
+    """On-chain dashboard data fetched in one concurrent round."""
+    tvl_data: List[TvlProject] = field(default_factory=list)
+    top_projects: List[ProjectStat] = field(default_factory=list)
+    trading_pairs: List[TradingPair] = field(default_factory=list)
+    farming_pools: List[FarmingPool] = field(default_factory=list)
+    nft_collections: List[NftCollection] = field(default_factory=list)
+    errors: Dict[str, str] = field(default_factory=dict)
+    fetched_at: datetime = field(default_factory=datetime.now)
+
+    @property
+    def is_partial(self) -> bool:
+        """True when at least one endpoint failed."""
+        return bool(self.errors)
+
+
 class SuiClient:
-    def __init__(self):
-        """Initialize Sui blockchain client."""
+    def __init__(self, pool: ConnectionPoolManager = None, cache: Optional[ResponseCache] = None,
+                 use_cache: bool = True, alert_engine: Optional[PriceAlertEngine] = None,
+                 price_history: Optional[PriceHistoryStore] = None,
+                 resilience: Optional[ResilienceRegistry] = None,
+                 rate_limiters: Optional[RateLimiterRegistry] = None):
+        """Initialize Sui blockchain client.
+
+        Args:
+            pool: Connection pool to borrow sessions from (defaults to the shared pool)
+            cache: Response cache for GET endpoints (a per-client cache is created by default)
+            use_cache: Set to False to always hit the upstream APIs
+            alert_engine: Price alert engine fed by price lookups
+            price_history: Local price history store (defaults to PRICE_HISTORY_DIR)
+            resilience: Retry and circuit-breaker policy (defaults to the shared registry)
+            rate_limiters: Token buckets per upstream (defaults to the shared limits)
+        """
         self.session = None
+        self.pool = pool or pool_manager
+        if cache is None and use_cache:
+            cache = ResponseCache(
+                name="sui",
+                default_ttl=RESPONSE_CACHE_DEFAULT_TTL,
+                ttls=RESPONSE_CACHE_TTLS,
+                max_stale=RESPONSE_CACHE_MAX_STALE
+            )
+        self.cache = cache
+        self.price_flights = SingleFlight("sui_token_price")
+        self.alert_engine = alert_engine or PriceAlertEngine()
+        self.price_history = price_history or PriceHistoryStore(PRICE_HISTORY_DIR)
+        self.resilience = resilience or shared_resilience
+        self.rate_limiters = rate_limiters or shared_rate_limiters
+        # Single-token price lookups are folded into /coins/prices/batch calls
+        self.price_batcher = None
+        if PRICE_BATCH_WINDOW > 0:
+            self.price_batcher = MicroBatcher(
+                self._fetch_price_batch,
+                max_batch_size=PRICE_BATCH_MAX_SIZE,
+                max_delay=PRICE_BATCH_WINDOW,
+                name="sui_token_price"
+            )
         self.rpc_url = SUI_RPC_URL
         self.blockvision_api = BLOCKVISION_API_BASE
         self.suivision_api = SUIVISION_API_BASE
 
     async def __aenter__(self):
-        """Initialize aiohttp session."""
-        self.session = aiohttp.ClientSession()
+        """Borrow the pooled aiohttp session."""
+        self.session = await self.pool.get_session("sui")
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Close aiohttp session."""
-        if self.session:
-            await self.session.close()
+        """Release the pooled session; the pool keeps its connections alive."""
+        self.session = None
 
-    async def get_tvl_by_project(self) -> List[Dict[str, Any]]:
+    async def _get_json(self, base: str, path: str, params: Dict[str, Any] = None,
+                        endpoint: str = None, decode: Callable[[bytes], Any] = None) -> Any:
+        """GET a JSON endpoint through the response cache.
+
+        Args:
+            base: API base URL
+            path: Request path appended to ``base``
+            params: Query parameters
+            endpoint: Endpoint name used for the cache TTL (defaults to ``path``)
+            decode: Converts the raw body (defaults to plain JSON decoding)
+
+        Raises:
+            SuiClientError: The upstream answered with a non-200 status
+            CircuitOpenError: The upstream's circuit is open
+        """
+        url = f"{base}{path}"
+        upstream = self._upstream(base)
+        endpoint = endpoint or path
+        guard = lambda fetch: self.resilience.call(
+            upstream, endpoint, self.rate_limiters.limited(f"{upstream}_api", fetch)
+        )
+        if self.cache is None:
+            async def fetch():
+                async with self.session.get(url, params=params) as response:
+                    if response.status != 200:
+                        raise SuiClientError(f"HTTP {response.status} from {path}", response.status)
+                    return decode(await response.read()) if decode else await response.json()
+            return await guard(fetch)
+        try:
+            return await self.cache.get_json(
+                self.session, url, params=params, endpoint=endpoint, decode=decode, guard=guard
+            )
+        except aiohttp.ClientResponseError as e:
+            raise SuiClientError(f"HTTP {e.status} from {path}", e.status) from e
+
+    def _upstream(self, base: str) -> str:
+        """Circuit-breaker name for an API base URL."""
+        return "blockvision" if base == self.blockvision_api else "suivision"
+
+    async def _fetch_list(self, path: str, key: str, record_type: Type[Record]) -> List[Record]:
+        """Fetch a SuiVision list endpoint as typed records, raising on non-200 responses."""
+        return await self._get_json(
+            self.suivision_api, path, decode=lambda raw: decode_list(raw, key, record_type)
+        )
+
+    async def get_tvl_by_project(self) -> List[TvlProject]:
         """Get TVL data for all Sui projects."""
         try:
-            async with self.session.get(f"{self.suivision_api}/defi/tvl") as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return data.get('projects', [])
-                else:
-                    logger.error(f"Failed to fetch TVL data: {response.status}")
-                    return []
+            return await self._fetch_list(*DASHBOARD_ENDPOINTS["tvl_data"])
         except Exception as e:
             logger.error(f"Error fetching TVL data: {str(e)}")
             return []
 
-    async def get_top_projects(self) -> List[Dict[str, Any]]:
+    async def get_top_projects(self) -> List[ProjectStat]:
         """Get top Sui projects by volume."""
         try:
-            async with self.session.get(f"{self.suivision_api}/defi/projects") as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return data.get('projects', [])
-                else:
-                    logger.error(f"Failed to fetch top projects: {response.status}")
-                    return []
+            return await self._fetch_list(*DASHBOARD_ENDPOINTS["top_projects"])
         except Exception as e:
             logger.error(f"Error fetching top projects: {str(e)}")
             return []
 
-    async def get_trading_pairs(self) -> List[Dict[str, Any]]:
+    async def get_trading_pairs(self) -> List[TradingPair]:
         """Get top trading pairs on Sui."""
         try:
-            async with self.session.get(f"{self.suivision_api}/coins/pairs") as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return data.get('pairs', [])
-                else:
-                    logger.error(f"Failed to fetch trading pairs: {response.status}")
-                    return []
+            return await self._fetch_list(*DASHBOARD_ENDPOINTS["trading_pairs"])
         except Exception as e:
             logger.error(f"Error fetching trading pairs: {str(e)}")
             return []
 
-    async def get_farming_pools(self) -> List[Dict[str, Any]]:
+    async def get_farming_pools(self) -> List[FarmingPool]:
         """Get top farming pools on Sui."""
         try:
-            async with self.session.get(f"{self.suivision_api}/defi/pools") as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return data.get('pools', [])
-                else:
-                    logger.error(f"Failed to fetch farming pools: {response.status}")
-                    return []
+            return await self._fetch_list(*DASHBOARD_ENDPOINTS["farming_pools"])
         except Exception as e:
             logger.error(f"Error fetching farming pools: {str(e)}")
             return []
 
-    async def get_nft_collections(self) -> List[Dict[str, Any]]:
+    async def get_nft_collections(self) -> List[NftCollection]:
         """Get top NFT collections by volume."""
         try:
-            async with self.session.get(f"{self.suivision_api}/nfts/collections") as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return data.get('collections', [])
-                else:
-                    logger.error(f"Failed to fetch NFT collections: {response.status}")
-                    return []
+            return await self._fetch_list(*DASHBOARD_ENDPOINTS["nft_collections"])
         except Exception as e:
             logger.error(f"Error fetching NFT collections: {str(e)}")
             return []
 
+    async def get_dashboard_snapshot(self, timeout: float = DASHBOARD_ENDPOINT_TIMEOUT) -> DashboardSnapshot:
+        """Fetch all dashboard endpoints concurrently.
+
+        Args:
+            timeout: Per-endpoint timeout in seconds
+
+        Returns:
+            DashboardSnapshot with the data that arrived in time; endpoints that
+            failed or timed out are left empty and listed in ``errors``
+        """
+        async def fetch(path: str, key: str, record_type: Type[Record]):
+            try:
+                return await asyncio.wait_for(self._fetch_list(path, key, record_type), timeout)
+            except asyncio.TimeoutError:
+                raise SuiClientError(f"timed out after {timeout}s")
+
+        names = list(DASHBOARD_ENDPOINTS)
+        results = await asyncio.gather(
+            *(fetch(*DASHBOARD_ENDPOINTS[name]) for name in names),
+            return_exceptions=True
+        )
+
+        snapshot = DashboardSnapshot()
+        for name, result in zip(names, results):
+            if isinstance(result, Exception):
+                snapshot.errors[name] = str(result) or type(result).__name__
+                logger.error(f"Error fetching dashboard {name}: {snapshot.errors[name]}")
+            else:
+                setattr(snapshot, name, result)
+        return snapshot
+
     async def get_network_metrics(self) -> Dict[str, Any]:
         """Get overall network metrics."""
         try:
-            async with self.session.get(f"{self.blockvision_api}/network/metrics") as response:
-                if response.status == 200:
-                    return await response.json()
-                else:
-                    logger.error(f"Failed to fetch network metrics: {response.status}")
-                    return {}
+            return await self._get_json(self.blockvision_api, "/network/metrics")
         except Exception as e:
             logger.error(f"Error fetching network metrics: {str(e)}")
             return {}
@@ -119,13 +260,8 @@ class SuiClient:
     async def get_active_accounts(self, hours: int = 24) -> int:
         """Get number of active accounts in the last specified hours."""
         try:
-            async with self.session.get(f"{self.blockvision_api}/network/active-accounts") as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return data.get('active_accounts', 0)
-                else:
-                    logger.error(f"Failed to fetch active accounts: {response.status}")
-                    return 0
+            data = await self._get_json(self.blockvision_api, "/network/active-accounts")
+            return data.get('active_accounts', 0)
         except Exception as e:
             logger.error(f"Error fetching active accounts: {str(e)}")
             return 0
@@ -133,13 +269,8 @@ class SuiClient:
     async def get_transaction_count(self, hours: int = 24) -> int:
         """Get number of transactions in the last specified hours."""
         try:
-            async with self.session.get(f"{self.blockvision_api}/network/transactions") as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return data.get('transaction_count', 0)
-                else:
-                    logger.error(f"Failed to fetch transaction count: {response.status}")
-                    return 0
+            data = await self._get_json(self.blockvision_api, "/network/transactions")
+            return data.get('transaction_count', 0)
         except Exception as e:
             logger.error(f"Error fetching transaction count: {str(e)}")
             return 0
@@ -147,13 +278,11 @@ class SuiClient:
     async def get_token_price(self, token_address: str) -> float:
         """Get current price of a specific token."""
         try:
-            async with self.session.get(f"{self.suivision_api}/coins/price/{token_address}") as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return float(data.get('price', 0))
-                else:
-                    logger.error(f"Failed to fetch token price: {response.status}")
-                    return 0.0
+            # Concurrent lookups of the same token share one upstream request
+            price = await self.price_flights.do(token_address, lambda: self._load_token_price(token_address))
+            if price > 0:
+                await self.alert_engine.on_price(token_address, price)
+            return price
         except Exception as e:
             logger.error(f"Error fetching token price: {str(e)}")
             return 0.0
@@ -166,22 +295,40 @@ class SuiClient:
             days: Number of days of historical data to fetch
             
         Returns:
-            List of dicts containing timestamp and price data
+            List of dicts containing timestamp (epoch seconds) and price data
         """
+        if days <= 0:
+            return []
+        now = time.time()
+        start = now - days * 86400
         try:
-            async with self.session.get(
-                f"{self.suivision_api}/coins/price/history/{token_address}",
-                params={"days": days}
-            ) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return data.get('history', [])
-                else:
-                    logger.error(f"Failed to fetch token price history: {response.status}")
-                    return []
+            await self._sync_price_history(token_address, days, start, now)
         except Exception as e:
             logger.error(f"Error fetching token price history: {str(e)}")
-            return []
+        return self.price_history.to_records(token_address, start)
+
+    async def _sync_price_history(self, token_address: str, days: int, start: float, now: float):
+        """Download only the part of the window missing from the local store."""
+        last = self.price_history.last_timestamp(token_address)
+        covered = self.price_history.covers(token_address, start)
+        if covered and last is not None:
+            if now - last <= PRICE_HISTORY_MAX_LAG:
+                return
+            fetch_days = min(days, max(1, math.ceil((now - last) / 86400)))
+        else:
+            fetch_days = days
+
+        data = await self._get_json(
+            self.suivision_api,
+            f"/coins/price/history/{token_address}",
+            params={"days": fetch_days},
+            endpoint="/coins/price/history"
+        )
+        points = [
+            (parse_timestamp(point["timestamp"]), float(point["price"]))
+            for point in data.get('history', [])
+        ]
+        self.price_history.append(token_address, points, covered_from=None if covered else start)
 
     async def get_token_price_change(self, token_address: str, hours: int = 24) -> Dict[str, float]:
         """Get price change percentage for a token over specified hours.
@@ -193,23 +340,51 @@ class SuiClient:
         Returns:
             Dict containing price change percentage and current price
         """
+        local = self.price_history.price_change(token_address, hours, PRICE_HISTORY_MAX_LAG)
+        if local is not None:
+            return local
         try:
-            async with self.session.get(
-                f"{self.suivision_api}/coins/price/change/{token_address}",
-                params={"hours": hours}
-            ) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return {
-                        "price_change_percent": float(data.get('price_change_percent', 0)),
-                        "current_price": float(data.get('current_price', 0))
-                    }
-                else:
-                    logger.error(f"Failed to fetch token price change: {response.status}")
-                    return {"price_change_percent": 0, "current_price": 0}
+            data = await self._get_json(
+                self.suivision_api,
+                f"/coins/price/change/{token_address}",
+                params={"hours": hours},
+                endpoint="/coins/price/change"
+            )
+            return {
+                "price_change_percent": float(data.get('price_change_percent', 0)),
+                "current_price": float(data.get('current_price', 0))
+            }
         except Exception as e:
             logger.error(f"Error fetching token price change: {str(e)}")
-            return {"price_change_percent": 0, "current_price": 0}
+            return {"price_change_percent": 0.0, "current_price": 0.0}
+
+    async def _load_token_price(self, token_address: str) -> float:
+        """Load one price, through the micro-batcher when batching is enabled."""
+        if self.price_batcher is not None:
+            try:
+                return await self.price_batcher.load(token_address)
+            except KeyError:
+                return 0.0
+        data = await self._get_json(
+            self.suivision_api, f"/coins/price/{token_address}", endpoint="/coins/price"
+        )
+        return float(data.get('price', 0))
+
+    async def _fetch_price_batch(self, token_addresses: List[str]) -> Dict[str, float]:
+        """POST a batch price request, raising on non-200 responses."""
+        async def fetch():
+            async with self.session.post(
+                f"{self.suivision_api}/coins/prices/batch",
+                json={"tokens": token_addresses}
+            ) as response:
+                if response.status != 200:
+                    raise SuiClientError(f"HTTP {response.status} from /coins/prices/batch", response.status)
+                return await response.json()
+
+        data = await self.resilience.call(
+            "suivision", "/coins/prices/batch", self.rate_limiters.limited("suivision_api", fetch)
+        )
+        return {addr: float(price) for addr, price in data.get('prices', {}).items()}
 
     async def get_multiple_token_prices(self, token_addresses: List[str]) -> Dict[str, float]:
         """Get current prices for multiple tokens in a single API call.
@@ -220,17 +395,10 @@ class SuiClient:
         Returns:
             Dict mapping token addresses to their current prices
         """
+        if not token_addresses:
+            return {}
         try:
-            async with self.session.post(
-                f"{self.suivision_api}/coins/prices/batch",
-                json={"tokens": token_addresses}
-            ) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return {addr: float(price) for addr, price in data.get('prices', {}).items()}
-                else:
-                    logger.error(f"Failed to fetch multiple token prices: {response.status}")
-                    return {}
+            return await self._fetch_price_batch(token_addresses)
         except Exception as e:
             logger.error(f"Error fetching multiple token prices: {str(e)}")
             return {}
@@ -239,6 +407,9 @@ class SuiClient:
                              is_above: bool = True) -> Dict[str, Any]:
         """Set up a price alert for a token.
         
+        Alerts are evaluated locally by ``self.alert_engine`` on every price
+        fetched through this client; subscribe to the engine to be notified.
+        
         Args:
             token_address: The token's contract address
             price_target: Target price to monitor
@@ -248,19 +419,12 @@ class SuiClient:
             Dict containing alert status and details
         """
         try:
-            async with self.session.post(
-                f"{self.suivision_api}/coins/price/alert",
-                json={
-                    "token_address": token_address,
-                    "price_target": price_target,
-                    "is_above": is_above
-                }
-            ) as response:
-                if response.status == 200:
-                    return await response.json()
-                else:
-                    logger.error(f"Failed to set price alert: {response.status}")
-                    return {"status": "error", "message": "Failed to set alert"}
+            alert = self.alert_engine.add_alert(token_address, price_target, is_above)
+            return {
+                "status": "success",
+                "message": f"Alert {alert.alert_id} set for {token_address}",
+                "alert": alert.to_dict()
+            }
         except Exception as e:
             logger.error(f"Error setting price alert: {str(e)}")
-            return {"status": "error", "message": str(e)} 
\ No newline at end of file
+            return {"status": "error", "message": str(e)}
@@ -0,0 +1,226 @@
+"""
+Embedded SQLite index of ingested transactions and balance changes.
+
+The checkpoint follower feeds every transaction into a local database so
+questions such as "recent large transfers", "top senders" and "active
+accounts" are answered with an indexed query instead of a remote API call.
+The database runs in WAL mode, so readers in other processes (the agent)
+never block the writer (the bot's follower). Inserts and prunes run on a
+dedicated writer thread with its own connection, so ingesting a checkpoint
+never blocks the event loop. Rows older than the retention window (by
+default the window activity queries cover) are pruned periodically.
+
+Amounts are u64 and can exceed SQLite's signed 64-bit integers, so each
+balance change stores the exact value as text next to a REAL copy that is
+used for indexing and ordering.
+"""
+import asyncio
+import logging
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from src.config.settings import TX_INDEX_PATH, TX_INDEX_RETENTION, TX_INDEX_PRUNE_INTERVAL
+from src.blockchain.decoding import SuiTransaction
+from src.utils.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+# SUI's coin type as spelled in transaction balance changes
+SUI_COIN_TYPE = "0x2::sui::SUI"
+
+INDEX_QUERY_SECONDS = registry.histogram("tx_index_query_seconds", "Local transaction index query time")
+INDEX_PRUNED = registry.counter("tx_index_pruned_total", "Rows removed from the transaction index by retention")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    digest TEXT PRIMARY KEY,
+    checkpoint INTEGER NOT NULL,
+    timestamp REAL NOT NULL,
+    sender TEXT NOT NULL,
+    status TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS balance_changes (
+    digest TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    sender TEXT NOT NULL,
+    owner TEXT NOT NULL,
+    coin_type TEXT NOT NULL,
+    amount REAL NOT NULL,
+    raw_amount TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tx_sender ON transactions (sender, timestamp);
+CREATE INDEX IF NOT EXISTS idx_tx_timestamp ON transactions (timestamp);
+CREATE INDEX IF NOT EXISTS idx_bc_coin_amount ON balance_changes (coin_type, amount);
+CREATE INDEX IF NOT EXISTS idx_bc_amount ON balance_changes (amount);
+CREATE INDEX IF NOT EXISTS idx_bc_timestamp ON balance_changes (timestamp);
+CREATE INDEX IF NOT EXISTS idx_bc_digest ON balance_changes (digest);
+"""
+
+
+class TransactionIndex:
+    """Local, queryable store of recent on-chain activity."""
+
+    def __init__(self, path: str = TX_INDEX_PATH, retention: float = TX_INDEX_RETENTION,
+                 prune_interval: float = TX_INDEX_PRUNE_INTERVAL):
+        """
+        Args:
+            path: SQLite database file
+            retention: Seconds of history kept
+            prune_interval: Minimum seconds between automatic prunes while ingesting
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.retention = retention
+        self.prune_interval = prune_interval
+        self._last_prune = 0.0
+        # Reads use this connection; writes use one owned by the writer thread
+        self._conn = self._connect()
+        self._writer: Optional[ThreadPoolExecutor] = None
+        self._write_conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+        return conn
+
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._writer is None:
+            self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tx-index-writer")
+        return self._writer
+
+    def _writer_conn(self) -> sqlite3.Connection:
+        """Connection of the writer thread, opened on its first write."""
+        if self._write_conn is None:
+            self._write_conn = self._connect()
+        return self._write_conn
+
+    async def __call__(self, checkpoint: int, transactions: List[SuiTransaction]):
+        """Checkpoint follower consumer; the writes happen on the writer thread."""
+        await asyncio.get_running_loop().run_in_executor(self._executor(), self._ingest, transactions)
+
+    def _ingest(self, transactions: List[SuiTransaction]):
+        self._add(transactions)
+        if time.time() - self._last_prune >= self.prune_interval:
+            self._prune(time.time())
+
+    def add(self, transactions: List[SuiTransaction]):
+        """Insert transactions and their balance changes; already indexed digests are skipped."""
+        self._executor().submit(self._add, transactions).result()
+
+    def _add(self, transactions: List[SuiTransaction]):
+        conn = self._writer_conn()
+        with conn:
+            for tx in transactions:
+                inserted = conn.execute(
+                    "INSERT OR IGNORE INTO transactions VALUES (?, ?, ?, ?, ?)",
+                    (tx.digest, tx.checkpoint, tx.timestamp, tx.sender, tx.status)
+                ).rowcount
+                if not inserted:
+                    continue
+                conn.executemany(
+                    "INSERT INTO balance_changes VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [(tx.digest, tx.timestamp, tx.sender, change.owner, change.coin_type,
+                      float(change.amount), str(change.amount)) for change in tx.balance_changes]
+                )
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """Delete rows older than the retention window and return how many went."""
+        now = time.time() if now is None else now
+        return self._executor().submit(self._prune, now).result()
+
+    def _prune(self, now: float) -> int:
+        cutoff = now - self.retention
+        conn = self._writer_conn()
+        with conn:
+            removed = conn.execute("DELETE FROM balance_changes WHERE timestamp < ?", (cutoff,)).rowcount
+            removed += conn.execute("DELETE FROM transactions WHERE timestamp < ?", (cutoff,)).rowcount
+        self._last_prune = now
+        if removed:
+            INDEX_PRUNED.inc(removed)
+            logger.info(f"Pruned {removed} transaction index rows older than {self.retention}s")
+        return removed
+
+    def _query(self, name: str, sql: str, params: tuple = ()) -> List[sqlite3.Row]:
+        started = time.monotonic()
+        rows = self._conn.execute(sql, params).fetchall()
+        INDEX_QUERY_SECONDS.observe(time.monotonic() - started, query=name)
+        return rows
+
+    def latest_timestamp(self) -> Optional[float]:
+        """Timestamp of the newest indexed transaction, or None when empty."""
+        return self._query("latest", "SELECT MAX(timestamp) FROM transactions")[0][0]
+
+    def has_activity_since(self, since: float) -> bool:
+        """Whether the index holds transactions from ``since`` onwards, i.e. ingestion is live."""
+        latest = self.latest_timestamp()
+        return latest is not None and latest >= since
+
+    def large_transfers(self, coin_type: str, min_amount: int = 0,
+                        since: float = 0.0, limit: int = 20) -> List[Dict[str, Any]]:
+        """Incoming balance changes of one coin of at least ``min_amount``, largest first.
+
+        Raw amounts of different coins have different decimals, so transfers are
+        only ever ranked within a single coin type.
+        """
+        rows = self._query(
+            "large_transfers",
+            "SELECT digest, timestamp, sender, owner, coin_type, raw_amount FROM balance_changes "
+            "WHERE coin_type = ? AND amount >= ? AND amount > 0 AND timestamp >= ? "
+            "ORDER BY amount DESC LIMIT ?",
+            (coin_type, float(min_amount), since, limit)
+        )
+        return [
+            {"digest": row["digest"], "timestamp": row["timestamp"], "sender": row["sender"],
+             "recipient": row["owner"], "coin_type": row["coin_type"], "amount": int(row["raw_amount"])}
+            for row in rows
+        ]
+
+    def whale_transfers(self, thresholds: Dict[str, int], since: float = 0.0,
+                        limit: int = 20) -> List[Dict[str, Any]]:
+        """Transfers at or above the per-coin thresholds, newest first."""
+        transfers = []
+        for coin_type, threshold in thresholds.items():
+            transfers.extend(self.large_transfers(coin_type, threshold, since, limit))
+        return sorted(transfers, key=lambda t: t["timestamp"], reverse=True)[:limit]
+
+    def top_senders(self, since: float = 0.0, limit: int = 10) -> List[Dict[str, Any]]:
+        """Addresses that sent the most transactions since ``since``."""
+        rows = self._query(
+            "top_senders",
+            "SELECT sender, COUNT(*) AS transactions FROM transactions WHERE timestamp >= ? "
+            "GROUP BY sender ORDER BY transactions DESC, sender LIMIT ?",
+            (since, limit)
+        )
+        return [{"address": row["sender"], "transactions": row["transactions"]} for row in rows]
+
+    def active_accounts(self, since: float = 0.0) -> int:
+        """Distinct senders since ``since``."""
+        return self._query(
+            "active_accounts", "SELECT COUNT(DISTINCT sender) FROM transactions WHERE timestamp >= ?", (since,)
+        )[0][0]
+
+    def recent_transactions(self, limit: int = 10) -> List[Dict[str, Any]]:
+        rows = self._query(
+            "recent_transactions",
+            "SELECT digest, checkpoint, timestamp, sender, status FROM transactions "
+            "ORDER BY timestamp DESC LIMIT ?",
+            (limit,)
+        )
+        return [dict(row) for row in rows]
+
+    def close(self):
+        if self._writer is not None:
+            if self._write_conn is not None:
+                self._writer.submit(self._write_conn.close).result()
+            self._writer.shutdown(wait=True)
+            self._writer = None
+            self._write_conn = None
+        self._conn.close()
@@ -1,4 +1,5 @@
 import asyncio
+import functools
 import logging
 from datetime import datetime, timedelta
 from typing import List, Dict, Any
@@ -6,7 +7,21 @@ from src.twitter.tracker import TwitterTracker
 from src.twitter.memecoin_engagement import MemecoinEngagement
 from src.utils.ai_helper import AIHelper
 from src.blockchain.sui_client import SuiClient
+from src.blockchain.decoding import TvlProject, ProjectStat, TradingPair, FarmingPool, NftCollection
+from src.blockchain.checkpoint_follower import CheckpointFollower, VolumeStats, WhaleTracker
+from src.blockchain.event_stream import EventStream, WhaleSwaps
+from src.blockchain.tx_index import TransactionIndex
+from src.blockchain.rpc_pool import RpcEndpointPool
+from src.eliza.tools.sui_tool import SuiTool
+from src.utils.http_pool import pool_manager
+from src.utils.quota import quota_ledger
 from src.config.settings import (
+    SUI_RPC_URL,
+    SUI_RPC_ENDPOINTS,
+    CHECKPOINT_FOLLOWER_ENABLED,
+    WHALE_THRESHOLDS,
+    EVENT_STREAM_ENABLED,
+    WATCHED_EVENT_TYPES,
     TWEET_ANALYSIS_INTERVAL,
     ONCHAIN_UPDATE_INTERVAL,
     GIVEAWAY_INTERVAL,
@@ -29,6 +44,21 @@ class CapybaraBot:
         self.memecoin_engagement = MemecoinEngagement()
         self.ai_helper = AIHelper()
         self.sui_client = SuiClient()
+        self.sui_client.alert_engine.subscribe(self._on_price_alert)
+        self.sui_rpc = SuiTool(SUI_RPC_URL, endpoints=RpcEndpointPool(SUI_RPC_ENDPOINTS))
+        self.volume_stats = VolumeStats()
+        self.checkpoint_follower = CheckpointFollower(self.sui_rpc)
+        self.checkpoint_follower.subscribe(self.volume_stats)
+        # The index is only fed while the follower runs; the agent process reads it
+        self.tx_index = None
+        if CHECKPOINT_FOLLOWER_ENABLED:
+            self.tx_index = TransactionIndex()
+            self.checkpoint_follower.subscribe(self.tx_index)
+        self.checkpoint_follower.subscribe(WhaleTracker(WHALE_THRESHOLDS, self._on_whale_transaction))
+        self.event_stream = EventStream(
+            self.sui_rpc, [{"MoveEventType": event_type} for event_type in WATCHED_EVENT_TYPES]
+        )
+        self.event_stream.subscribe(WhaleSwaps(self.sui_rpc.objects, WHALE_THRESHOLDS, self._on_whale_event))
         self.daily_tweet_count = 0
         self.daily_reply_count = 0
         self.last_reset = datetime.now()
@@ -47,12 +77,30 @@ class CapybaraBot:
             self._run_giveaways(),
             self._run_memecoin_engagement()
         ]
+        if CHECKPOINT_FOLLOWER_ENABLED:
+            tasks.append(self.checkpoint_follower.run())
+        if EVENT_STREAM_ENABLED:
+            tasks.append(self.event_stream.run())
         
         try:
             await asyncio.gather(*tasks)
         except Exception as e:
             logger.error(f"Error in main bot loop: {str(e)}")
             raise
+        finally:
+            if self.tx_index is not None:
+                self.tx_index.close()
+            quota_ledger.flush()
+            await pool_manager.close()
+
+    async def _run_blocking(self, fn, *args, **kwargs):
+        """Run a synchronous Twitter call on a worker thread.
+
+        The Twitter clients wait for rate-limit tokens with a blocking sleep,
+        which must never happen on the event loop thread.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(fn, *args, **kwargs))
 
     async def _run_tweet_analysis(self):
         """Run tweet analysis and engagement tasks."""
@@ -62,7 +110,7 @@ class CapybaraBot:
                 self._reset_daily_counters()
                 
                 # Analyze tweets from Sui accounts
-                tweets = self.twitter_tracker.analyze_sui_accounts()
+                tweets = await self._run_blocking(self.twitter_tracker.analyze_sui_accounts)
                 
                 # Generate and post content based on analysis
                 if self.daily_tweet_count < MAX_DAILY_TWEETS:
@@ -84,21 +132,20 @@ class CapybaraBot:
         while True:
             try:
                 async with self.sui_client as client:
-                    # Get various on-chain metrics
-                    tvl_data = await client.get_tvl_by_project()
-                    top_projects = await client.get_top_projects()
-                    trading_pairs = await client.get_trading_pairs()
-                    farming_pools = await client.get_farming_pools()
-                    nft_collections = await client.get_nft_collections()
+                    # Get various on-chain metrics concurrently
+                    snapshot = await client.get_dashboard_snapshot()
+                    if snapshot.is_partial:
+                        logger.warning(f"Partial on-chain snapshot, failed: {list(snapshot.errors)}")
                     
                     # Generate and post updates
                     if self.daily_tweet_count < MAX_DAILY_TWEETS:
                         await self._post_onchain_updates(
-                            tvl_data, top_projects, trading_pairs,
-                            farming_pools, nft_collections
+                            snapshot.tvl_data, snapshot.top_projects, snapshot.trading_pairs,
+                            snapshot.farming_pools, snapshot.nft_collections
                         )
                 
-                await asyncio.sleep(ONCHAIN_UPDATE_INTERVAL)
+                # Poll less often while the metered APIs' quota runs low
+                await asyncio.sleep(quota_ledger.stretch(ONCHAIN_UPDATE_INTERVAL, "blockvision", "suivision"))
                 
             except Exception as e:
                 logger.error(f"Error in on-chain updates task: {str(e)}")
@@ -120,7 +167,9 @@ class CapybaraBot:
         while True:
             try:
                 # Get engaging content from memecoin communities
-                community_content = self.memecoin_engagement.get_engaging_community_content(hours=24)
+                community_content = await self._run_blocking(
+                    self.memecoin_engagement.get_engaging_community_content, hours=24
+                )
                 
                 # Engage with community content
                 for content in community_content:
@@ -136,9 +185,9 @@ class CapybaraBot:
                     
                     if response:
                         # Post reply and engage with the tweet
-                        if self.memecoin_engagement.post_reply(content['id'], response):
-                            self.memecoin_engagement.like_tweet(content['id'])
-                            self.memecoin_engagement.retweet(content['id'])
+                        if await self._run_blocking(self.memecoin_engagement.post_reply, content['id'], response):
+                            await self._run_blocking(self.memecoin_engagement.like_tweet, content['id'])
+                            await self._run_blocking(self.memecoin_engagement.retweet, content['id'])
                             self.daily_reply_count += 1
                             logger.info(f"Engaged with memecoin community tweet: {content['id']}")
                 
@@ -194,19 +243,19 @@ class CapybaraBot:
         except Exception as e:
             logger.error(f"Error engaging with tweets: {str(e)}")
 
-    async def _post_onchain_updates(self, tvl_data: List[Dict[str, Any]],
-                                  top_projects: List[Dict[str, Any]],
-                                  trading_pairs: List[Dict[str, Any]],
-                                  farming_pools: List[Dict[str, Any]],
-                                  nft_collections: List[Dict[str, Any]]):
+    async def _post_onchain_updates(self, tvl_data: List[TvlProject],
+                                  top_projects: List[ProjectStat],
+                                  trading_pairs: List[TradingPair],
+                                  farming_pools: List[FarmingPool],
+                                  nft_collections: List[NftCollection]):
         """Post updates about on-chain activity."""
         try:
             # Generate and post TVL update
             if tvl_data and self.daily_tweet_count < MAX_DAILY_TWEETS:
                 tvl_data_formatted = {
-                    'total_tvl': tvl_data[0].get('tvl', 0),
-                    'top_projects': [p['name'] for p in tvl_data[:3]],
-                    'growth': tvl_data[0].get('growth', 0)
+                    'total_tvl': tvl_data[0].tvl,
+                    'top_projects': [p.name for p in tvl_data[:3]],
+                    'growth': tvl_data[0].growth
                 }
                 tvl_tweet = self.ai_helper.generate_onchain_update(
                     tvl_data_formatted,
@@ -221,9 +270,9 @@ class CapybaraBot:
             if top_projects and self.daily_tweet_count < MAX_DAILY_TWEETS:
                 projects_data = {
                     'top_projects': [{
-                        'name': p['name'],
-                        'volume': p.get('volume', 0),
-                        'growth': p.get('growth', 0)
+                        'name': p.name,
+                        'volume': p.volume,
+                        'growth': p.growth
                     } for p in top_projects[:3]]
                 }
                 projects_tweet = self.ai_helper.generate_onchain_update(
@@ -239,9 +288,9 @@ class CapybaraBot:
             if trading_pairs and self.daily_tweet_count < MAX_DAILY_TWEETS:
                 pairs_data = {
                     'top_pairs': [{
-                        'pair': p['pair'],
-                        'volume': p.get('volume', 0),
-                        'price_change': p.get('price_change', 0)
+                        'pair': p.pair,
+                        'volume': p.volume,
+                        'price_change': p.price_change
                     } for p in trading_pairs[:3]]
                 }
                 pairs_tweet = self.ai_helper.generate_onchain_update(
@@ -257,9 +306,9 @@ class CapybaraBot:
             if farming_pools and self.daily_tweet_count < MAX_DAILY_TWEETS:
                 pools_data = {
                     'top_pools': [{
-                        'name': p['name'],
-                        'apr': p.get('apr', 0),
-                        'tvl': p.get('tvl', 0)
+                        'name': p.name,
+                        'apr': p.apr,
+                        'tvl': p.tvl
                     } for p in farming_pools[:3]]
                 }
                 pools_tweet = self.ai_helper.generate_onchain_update(
@@ -275,9 +324,9 @@ class CapybaraBot:
             if nft_collections and self.daily_tweet_count < MAX_DAILY_TWEETS:
                 nft_data = {
                     'top_collections': [{
-                        'name': c['name'],
-                        'volume': c.get('volume', 0),
-                        'floor_price': c.get('floor_price', 0)
+                        'name': c.name,
+                        'volume': c.volume,
+                        'floor_price': c.floor_price
                     } for c in nft_collections[:3]]
                 }
                 nft_tweet = self.ai_helper.generate_onchain_update(
@@ -292,6 +341,37 @@ class CapybaraBot:
         except Exception as e:
             logger.error(f"Error posting on-chain updates: {str(e)}")
 
+    async def _on_price_alert(self, alert, price: float):
+        """Post an update when a local price alert fires."""
+        try:
+            direction = "above" if alert.is_above else "below"
+            logger.info(f"Price alert {alert.alert_id}: {alert.token} is {direction} {alert.target} ({price})")
+            if self.daily_tweet_count < MAX_DAILY_TWEETS:
+                alert_tweet = self.ai_helper.generate_onchain_update(
+                    {'token': alert.token, 'target': alert.target, 'price': price, 'direction': direction},
+                    "Price Alert"
+                )
+                if alert_tweet:
+                    # TODO: Implement actual tweet posting
+                    self.daily_tweet_count += 1
+                    logger.info(f"Posted price alert: {alert_tweet}")
+        except Exception as e:
+            logger.error(f"Error handling price alert: {str(e)}")
+
+    async def _on_whale_transaction(self, tx, change):
+        """Log large balance changes seen by the checkpoint follower."""
+        logger.info(
+            f"Whale activity in checkpoint {tx.checkpoint}: {change.owner} received "
+            f"{change.amount} {change.coin_type} (tx {tx.digest})"
+        )
+
+    async def _on_whale_event(self, event, coin_type: str, amount: int):
+        """Log large DEX swaps delivered by the event stream."""
+        logger.info(
+            f"Whale swap by {event.sender}: {amount} {coin_type} "
+            f"({event.event_type}, tx {event.tx_digest})"
+        )
+
     def _reset_daily_counters(self):
         """Reset daily tweet and reply counters if needed."""
         now = datetime.now()
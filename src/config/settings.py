@@ -19,6 +19,21 @@ OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 
 # Sui RPC URL
 SUI_RPC_URL = os.getenv("SUI_RPC_URL", "https://sui-mainnet-rpc.allthatnode.com")
+SUI_RPC_BATCH_MAX_SIZE = int(os.getenv("SUI_RPC_BATCH_MAX_SIZE", "50"))  # calls per JSON-RPC batch
+# Candidate fullnodes for the latency-aware endpoint pool (comma-separated)
+SUI_RPC_ENDPOINTS = [
+    url.strip() for url in os.getenv(
+        "SUI_RPC_ENDPOINTS",
+        "https://sui-mainnet-rpc.nodereal.io,https://fullnode.mainnet.sui.io:443,https://sui-mainnet.blockvision.org"
+    ).split(",") if url.strip()
+]
+RPC_EWMA_ALPHA = float(os.getenv("RPC_EWMA_ALPHA", "0.2"))  # weight of the newest latency/error sample
+RPC_FAILURE_THRESHOLD = int(os.getenv("RPC_FAILURE_THRESHOLD", "3"))  # consecutive failures before a node is down
+RPC_RECHECK_INTERVAL = float(os.getenv("RPC_RECHECK_INTERVAL", "30"))  # seconds between probes of down nodes
+RPC_PROBE_TIMEOUT = float(os.getenv("RPC_PROBE_TIMEOUT", "5"))  # seconds
+RPC_STARTUP_DEADLINE = float(os.getenv("RPC_STARTUP_DEADLINE", "5"))  # seconds for all startup probes
+RPC_HEDGE_QUANTILE = float(os.getenv("RPC_HEDGE_QUANTILE", "0.95"))  # latency quantile that triggers a hedge
+RPC_HEDGE_DEFAULT_DELAY = float(os.getenv("RPC_HEDGE_DEFAULT_DELAY", "0.5"))  # seconds, until enough samples exist
 
 # List of Sui-related accounts to follow and analyze
 SUI_ACCOUNTS = [
@@ -78,10 +93,149 @@ SUIVISION_API_BASE = os.getenv(
 BLOCKVISION_API_KEY = os.getenv("BLOCKVISION_API_KEY", "")
 SUIVISION_API_KEY = os.getenv("SUIVISION_API_KEY", "")
 
+# Protocol leaderboard: SUI_PROJECTS plus these long-tail Blockvision protocol ids
+LEADERBOARD_EXTRA_PROTOCOLS = [
+    p.strip() for p in os.getenv(
+        "LEADERBOARD_EXTRA_PROTOCOLS", "scallop,suilend,bucket,deepbook,kriya,bluefin,haedal,volo"
+    ).split(",") if p.strip()
+]
+LEADERBOARD_CONCURRENCY = int(os.getenv("LEADERBOARD_CONCURRENCY", "8"))  # protocol requests in flight
+
+# Metered API quotas. Calls are counted per host against these budgets unless the
+# provider reports its own remaining quota in rate-limit response headers.
+API_QUOTAS = {
+    "blockvision": {
+        "base_url": BLOCKVISION_API_BASE,
+        "daily": int(os.getenv("BLOCKVISION_DAILY_QUOTA", "10000")),
+        "monthly": int(os.getenv("BLOCKVISION_MONTHLY_QUOTA", "300000"))
+    },
+    "suivision": {
+        "base_url": SUIVISION_API_BASE,
+        "daily": int(os.getenv("SUIVISION_DAILY_QUOTA", "10000")),
+        "monthly": int(os.getenv("SUIVISION_MONTHLY_QUOTA", "300000"))
+    }
+}
+QUOTA_LEDGER_PATH = os.getenv("QUOTA_LEDGER_PATH", "data/quota_ledger.json")
+QUOTA_SAVE_INTERVAL = float(os.getenv("QUOTA_SAVE_INTERVAL", "30"))  # seconds between ledger writes
+QUOTA_LOW_WATER = float(os.getenv("QUOTA_LOW_WATER", "0.2"))  # reported quota fraction where polling slows
+QUOTA_MAX_STRETCH = float(os.getenv("QUOTA_MAX_STRETCH", "8"))  # longest polling interval multiplier
+
+# Security config holding the per-upstream rate limits
+SECURITY_CONFIG_PATH = os.getenv("SECURITY_CONFIG_PATH", "config/security.yml")
+
+# HTTP connection pool settings
+HTTP_POOL_LIMIT = int(os.getenv("HTTP_POOL_LIMIT", "100"))  # total open connections
+HTTP_POOL_LIMIT_PER_HOST = int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", "20"))
+HTTP_KEEPALIVE_TIMEOUT = float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "60"))  # seconds
+HTTP_DNS_CACHE_TTL = int(os.getenv("HTTP_DNS_CACHE_TTL", "300"))  # seconds
+HTTP_REQUEST_TIMEOUT = float(os.getenv("HTTP_REQUEST_TIMEOUT", "30"))  # seconds
+
+# Per-endpoint timeout for concurrent dashboard snapshots
+DASHBOARD_ENDPOINT_TIMEOUT = float(os.getenv("DASHBOARD_ENDPOINT_TIMEOUT", "10"))  # seconds
+
+# Response cache settings (TTLs in seconds, keyed by endpoint)
+RESPONSE_CACHE_DEFAULT_TTL = float(os.getenv("RESPONSE_CACHE_DEFAULT_TTL", "60"))
+RESPONSE_CACHE_MAX_STALE = float(os.getenv("RESPONSE_CACHE_MAX_STALE", "300"))  # serve-stale window
+RESPONSE_CACHE_TTLS = {
+    "/defi/tvl": 300,
+    "/defi/projects": 300,
+    "/defi/pools": 300,
+    "/coins/pairs": 120,
+    "/nfts/collections": 300,
+    "/coins/price": 30,
+    "/coins/price/change": 60,
+    "/coins/price/history": 600,
+    "/network/metrics": 60
+}
+# BlockvisionTool responses, persisted so a restarted agent starts warm. TTLs are
+# keyed by the tool's endpoint names ("{id}" covers every token or protocol).
+BLOCKVISION_CACHE_PATH = os.getenv("BLOCKVISION_CACHE_PATH", "data/blockvision_cache.json.gz")
+BLOCKVISION_CACHE_SAVE_INTERVAL = float(os.getenv("BLOCKVISION_CACHE_SAVE_INTERVAL", "30"))  # seconds between writes
+BLOCKVISION_CACHE_TTLS = {
+    "/market/overview": 300,
+    "/tokens/{id}/metrics": 30,
+    "/protocols/{id}/metrics": 600,
+    "/whales/activity": 60,
+    "/tokens/top-gainers": 60,
+    "/network/active-accounts": 300,
+    "/network/transactions": 300,
+    "/nfts/overview": 300,
+    "/defi/tvl": 300,
+    "/defi/projects": 300,
+    "/defi/pools": 300,
+    "/nfts/collections": 300
+}
+
 # Price API settings
 PRICE_UPDATE_INTERVAL = int(os.getenv("PRICE_UPDATE_INTERVAL", "60"))  # seconds
 PRICE_HISTORY_DAYS = int(os.getenv("PRICE_HISTORY_DAYS", "7"))
 PRICE_CHANGE_HOURS = int(os.getenv("PRICE_CHANGE_HOURS", "24"))
+PRICE_BATCH_WINDOW = float(os.getenv("PRICE_BATCH_WINDOW", "0.01"))  # seconds, 0 disables batching
+PRICE_BATCH_MAX_SIZE = int(os.getenv("PRICE_BATCH_MAX_SIZE", "50"))  # tokens per batch request
+PRICE_HISTORY_DIR = os.getenv("PRICE_HISTORY_DIR", "data/price_history")
+PRICE_HISTORY_MAX_LAG = int(os.getenv("PRICE_HISTORY_MAX_LAG", "900"))  # seconds before the local tail is refreshed
+# PriceTool source hedging: the next source starts once the running ones are this slow or all failed
+PRICE_HEDGE_ENABLED = os.getenv("PRICE_HEDGE_ENABLED", "true").lower() == "true"
+PRICE_HEDGE_DELAY = float(os.getenv("PRICE_HEDGE_DELAY", "0.3"))  # seconds
+# CLMM pools (Cetus, Turbos) read by the on-chain price fallback, per token symbol.
+# "sui" pools must be quoted in a stablecoin; other tokens may be quoted in SUI.
+DEX_POOLS = {
+    "sui": [
+        "0xcf994611fd4c48e277ce3ffd4d4364c914af2c3cbb05f7bf6facd371de688630",  # Cetus USDC/SUI
+        "0x5eb2dfcdd1b15d2021328258f6d5ec081e9a0cdcfa9e13a0eaeb9b5f7505ca78"  # Turbos SUI/USDC (wormhole)
+    ],
+    "cetus": ["0x2e041f3fd93646dcc877f783c1f2b7fa62d30271bdef1f21ef002cebf857bded"]  # Cetus CETUS/SUI
+}
+# Coin types valued at one USD when pricing from pools
+USD_STABLECOINS = [
+    "0xdba34672e30cb065b1f93e3ab55318768fd6fef66c15942c9f7cb846e2f900e7::usdc::USDC",  # native USDC
+    "0x5d4b302506645c37ff133b98c4b50a5ae14841659738d6d733d59d0d217a93bf::coin::COIN",  # wormhole USDC
+    "0xc060006111016b8a020ad5b33834984a437aaa7d3c74c18e09a95d48aceab08c::coin::COIN"  # wormhole USDT
+]
+
+# Sui object cache: (id, version) entries are kept until evicted by the memory budget
+OBJECT_CACHE_MAX_BYTES = int(os.getenv("OBJECT_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+OBJECT_LATEST_TTL = float(os.getenv("OBJECT_LATEST_TTL", "2.0"))  # seconds a latest-version lookup is reused
+
+# Paginated RPC queries (dynamic fields, owned objects, events)
+PAGINATION_PAGE_SIZE = int(os.getenv("PAGINATION_PAGE_SIZE", "50"))  # items per page, the node maximum
+PAGINATION_PREFETCH = int(os.getenv("PAGINATION_PREFETCH", "2"))  # pages fetched ahead of the reader
+CHILD_FETCH_CONCURRENCY = int(os.getenv("CHILD_FETCH_CONCURRENCY", "4"))  # pages of child objects in flight
+
+# Coin metadata registry, filled lazily from suix_getCoinMetadata
+COIN_REGISTRY_PATH = os.getenv("COIN_REGISTRY_PATH", "data/coin_registry.json")
+
+# Checkpoint follower settings
+CHECKPOINT_FOLLOWER_ENABLED = os.getenv("CHECKPOINT_FOLLOWER_ENABLED", "true").lower() == "true"
+CHECKPOINT_CURSOR_PATH = os.getenv("CHECKPOINT_CURSOR_PATH", "data/checkpoint_cursor.json")
+CHECKPOINT_PAGE_SIZE = int(os.getenv("CHECKPOINT_PAGE_SIZE", "50"))  # checkpoints per sui_getCheckpoints page
+CHECKPOINT_PREFETCH = int(os.getenv("CHECKPOINT_PREFETCH", "8"))  # checkpoints fetched ahead of the consumers
+CHECKPOINT_POLL_INTERVAL = float(os.getenv("CHECKPOINT_POLL_INTERVAL", "1.0"))  # seconds to wait once caught up
+VOLUME_STATS_WINDOW = int(os.getenv("VOLUME_STATS_WINDOW", "3600"))  # seconds of on-chain volume kept
+# Smallest balance change (raw coin units) reported as whale activity, per coin type
+WHALE_THRESHOLDS = {
+    "0x2::sui::SUI": 100_000 * 10**9,  # 100k SUI in MIST
+    "0xdba34672e30cb065b1f93e3ab55318768fd6fef66c15942c9f7cb846e2f900e7::usdc::USDC": 100_000 * 10**6  # 100k USDC
+}
+
+# Local transaction index (SQLite, fed by the checkpoint follower)
+TX_INDEX_PATH = os.getenv("TX_INDEX_PATH", "data/tx_index.sqlite3")
+ONCHAIN_ACTIVITY_WINDOW = int(os.getenv("ONCHAIN_ACTIVITY_WINDOW", "3600"))  # seconds covered by activity queries
+# Seconds of history kept; nothing reads further back than the activity window
+TX_INDEX_RETENTION = int(os.getenv("TX_INDEX_RETENTION", str(ONCHAIN_ACTIVITY_WINDOW)))
+TX_INDEX_PRUNE_INTERVAL = int(os.getenv("TX_INDEX_PRUNE_INTERVAL", "300"))  # seconds between prunes
+
+# Event stream settings (long-polls suix_queryEvents by cursor)
+EVENT_STREAM_ENABLED = os.getenv("EVENT_STREAM_ENABLED", "true").lower() == "true"
+EVENT_POLL_INTERVAL = float(os.getenv("EVENT_POLL_INTERVAL", "1.0"))  # seconds to wait once caught up
+EVENT_PAGE_SIZE = int(os.getenv("EVENT_PAGE_SIZE", "50"))  # events per suix_queryEvents page
+EVENT_BUFFER_SIZE = int(os.getenv("EVENT_BUFFER_SIZE", "200"))  # matched events kept for queries
+# Move event types followed by the stream (DEX swaps)
+WATCHED_EVENT_TYPES = [
+    "0x1eabed72c53feb3805120a081dc15963c204dc8d091542592abaf7a35689b2fb::pool::SwapEvent",  # Cetus
+    "0x91bfbc386a41afcfd9b2533058d7e915a1d3829089cc268ff4333d54d6339ca1::pool::SwapEvent"  # Turbos
+]
+# Whale swaps are judged against WHALE_THRESHOLDS for the coin that went into the pool
 
 # Logging settings
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
@@ -111,4 +265,9 @@ TEMPERATURE = 0.7  # AI temperature for content generation
 
 # Error Handling
 MAX_RETRIES = 3
-RETRY_DELAY = 5  # seconds 
\ No newline at end of file
+RETRY_DELAY = 5  # seconds, upper bound for a single backoff sleep
+RETRY_BASE_DELAY = 0.25  # seconds, first backoff step before jitter
+RETRY_BUDGET_RATIO = 0.2  # retries earned per request, per endpoint
+RETRY_BUDGET_MIN_PER_SECOND = 0.5  # retries always allowed per endpoint
+CIRCUIT_FAILURE_THRESHOLD = 5  # consecutive failures before an upstream's circuit opens
+CIRCUIT_RECOVERY_TIMEOUT = 30  # seconds before a half-open probe is let through
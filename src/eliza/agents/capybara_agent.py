@@ -1,56 +1,85 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import tweepy
 import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
 from datetime import datetime
 import logging
+from collections import Counter
 from ..tools.sui_tool import SuiTool
 from ..tools.blockvision_tool import BlockvisionTool
 from ..tools.giveaway_tool import GiveawayTool
 from ..tools.community_tool import CommunityTool
 from pysui import SyncClient, SuiConfig
 from ..base import Agent, Tool, Memory
+from src.blockchain.rpc_pool import RpcEndpointPool
+from src.blockchain.event_stream import EventStream, WhaleSwaps
+from src.blockchain.tx_index import SUI_COIN_TYPE, TransactionIndex
+from src.blockchain.decoding import SuiTransaction
+from src.config.settings import (
+    SUI_RPC_ENDPOINTS,
+    RPC_STARTUP_DEADLINE,
+    ONCHAIN_ACTIVITY_WINDOW,
+    EVENT_STREAM_ENABLED,
+    WATCHED_EVENT_TYPES,
+    WHALE_THRESHOLDS
+)
+from src.utils.metrics import registry
+from src.utils.quota import quota_ledger
 import httpx
 
+STARTUP_SECONDS = registry.gauge("agent_startup_seconds", "Time spent probing RPC endpoints and verifying Twitter at startup")
+
 class CapybaraAgent(Agent):
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.logger = logging.getLogger(__name__)
-        self.twitter_client = self._initialize_twitter()
         
         # Initialize Sui client with fallback RPC URLs
-        rpc_urls = [
-            "https://sui-mainnet-rpc.nodereal.io",
-            "https://fullnode.mainnet.sui.io:443",
-            "https://sui-mainnet.blockvision.org"
-        ]
+        rpc_urls = list(SUI_RPC_ENDPOINTS)
         
-        working_rpc_url = None
-        for rpc_url in rpc_urls:
+        # Verify Twitter credentials while all RPC endpoints are probed at once
+        started = time.monotonic()
+        executor = ThreadPoolExecutor(max_workers=len(rpc_urls) + 1, thread_name_prefix="startup")
+        try:
+            twitter_future = executor.submit(self._initialize_twitter)
+            working_rpc_url = self._probe_rpc_endpoints(executor, rpc_urls, RPC_STARTUP_DEADLINE)
+            remaining = max(0.0, RPC_STARTUP_DEADLINE - (time.monotonic() - started))
             try:
-                # Test the connection with a simple RPC call
-                with httpx.Client() as client:
-                    response = client.post(
-                        rpc_url,
-                        json={
-                            "jsonrpc": "2.0",
-                            "id": 1,
-                            "method": "sui_getProtocolConfig",
-                            "params": []
-                        }
-                    )
-                    response.raise_for_status()
-                    working_rpc_url = rpc_url
-                    self.logger.info(f"Successfully connected to Sui RPC at {rpc_url}")
-                    break
-            except Exception as e:
-                self.logger.warning(f"Failed to connect to {rpc_url}: {str(e)}")
-                continue
+                self.twitter_client = twitter_future.result(timeout=remaining)
+            except FuturesTimeoutError:
+                raise Exception(f"Twitter credentials not verified within {RPC_STARTUP_DEADLINE}s")
+        finally:
+            # Probes still running are bounded by the deadline; don't wait for them
+            twitter_future.cancel()
+            executor.shutdown(wait=False)
+        elapsed = time.monotonic() - started
+        STARTUP_SECONDS.set(elapsed)
+        self.logger.info(f"Startup checks finished in {elapsed:.2f}s")
         
         if working_rpc_url is None:
             self.logger.error("Failed to connect to any Sui RPC endpoint")
             raise Exception("No available Sui RPC endpoint")
             
         self.sui_client = httpx.Client(base_url=working_rpc_url)
+        # Every candidate stays in the pool; calls follow the fastest healthy node
+        self.rpc_endpoints = RpcEndpointPool(
+            [working_rpc_url] + [url for url in rpc_urls if url != working_rpc_url]
+        )
+        # Local index written by the checkpoint follower of the separate bot process
+        # (src/main.py with CHECKPOINT_FOLLOWER_ENABLED). The agent only reads it; while
+        # that process is not running the index goes stale and activity comes from RPC.
+        self.tx_index = TransactionIndex()
+        self._warned_stale_index = False
+        self.sui_tool = SuiTool(config["SUI_RPC_URL"], endpoints=self.rpc_endpoints)
+        # Live DEX events for whale activity, followed while run() is active
+        self.event_stream = None
+        if EVENT_STREAM_ENABLED:
+            self.event_stream = EventStream(
+                self.sui_tool, [{"MoveEventType": event_type} for event_type in WATCHED_EVENT_TYPES]
+            )
+            # The stream only buffers events someone subscribed to
+            self.event_stream.subscribe(WhaleSwaps(self.sui_tool.objects, WHALE_THRESHOLDS, self._on_whale_swap))
         
         super().__init__(
             name="Capybara AI",
@@ -65,6 +94,43 @@ class CapybaraAgent(Agent):
             memory=self._initialize_memory()
         )
 
+    def _probe_rpc_endpoint(self, rpc_url: str, timeout: float) -> str:
+        """Check that an RPC endpoint answers a simple call within ``timeout``"""
+        with httpx.Client(timeout=timeout) as client:
+            response = client.post(
+                rpc_url,
+                json={
+                    "jsonrpc": "2.0",
+                    "id": 1,
+                    "method": "sui_getProtocolConfig",
+                    "params": []
+                }
+            )
+            response.raise_for_status()
+        return rpc_url
+
+    def _probe_rpc_endpoints(self, executor: ThreadPoolExecutor, rpc_urls: List[str],
+                             deadline: float) -> Optional[str]:
+        """Probe every endpoint concurrently and return the first that answers before the deadline"""
+        futures = {executor.submit(self._probe_rpc_endpoint, url, deadline): url for url in rpc_urls}
+        try:
+            for future in as_completed(futures, timeout=deadline):
+                rpc_url = futures[future]
+                try:
+                    future.result()
+                except Exception as e:
+                    self.logger.warning(f"Failed to connect to {rpc_url}: {str(e)}")
+                    continue
+                self.logger.info(f"Successfully connected to Sui RPC at {rpc_url}")
+                return rpc_url
+        except FuturesTimeoutError:
+            self.logger.warning(f"No Sui RPC endpoint answered within {deadline}s")
+        finally:
+            # Probes that have not started yet are no longer needed
+            for future in futures:
+                future.cancel()
+        return None
+
     def _initialize_twitter(self):
         """Initialize Twitter API client"""
         try:
@@ -88,15 +154,17 @@ class CapybaraAgent(Agent):
     def _initialize_tools(self, config: Dict[str, Any]) -> List[Tool]:
         """Initialize agent tools"""
         return [
-            SuiTool(config["SUI_RPC_URL"]),
-            BlockvisionTool(config["BLOCKVISION_API_KEY"]),
+            self.sui_tool,
+            BlockvisionTool(
+                config["BLOCKVISION_API_KEY"], event_stream=self.event_stream, tx_index=self.tx_index
+            ),
             GiveawayTool(
                 self.sui_client,
                 config["SUI_WALLET_ADDRESS"],
                 config["SUI_PRIVATE_KEY"],
                 self.twitter_client
             ),
-            CommunityTool(self.twitter_client),
+            CommunityTool(self.twitter_client, sui_tool=self.sui_tool),
             Tool(
                 name="analyze_sui_metrics",
                 description="Analyze Sui blockchain metrics and trends",
@@ -134,10 +202,12 @@ class CapybaraAgent(Agent):
             sui_tool = next(tool for tool in self.tools if isinstance(tool, SuiTool))
             blockvision_tool = next(tool for tool in self.tools if isinstance(tool, BlockvisionTool))
             
-            sui_metrics = await sui_tool._execute(action="get_metrics")
-            defi_metrics = await blockvision_tool._execute(action="get_defi_metrics")
-            trading_metrics = await blockvision_tool._execute(action="get_trading_metrics")
-            nft_metrics = await blockvision_tool._execute(action="get_nft_metrics")
+            sui_metrics, defi_metrics, trading_metrics, nft_metrics = await asyncio.gather(
+                sui_tool._execute(action="get_metrics"),
+                blockvision_tool._execute(action="get_defi_metrics"),
+                blockvision_tool._execute(action="get_trading_metrics"),
+                blockvision_tool._execute(action="get_nft_metrics")
+            )
             
             return {
                 "status": "success",
@@ -307,20 +377,78 @@ The ecosystem is growing faster than my appetite for alpha! #SuiEcosystem"""
             self.logger.error(f"Error running giveaway: {str(e)}")
             return {"status": "error", "message": str(e)}
 
+    @staticmethod
+    def _summarize_transactions(transactions: List[SuiTransaction]) -> Dict[str, Any]:
+        """Same activity fields as the local index, computed over a sample of transactions"""
+        transfers = sorted(
+            (
+                {"digest": tx.digest, "timestamp": tx.timestamp, "sender": tx.sender,
+                 "recipient": change.owner, "coin_type": change.coin_type, "amount": change.amount}
+                for tx in transactions for change in tx.balance_changes
+                if change.coin_type == SUI_COIN_TYPE and change.amount > 0
+            ),
+            key=lambda transfer: transfer["amount"], reverse=True
+        )
+        senders = Counter(tx.sender for tx in transactions)
+        return {
+            "recent_transactions": [
+                {"digest": tx.digest, "checkpoint": tx.checkpoint, "timestamp": tx.timestamp,
+                 "sender": tx.sender, "status": tx.status}
+                for tx in sorted(transactions, key=lambda tx: tx.timestamp, reverse=True)
+            ],
+            "large_transfers": transfers[:10],
+            "top_senders": [
+                {"address": address, "transactions": count}
+                for address, count in sorted(senders.items(), key=lambda item: (-item[1], item[0]))[:10]
+            ],
+            "active_accounts": len(senders)
+        }
+
+    async def _on_whale_swap(self, event, coin_type: str, amount: int):
+        """Log large DEX swaps seen by the agent's event stream"""
+        self.logger.info(f"Whale swap by {event.sender}: {amount} {coin_type} (tx {event.tx_digest})")
+
     async def _track_onchain_activity(self, **kwargs) -> Dict[str, Any]:
         """Track on-chain activity"""
         try:
-            # Use SuiTool to get recent transactions
+            # Answer from the local index while the bot's follower keeps it current
+            since = time.time() - ONCHAIN_ACTIVITY_WINDOW
+            if self.tx_index.has_activity_since(since):
+                self._warned_stale_index = False
+                return {
+                    "status": "success",
+                    "activities": {
+                        "recent_transactions": self.tx_index.recent_transactions(),
+                        "large_transfers": self.tx_index.large_transfers(SUI_COIN_TYPE, since=since, limit=10),
+                        "top_senders": self.tx_index.top_senders(since),
+                        "active_accounts": self.tx_index.active_accounts(since),
+                        "source": "local_index",
+                        "timestamp": datetime.now().isoformat()
+                    }
+                }
+
+            if not self._warned_stale_index:
+                self.logger.warning(
+                    f"Transaction index {self.tx_index.path} has no activity in the last "
+                    f"{ONCHAIN_ACTIVITY_WINDOW}s; is the bot process (src/main.py) running with the "
+                    "checkpoint follower enabled? Falling back to RPC"
+                )
+                self._warned_stale_index = True
+
+            # Otherwise use SuiTool to get recent transactions
             sui_tool = next(tool for tool in self.tools if isinstance(tool, SuiTool))
             transactions = await sui_tool._execute(action="get_recent_transactions")
             
             if transactions["status"] == "success":
                 return {
                     "status": "success",
-                    "activities": {
-                        "recent_transactions": transactions["transactions"],
-                        "timestamp": datetime.now().isoformat()
-                    }
+                    "activities": dict(
+                        self._summarize_transactions(
+                            [SuiTransaction.from_rpc(block) for block in transactions["transactions"]]
+                        ),
+                        source="rpc",
+                        timestamp=datetime.now().isoformat()
+                    )
                 }
             return transactions
         except Exception as e:
@@ -329,26 +457,38 @@ The ecosystem is growing faster than my appetite for alpha! #SuiEcosystem"""
 
     async def run(self):
         """Main agent loop"""
-        while True:
-            try:
-                # Analyze metrics
-                metrics = await self._analyze_sui_metrics()
-                self.memory.add("metrics", metrics)
-
-                # Generate and post different types of content
-                content_types = ["general", "defi", "trading", "nft"]
-                for content_type in content_types:
-                    content = await self._generate_content(type=content_type)
-                    if content["status"] == "success":
-                        self.twitter_client.update_status(content["content"])
-                        await asyncio.sleep(300)  # Wait 5 minutes between posts
-
-                # Run giveaway if it's time (e.g., every 24 hours)
-                if datetime.now().hour == 0:  # Run at midnight
-                    await self._run_giveaway()
-
-                # Wait before next iteration
-                await asyncio.sleep(3600)  # 1 hour
-            except Exception as e:
-                self.logger.error(f"Error in main loop: {str(e)}")
-                await asyncio.sleep(60)  # Wait 1 minute before retrying 
\ No newline at end of file
+        event_task = None
+        if self.event_stream is not None:
+            event_task = asyncio.ensure_future(self.event_stream.run())
+        try:
+            while True:
+                try:
+                    # Analyze metrics
+                    metrics = await self._analyze_sui_metrics()
+                    self.memory.add("metrics", metrics)
+
+                    # Generate and post different types of content
+                    content_types = ["general", "defi", "trading", "nft"]
+                    for content_type in content_types:
+                        content = await self._generate_content(type=content_type)
+                        if content["status"] == "success":
+                            self.twitter_client.update_status(content["content"])
+                            await asyncio.sleep(300)  # Wait 5 minutes between posts
+
+                    # Run giveaway if it's time (e.g., every 24 hours)
+                    if datetime.now().hour == 0:  # Run at midnight
+                        await self._run_giveaway()
+
+                    # Wait before next iteration (1 hour, longer while BlockVision quota runs low)
+                    await asyncio.sleep(quota_ledger.stretch(3600, "blockvision"))
+                except Exception as e:
+                    self.logger.error(f"Error in main loop: {str(e)}")
+                    await asyncio.sleep(60)  # Wait 1 minute before retrying
+        finally:
+            if event_task is not None:
+                event_task.cancel()
+            # Persist what a restart should be able to serve locally
+            for tool in self.tools:
+                if isinstance(tool, BlockvisionTool):
+                    tool.close()
+            quota_ledger.flush() 
\ No newline at end of file
@@ -97,16 +97,16 @@ TOKEN_INFO: Dict[str, Dict[str, str]] = {
     "sui": {
         "name": "Sui",
         "description": "Native token of the Sui blockchain",
-        "contract": "0x2::sui::SUI"
+        "contract": "0x0000000000000000000000000000000000000000000000000000000000000002::sui::SUI"
     },
     "cetus": {
         "name": "CETUS",
         "description": "Governance token of Cetus Protocol",
-        "contract": "0x6864a6fee92142e08a9271a9d43dbe1f1b9b0c1a"
+        "contract": "0x06864a6f921804860930db6ddbe2e16acdf8504495ea7481637a1c8b9a8fe54b::cetus::CETUS"
     },
     "navi": {
         "name": "NAVI",
         "description": "Governance token of Navi Protocol",
-        "contract": "0x2::navi::NAVI"
+        "contract": "0xa99b8952d4f7d947ea77fe0ecdcc9e5fc0bcab2841d6e2a5aa00c3044e5544b5::navx::NAVX"
     }
 } 
\ No newline at end of file
@@ -1,11 +1,27 @@
-from typing import Dict, Any, List
-import aiohttp
+from typing import Dict, Any, List, Optional
+import asyncio
+import heapq
 import logging
 from datetime import datetime, timedelta
 from ..base import Tool
+from src.utils.http_pool import pool_manager
+from src.utils.response_cache import ResponseCache
+from src.blockchain.decoding import WhaleTransfer, decode_records
+from src.blockchain.tx_index import SUI_COIN_TYPE
+from src.utils.resilience import resilience
+from src.utils.rate_limiter import rate_limiters
+from src.config.settings import (
+    WHALE_THRESHOLDS, ONCHAIN_ACTIVITY_WINDOW, LEADERBOARD_EXTRA_PROTOCOLS, LEADERBOARD_CONCURRENCY,
+    BLOCKVISION_CACHE_PATH, BLOCKVISION_CACHE_SAVE_INTERVAL, BLOCKVISION_CACHE_TTLS,
+    RESPONSE_CACHE_DEFAULT_TTL, RESPONSE_CACHE_MAX_STALE
+)
+from ..data.sui_projects import SUI_PROJECTS
+
+# Leaderboard ranking -> protocol metrics field
+LEADERBOARD_FIELDS = {"tvl": "tvl", "volume": "volume_24h", "fees": "fees_24h"}
 
 class BlockvisionTool(Tool):
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, event_stream=None, tx_index=None, cache: Optional[ResponseCache] = None):
         super().__init__(
             name="blockvision_analytics",
             description="Analyze Sui blockchain data using Blockvision API for market insights and analytics",
@@ -13,6 +29,23 @@ class BlockvisionTool(Tool):
         )
         self.api_key = api_key
         self.base_url = "https://api.blockvision.org/v1"
+        self.pool = pool_manager
+        self.resilience = resilience
+        self.rate_limiters = rate_limiters
+        # Responses persist to disk, so the first cycle after a restart is served locally
+        self.cache = cache or ResponseCache(
+            name="blockvision",
+            default_ttl=RESPONSE_CACHE_DEFAULT_TTL,
+            ttls=BLOCKVISION_CACHE_TTLS,
+            max_stale=RESPONSE_CACHE_MAX_STALE,
+            path=BLOCKVISION_CACHE_PATH,
+            save_interval=BLOCKVISION_CACHE_SAVE_INTERVAL
+        )
+        # Optional EventStream; when set, whale activity includes live DEX events
+        self.event_stream = event_stream
+        # Optional TransactionIndex; when it is being fed, whale queries are answered locally
+        self.tx_index = tx_index
+        self.leaderboard_concurrency = LEADERBOARD_CONCURRENCY
         self.logger = logging.getLogger(__name__)
 
     async def _execute(self, **kwargs) -> Dict[str, Any]:
@@ -26,8 +59,18 @@ class BlockvisionTool(Tool):
                 return await self._get_token_metrics(kwargs.get("token_id"))
             elif action == "get_protocol_metrics":
                 return await self._get_protocol_metrics(kwargs.get("protocol"))
+            elif action == "get_protocol_leaderboard":
+                return await self._get_protocol_leaderboard(
+                    kwargs.get("protocols"), kwargs.get("rank_by", "tvl"), kwargs.get("limit", 10)
+                )
             elif action == "get_whale_activity":
                 return await self._get_whale_activity()
+            elif action == "get_defi_metrics":
+                return await self._get_defi_metrics()
+            elif action == "get_trading_metrics":
+                return await self._get_trading_metrics()
+            elif action == "get_nft_metrics":
+                return await self._get_nft_metrics()
             else:
                 return {"status": "error", "message": f"Unknown action: {action}"}
                 
@@ -35,81 +78,218 @@ class BlockvisionTool(Tool):
             self.logger.error(f"Error executing Blockvision tool: {str(e)}")
             return {"status": "error", "message": str(e)}
 
+    def close(self):
+        """Write any cached responses not yet persisted"""
+        self.cache.flush()
+
+    async def _get(self, endpoint: str, path: str) -> Dict[str, Any]:
+        """GET a Blockvision endpoint through the persistent cache; misses and refreshes
+        run under the shared retry and circuit-breaker policy"""
+        # The pooled session is shared process-wide, so each request carries this tool's key
+        session = await self.pool.get_session("blockvision")
+        guard = lambda fetch: self.resilience.call(
+            "blockvision", endpoint, self.rate_limiters.limited("blockvision_api", fetch)
+        )
+        return await self.cache.get_json(
+            session, f"{self.base_url}{path}", endpoint=endpoint, guard=guard,
+            headers={"Authorization": f"Bearer {self.api_key}"}
+        )
+
     async def _get_market_data(self) -> Dict[str, Any]:
         """Get overall market data for Sui ecosystem"""
-        async with aiohttp.ClientSession() as session:
-            headers = {"Authorization": f"Bearer {self.api_key}"}
-            async with session.get(
-                f"{self.base_url}/market/overview",
-                headers=headers
-            ) as response:
-                data = await response.json()
-                return {
-                    "status": "success",
-                    "market_data": {
-                        "total_market_cap": data.get("total_market_cap"),
-                        "24h_volume": data.get("volume_24h"),
-                        "active_protocols": data.get("active_protocols"),
-                        "total_value_locked": data.get("tvl"),
-                        "market_trends": data.get("trends")
-                    }
-                }
+        data = await self._get("/market/overview", "/market/overview")
+        return {
+            "status": "success",
+            "market_data": {
+                "total_market_cap": data.get("total_market_cap"),
+                "24h_volume": data.get("volume_24h"),
+                "active_protocols": data.get("active_protocols"),
+                "total_value_locked": data.get("tvl"),
+                "market_trends": data.get("trends")
+            }
+        }
 
     async def _get_token_metrics(self, token_id: str) -> Dict[str, Any]:
         """Get detailed metrics for a specific token"""
-        async with aiohttp.ClientSession() as session:
-            headers = {"Authorization": f"Bearer {self.api_key}"}
-            async with session.get(
-                f"{self.base_url}/tokens/{token_id}/metrics",
-                headers=headers
-            ) as response:
-                data = await response.json()
-                return {
-                    "status": "success",
-                    "token_metrics": {
-                        "price": data.get("price"),
-                        "market_cap": data.get("market_cap"),
-                        "volume_24h": data.get("volume_24h"),
-                        "holders": data.get("holders"),
-                        "price_change_24h": data.get("price_change_24h"),
-                        "liquidity": data.get("liquidity")
-                    }
-                }
+        data = await self._get("/tokens/{id}/metrics", f"/tokens/{token_id}/metrics")
+        return {
+            "status": "success",
+            "token_metrics": {
+                "price": data.get("price"),
+                "market_cap": data.get("market_cap"),
+                "volume_24h": data.get("volume_24h"),
+                "holders": data.get("holders"),
+                "price_change_24h": data.get("price_change_24h"),
+                "liquidity": data.get("liquidity")
+            }
+        }
 
     async def _get_protocol_metrics(self, protocol: str) -> Dict[str, Any]:
         """Get metrics for a specific protocol"""
-        async with aiohttp.ClientSession() as session:
-            headers = {"Authorization": f"Bearer {self.api_key}"}
-            async with session.get(
-                f"{self.base_url}/protocols/{protocol}/metrics",
-                headers=headers
-            ) as response:
-                data = await response.json()
-                return {
-                    "status": "success",
-                    "protocol_metrics": {
-                        "tvl": data.get("tvl"),
-                        "volume_24h": data.get("volume_24h"),
-                        "users_24h": data.get("users_24h"),
-                        "fees_24h": data.get("fees_24h"),
-                        "revenue_24h": data.get("revenue_24h")
-                    }
+        data = await self._get("/protocols/{id}/metrics", f"/protocols/{protocol}/metrics")
+        return {
+            "status": "success",
+            "protocol_metrics": {
+                "tvl": data.get("tvl"),
+                "volume_24h": data.get("volume_24h"),
+                "users_24h": data.get("users_24h"),
+                "fees_24h": data.get("fees_24h"),
+                "revenue_24h": data.get("revenue_24h")
+            }
+        }
+
+    @staticmethod
+    def _metric(data: Dict[str, Any], field: str) -> float:
+        try:
+            return float(data.get(field) or 0)
+        except (TypeError, ValueError):
+            return 0.0
+
+    async def _get_protocol_leaderboard(self, protocols: Optional[List[str]] = None,
+                                        rank_by: str = "tvl", limit: int = 10) -> Dict[str, Any]:
+        """Rank protocols by TVL, volume or fees, fetching their metrics concurrently"""
+        field = LEADERBOARD_FIELDS.get(rank_by)
+        if field is None:
+            return {"status": "error", "message": f"Cannot rank protocols by: {rank_by}"}
+        if not protocols:
+            # "sui" in SUI_PROJECTS is the chain itself, not a protocol
+            protocols = [key for key in SUI_PROJECTS if key != "sui"] + LEADERBOARD_EXTRA_PROTOCOLS
+        protocols = list(dict.fromkeys(p.lower() for p in protocols))
+        semaphore = asyncio.Semaphore(self.leaderboard_concurrency)
+
+        async def fetch(protocol: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._get("/protocols/{id}/metrics", f"/protocols/{protocol}/metrics")
+
+        results = await asyncio.gather(*(fetch(p) for p in protocols), return_exceptions=True)
+        fetched, failed = [], []
+        for protocol, result in zip(protocols, results):
+            if isinstance(result, Exception) or not isinstance(result, dict):
+                self.logger.warning(f"Blockvision metrics for {protocol} failed: {str(result)}")
+                failed.append(protocol)
+            else:
+                fetched.append((protocol, result))
+        if not fetched:
+            return {"status": "error", "message": "No protocol metrics could be fetched"}
+
+        top = heapq.nlargest(limit, fetched, key=lambda item: self._metric(item[1], field))
+        payload = {
+            "status": "success",
+            "rank_by": rank_by,
+            "leaderboard": [
+                {
+                    "rank": rank,
+                    "protocol": protocol,
+                    "name": SUI_PROJECTS.get(protocol, {}).get("name", protocol),
+                    "tvl": data.get("tvl"),
+                    "volume_24h": data.get("volume_24h"),
+                    "fees_24h": data.get("fees_24h"),
+                    "users_24h": data.get("users_24h")
                 }
+                for rank, (protocol, data) in enumerate(top, 1)
+            ],
+            "protocols_ranked": len(fetched)
+        }
+        if failed:
+            payload["partial"] = failed
+        return payload
+
+    async def _get_many(self, paths: List[str]) -> Dict[str, Any]:
+        """GET several endpoints concurrently; a failed endpoint maps to its exception"""
+        results = await asyncio.gather(*(self._get(path, path) for path in paths), return_exceptions=True)
+        for path, result in zip(paths, results):
+            if isinstance(result, Exception):
+                self.logger.warning(f"Blockvision {path} failed: {str(result)}")
+        return dict(zip(paths, results))
+
+    def _composite(self, results: Dict[str, Any], metrics: Dict[str, Any]) -> Dict[str, Any]:
+        """Wrap normalized metrics, listing the endpoints that failed"""
+        failed = [path for path, result in results.items() if isinstance(result, Exception)]
+        if len(failed) == len(results):
+            return {"status": "error", "message": f"All Blockvision requests failed: {', '.join(failed)}"}
+        payload = {"status": "success", "metrics": metrics}
+        if failed:
+            payload["partial"] = failed
+        return payload
+
+    @staticmethod
+    def _section(result: Any, key: str = None) -> Any:
+        """Body of a successful response (or one of its keys); empty for a failed one"""
+        if isinstance(result, Exception) or not isinstance(result, dict):
+            return [] if key else {}
+        if key:
+            return result.get(key) or []
+        return result
+
+    async def _get_defi_metrics(self) -> Dict[str, Any]:
+        """Get TVL, activity and top projects in one round of concurrent requests"""
+        results = await self._get_many(
+            ["/defi/tvl", "/defi/projects", "/network/active-accounts", "/network/transactions"]
+        )
+        tvl_by_project = {p.get("name"): p.get("tvl", 0) for p in self._section(results["/defi/tvl"], "projects")}
+        tvl_by_project["total"] = sum(float(tvl or 0) for tvl in tvl_by_project.values())
+        return self._composite(results, {
+            "tvl_by_project": tvl_by_project,
+            "top_projects": [
+                {"name": p.get("name"), "tvl": p.get("tvl", 0), "volume": p.get("volume", 0)}
+                for p in self._section(results["/defi/projects"], "projects")
+            ],
+            "active_accounts": self._section(results["/network/active-accounts"]).get("active_accounts", 0),
+            "total_transactions": self._section(results["/network/transactions"]).get("transaction_count", 0)
+        })
+
+    async def _get_trading_metrics(self) -> Dict[str, Any]:
+        """Get top gainers, farming pools and volume in one round of concurrent requests"""
+        results = await self._get_many(["/tokens/top-gainers", "/defi/pools", "/market/overview"])
+        return self._composite(results, {
+            "top_gainers": [
+                {"symbol": t.get("symbol"), "price_change": t.get("price_change_24h", t.get("price_change", 0))}
+                for t in self._section(results["/tokens/top-gainers"], "tokens")
+            ],
+            "farming_pools": [
+                {"name": p.get("name"), "apr": p.get("apr", 0), "tvl": p.get("tvl", 0)}
+                for p in self._section(results["/defi/pools"], "pools")
+            ],
+            "volume_24h": self._section(results["/market/overview"]).get("volume_24h", 0)
+        })
+
+    async def _get_nft_metrics(self) -> Dict[str, Any]:
+        """Get top collections and NFT market totals in one round of concurrent requests"""
+        results = await self._get_many(["/nfts/collections", "/nfts/overview"])
+        overview = self._section(results["/nfts/overview"])
+        return self._composite(results, {
+            "top_collections": [
+                {"name": c.get("name"), "volume": c.get("volume", 0), "floor_price": c.get("floor_price", 0)}
+                for c in self._section(results["/nfts/collections"], "collections")
+            ],
+            "total_volume": overview.get("total_volume", 0),
+            "active_nft_accounts": overview.get("active_accounts", 0)
+        })
 
     async def _get_whale_activity(self) -> Dict[str, Any]:
         """Get recent whale activity on Sui"""
-        async with aiohttp.ClientSession() as session:
-            headers = {"Authorization": f"Bearer {self.api_key}"}
-            async with session.get(
-                f"{self.base_url}/whales/activity",
-                headers=headers
-            ) as response:
-                data = await response.json()
-                return {
-                    "status": "success",
-                    "whale_activity": {
-                        "large_transactions": data.get("large_transactions"),
-                        "whale_movements": data.get("whale_movements"),
-                        "accumulation_trends": data.get("accumulation_trends")
-                    }
-                } 
\ No newline at end of file
+        since = datetime.now().timestamp() - ONCHAIN_ACTIVITY_WINDOW
+        if self.tx_index is not None and self.tx_index.has_activity_since(since):
+            whale_activity = {
+                "large_transactions": self.tx_index.whale_transfers(WHALE_THRESHOLDS, since),
+                "whale_movements": self.tx_index.large_transfers(SUI_COIN_TYPE, since=since, limit=10),
+                "accumulation_trends": None,
+                "source": "local_index"
+            }
+        else:
+            data = await self._get("/whales/activity", "/whales/activity")
+            whale_activity = {
+                "large_transactions": [
+                    t.to_dict() for t in decode_records(data.get("large_transactions") or [], WhaleTransfer)
+                ],
+                "whale_movements": [
+                    t.to_dict() for t in decode_records(data.get("whale_movements") or [], WhaleTransfer)
+                ],
+                "accumulation_trends": data.get("accumulation_trends")
+            }
+        if self.event_stream is not None:
+            whale_activity["live_events"] = [event.to_dict() for event in self.event_stream.recent()]
+        return {
+            "status": "success",
+            "whale_activity": whale_activity
+        } 
\ No newline at end of file
@@ -1,4 +1,4 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import tweepy
 from datetime import datetime, timedelta
 import logging
@@ -8,9 +8,10 @@ import asyncio
 import re
 from ..data.sui_projects import SUI_PROJECTS, TECHNICAL_EXPLANATIONS, TOKEN_INFO
 from .price_tool import PriceTool
+from .sui_tool import SuiTool
 
 class CommunityTool(Tool):
-    def __init__(self, twitter_client: tweepy.API):
+    def __init__(self, twitter_client: tweepy.API, sui_tool: Optional[SuiTool] = None):
         super().__init__(
             name="community_engagement",
             description="Handles community engagement, sentiment analysis, and automated responses",
@@ -19,7 +20,7 @@ class CommunityTool(Tool):
         self.twitter_client = twitter_client
         self.logger = logging.getLogger(__name__)
         self.engagement_history = []
-        self.price_tool = PriceTool()
+        self.price_tool = PriceTool(sui_tool)
         
         # Enhanced response templates with more variety and context
         self.response_templates = {
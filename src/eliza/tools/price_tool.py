@@ -1,12 +1,36 @@
-from typing import Dict, Any, Optional
+from typing import Awaitable, Callable, Dict, Any, List, Optional, Tuple
+import asyncio
+import time
 import httpx
 import logging
 from datetime import datetime, timedelta
 from ..base import Tool
 from ..data.sui_projects import TOKEN_INFO
+from .sui_tool import SuiTool
+from src.blockchain.pool_pricing import PoolPriceOracle
+from src.blockchain.coin_registry import CoinRegistry
+from src.utils.singleflight import SingleFlight
+from src.utils.rate_limiter import rate_limiters
+from src.utils.metrics import registry
+from src.config.settings import SUI_RPC_URL, PRICE_HEDGE_ENABLED, PRICE_HEDGE_DELAY
+
+SOURCE_LATENCY = registry.histogram(
+    "price_source_latency_seconds", "Price source response time by source and outcome"
+)
+SOURCE_WINS = registry.counter(
+    "price_source_wins_total", "Price lookups answered per source"
+)
+
+# (source name, zero-argument fetch returning a price payload)
+PriceSource = Tuple[str, Callable[[], Awaitable[Dict[str, Any]]]]
 
 class PriceTool(Tool):
-    def __init__(self):
+    def __init__(self, sui_tool: Optional[SuiTool] = None):
+        """
+        Args:
+            sui_tool: SuiTool for on-chain pool prices; pass the agent's so object and
+                coin metadata caches are shared. Defaults to one on SUI_RPC_URL.
+        """
         super().__init__(
             name="price_data",
             description="Fetches and processes token price data",
@@ -15,6 +39,11 @@ class PriceTool(Tool):
         self.logger = logging.getLogger(__name__)
         self.cache = {}
         self.cache_duration = timedelta(minutes=5)
+        self.price_flights = SingleFlight("price_tool")
+        self.rate_limiters = rate_limiters
+        # Hedged mode starts the next source after hedge_delay instead of waiting for a failure
+        self.hedged = PRICE_HEDGE_ENABLED
+        self.hedge_delay = PRICE_HEDGE_DELAY
         
         # API endpoints for different data sources
         self.endpoints = {
@@ -22,6 +51,12 @@ class PriceTool(Tool):
             "binance": "https://api.binance.com/api/v3",
             "sui": "https://fullnode.mainnet.sui.io:443"
         }
+        # Pool IDs and coin decimals are cached, so on-chain prices cost one round-trip
+        sui = sui_tool or SuiTool(SUI_RPC_URL)
+        self.coins = CoinRegistry(sui)
+        for key, info in TOKEN_INFO.items():
+            self.coins.track(info["contract"], aliases=[key, info["name"]])
+        self.pool_prices = PoolPriceOracle(sui, objects=sui.objects, coins=self.coins)
 
     async def _execute(self, action: str, **kwargs) -> Dict[str, Any]:
         """Execute price data actions"""
@@ -50,37 +85,79 @@ class PriceTool(Tool):
             if not token_info:
                 return {"status": "error", "message": f"Unknown token: {token}"}
 
-            # Fetch price data from multiple sources
-            async with httpx.AsyncClient() as client:
-                # Try CoinGecko first
-                try:
-                    coingecko_data = await self._fetch_coingecko_data(client, token_info)
-                    if coingecko_data["status"] == "success":
-                        return self._cache_and_return(token, coingecko_data)
-                except Exception as e:
-                    self.logger.warning(f"CoinGecko fetch failed: {str(e)}")
-
-                # Try Binance as fallback
-                try:
-                    binance_data = await self._fetch_binance_data(client, token_info)
-                    if binance_data["status"] == "success":
-                        return self._cache_and_return(token, binance_data)
-                except Exception as e:
-                    self.logger.warning(f"Binance fetch failed: {str(e)}")
-
-                # Try Sui RPC as last resort
-                try:
-                    sui_data = await self._fetch_sui_data(client, token_info)
-                    if sui_data["status"] == "success":
-                        return self._cache_and_return(token, sui_data)
-                except Exception as e:
-                    self.logger.warning(f"Sui RPC fetch failed: {str(e)}")
-
-            return {"status": "error", "message": "Failed to fetch price data from all sources"}
+            # Concurrent requests for the same token share one fetch
+            return await self.price_flights.do(
+                token.lower(),
+                lambda: self._fetch_token_price(token, token_info)
+            )
         except Exception as e:
             self.logger.error(f"Error getting token price: {str(e)}")
             return {"status": "error", "message": str(e)}
 
+    async def _fetch_token_price(self, token: str, token_info: Dict[str, str]) -> Dict[str, Any]:
+        """Fetch token price data from CoinGecko, then Binance, then Sui RPC"""
+        try:
+            async with httpx.AsyncClient() as client:
+                data = await self._first_valid([
+                    ("coingecko", lambda: self._fetch_coingecko_data(client, token_info)),
+                    ("binance", lambda: self._fetch_binance_data(client, token_info)),
+                    ("sui", lambda: self._fetch_sui_data(client, token_info))
+                ], self.hedge_delay if self.hedged else None)
+            if data is None:
+                return {"status": "error", "message": "Failed to fetch price data from all sources"}
+            return self._cache_and_return(token, data)
+        except Exception as e:
+            self.logger.error(f"Error fetching token price: {str(e)}")
+            return {"status": "error", "message": str(e)}
+
+    async def _first_valid(self, sources: List[PriceSource], delay: Optional[float]) -> Optional[Dict[str, Any]]:
+        """Return the first successful answer, starting each source in order.
+
+        The next source starts as soon as any running one fails, or once
+        ``delay`` seconds pass without an answer (``None`` waits for a
+        failure, i.e. plain fallback). Sources still running when one
+        succeeds are cancelled.
+        """
+        remaining = list(sources)
+        running: Dict[asyncio.Future, str] = {}
+        try:
+            while True:
+                if remaining:
+                    name, fetch = remaining.pop(0)
+                    running[asyncio.ensure_future(self._timed(name, fetch))] = name
+                if not running:
+                    return None
+                done, _ = await asyncio.wait(
+                    running, timeout=delay if remaining else None, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    name = running.pop(task)
+                    result = task.result()
+                    if result.get("status") == "success":
+                        SOURCE_WINS.inc(source=name)
+                        return result
+        finally:
+            for task in running:
+                task.cancel()
+            # Let losers unwind before the caller closes the HTTP client they use
+            await asyncio.gather(*running, return_exceptions=True)
+
+    async def _timed(self, name: str, fetch: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """Run one source, recording its latency; failures become error payloads"""
+        started = time.monotonic()
+        try:
+            result = await fetch()
+        except asyncio.CancelledError:
+            # A hedged loser was still slower than the winner; let its latency show it
+            SOURCE_LATENCY.observe(time.monotonic() - started, source=name, outcome="cancelled")
+            raise
+        except Exception as e:
+            self.logger.warning(f"{name} price fetch failed: {str(e)}")
+            result = {"status": "error", "message": str(e)}
+        outcome = "success" if result.get("status") == "success" else "error"
+        SOURCE_LATENCY.observe(time.monotonic() - started, source=name, outcome=outcome)
+        return result
+
     async def _fetch_coingecko_data(self, client: httpx.AsyncClient, token_info: Dict[str, str]) -> Dict[str, Any]:
         """Fetch price data from CoinGecko"""
         try:
@@ -95,6 +172,7 @@ class PriceTool(Tool):
             if not coingecko_id:
                 return {"status": "error", "message": "Token not found on CoinGecko"}
 
+            await self.rate_limiters.bucket("coingecko_api").acquire()
             response = await client.get(
                 f"{self.endpoints['coingecko']}/simple/price",
                 params={
@@ -131,6 +209,7 @@ class PriceTool(Tool):
             if not symbol:
                 return {"status": "error", "message": "Token not found on Binance"}
 
+            await self.rate_limiters.bucket("binance_api").acquire()
             response = await client.get(
                 f"{self.endpoints['binance']}/ticker/24hr",
                 params={"symbol": symbol}
@@ -149,27 +228,17 @@ class PriceTool(Tool):
             return {"status": "error", "message": str(e)}
 
     async def _fetch_sui_data(self, client: httpx.AsyncClient, token_info: Dict[str, str]) -> Dict[str, Any]:
-        """Fetch price data from Sui RPC"""
+        """Fetch price data from Cetus/Turbos pools over Sui RPC"""
         try:
-            # This is a simplified version - in reality, you'd need to:
-            # 1. Get the token's pool address from a DEX
-            # 2. Query the pool's reserves
-            # 3. Calculate the price based on reserves
-            response = await client.post(
-                self.endpoints["sui"],
-                json={
-                    "jsonrpc": "2.0",
-                    "id": 1,
-                    "method": "suix_getLatestCheckpoint",
-                    "params": []
-                }
-            )
-            response.raise_for_status()
-            
-            # For now, return placeholder data
+            token = token_info["name"].lower()
+            prices = await self.pool_prices.prices([token])
+            if token not in prices:
+                return {"status": "error", "message": "No DEX pool price for token"}
+
+            # Pools carry no 24h change or market cap
             return {
                 "status": "success",
-                "price": "0.00",
+                "price": prices[token],
                 "change": "0.00",
                 "mcap": "0.00"
             }
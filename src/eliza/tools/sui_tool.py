@@ -1,18 +1,42 @@
-from typing import Dict, Any
-import aiohttp
+from typing import Dict, Any, List, Optional, Tuple
+import asyncio
+import itertools
 import json
 import logging
 from ..base import Tool
+from src.config.settings import SUI_RPC_BATCH_MAX_SIZE
+from src.blockchain.decoding import BatchTooLargeError, RpcError, decode_rpc_response
+from src.blockchain.rpc_pool import RpcEndpointPool
+from src.blockchain.object_cache import ObjectFetcher
+from src.blockchain.pagination import dynamic_fields, with_objects
+from src.utils.http_pool import pool_manager
+from src.utils.resilience import resilience
+from src.utils.rate_limiter import rate_limiters
+
+
+def _is_batch_limit_error(error: Dict[str, Any]) -> bool:
+    message = str(error.get("message", "")).lower()
+    return "batch" in message and any(word in message for word in ("limit", "exceed", "too large", "too many"))
+
 
 class SuiTool(Tool):
-    def __init__(self, rpc_url: str):
+    def __init__(self, rpc_url: str, endpoints: Optional[RpcEndpointPool] = None):
         super().__init__(
             name="sui_blockchain",
             description="Interact with the Sui blockchain to fetch data and analyze on-chain activity",
             function=self._execute
         )
         self.rpc_url = rpc_url
+        # Calls go to the fastest healthy node; a single URL makes a pool of one
+        self.endpoints = endpoints or RpcEndpointPool([rpc_url])
+        self.batch_size = SUI_RPC_BATCH_MAX_SIZE
+        self.pool = pool_manager
+        self.resilience = resilience
+        self.rate_limiters = rate_limiters
         self.logger = logging.getLogger(__name__)
+        self._ids = itertools.count(1)
+        # Object reads from every caller of this tool share one version-aware cache
+        self.objects = ObjectFetcher(self)
 
     async def _execute(self, **kwargs) -> Dict[str, Any]:
         """Execute Sui blockchain operations"""
@@ -25,6 +49,16 @@ class SuiTool(Tool):
                 return await self._get_recent_transactions()
             elif action == "get_token_price":
                 return await self._get_token_price(kwargs.get("token_id"))
+            elif action == "get_overview":
+                return await self._get_overview()
+            elif action == "batch":
+                return await self._batch(kwargs.get("calls", []))
+            elif action == "get_objects":
+                return {"status": "success", "objects": await self.objects.get_objects(kwargs.get("object_ids", []))}
+            elif action == "get_past_objects":
+                return {"status": "success", "objects": await self.objects.get_past_objects(kwargs.get("refs", []))}
+            elif action == "get_dynamic_fields":
+                return await self._get_dynamic_fields(kwargs.get("parent_id"), kwargs.get("limit", 100))
             else:
                 return {"status": "error", "message": f"Unknown action: {action}"}
                 
@@ -32,59 +66,157 @@ class SuiTool(Tool):
             self.logger.error(f"Error executing Sui tool: {str(e)}")
             return {"status": "error", "message": str(e)}
 
+    async def _post(self, body: Any, endpoint: str, hedge: bool = False) -> Any:
+        """POST a JSON-RPC body on the pooled session under the shared retry, breaker and rate limits"""
+        async def send(url: str):
+            session = await self.pool.get_session("sui_rpc")
+            async with session.post(url, json=body) as response:
+                if response.status == 413:
+                    raise BatchTooLargeError(f"HTTP 413 for a batch of {len(body)}")
+                response.raise_for_status()
+                data = await response.json()
+            # A batch rejected as a whole comes back as a single error object
+            if isinstance(body, list) and isinstance(data, dict):
+                error = data.get("error") or {}
+                if _is_batch_limit_error(error):
+                    raise BatchTooLargeError(error.get("message", ""))
+                raise RpcError(error.get("code", 0), error.get("message", "Batch rejected"), error.get("data"))
+            return data
+
+        attempt = lambda: self.endpoints.call(send, hedge=hedge)
+        return await self.resilience.call("sui_rpc", endpoint, self.rate_limiters.limited("sui_rpc", attempt))
+
+    async def _rpc(self, method: str, params: list, hedge: bool = False) -> Dict[str, Any]:
+        """Send a single JSON-RPC request"""
+        return await self._post(
+            {"jsonrpc": "2.0", "id": next(self._ids), "method": method, "params": params},
+            endpoint=method,
+            hedge=hedge
+        )
+
+    async def call(self, method: str, params: list, hedge: bool = False) -> Any:
+        """Send one JSON-RPC call and return its ``result``, raising RpcError on an error response"""
+        return decode_rpc_response(await self._rpc(method, params, hedge))
+
+    async def batch_call(self, calls: List[Tuple[str, list]], hedge: bool = False) -> List[Any]:
+        """Send several JSON-RPC calls as batch requests.
+
+        Calls are split into batches of at most ``batch_size``; a batch the
+        node rejects as too large is halved and resent, and the smaller size
+        is kept for later batches.
+
+        Args:
+            calls: (method, params) pairs
+            hedge: Hedge each batch against a second node after its p95 latency
+
+        Returns:
+            One entry per call, in call order: the call's ``result``, or an
+            RpcError when that call failed
+        """
+        requests = [
+            {"jsonrpc": "2.0", "id": next(self._ids), "method": method, "params": params}
+            for method, params in calls
+        ]
+        size = self.batch_size
+        chunks = [requests[i:i + size] for i in range(0, len(requests), size)]
+        responses: Dict[int, Dict[str, Any]] = {}
+        for chunk_responses in await asyncio.gather(*(self._send_batch(chunk, hedge) for chunk in chunks)):
+            responses.update(chunk_responses)
+
+        results = []
+        for request in requests:
+            payload = responses.get(request["id"])
+            if payload is None:
+                results.append(RpcError(-32603, f"No response for {request['method']}"))
+                continue
+            try:
+                results.append(decode_rpc_response(payload))
+            except RpcError as e:
+                results.append(e)
+        return results
+
+    async def _send_batch(self, chunk: List[Dict[str, Any]], hedge: bool = False) -> Dict[int, Dict[str, Any]]:
+        """Send one batch and index its responses by request id"""
+        try:
+            data = await self._post(chunk, endpoint="batch", hedge=hedge)
+        except BatchTooLargeError:
+            if len(chunk) == 1:
+                raise
+            half = len(chunk) // 2
+            self.batch_size = min(self.batch_size, half)
+            self.logger.warning(f"RPC batch of {len(chunk)} too large, splitting into {half}")
+            left, right = await asyncio.gather(
+                self._send_batch(chunk[:half], hedge), self._send_batch(chunk[half:], hedge)
+            )
+            return {**left, **right}
+        return {item.get("id"): item for item in data if isinstance(item, dict)}
+
+    async def _batch(self, calls: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Run caller-supplied calls as one batch"""
+        results = await self.batch_call([(call["method"], call.get("params", [])) for call in calls])
+        return {
+            "status": "success",
+            "results": [
+                {"error": {"code": r.code, "message": r.message}} if isinstance(r, RpcError) else {"result": r}
+                for r in results
+            ]
+        }
+
+    async def _get_dynamic_fields(self, parent_id: str, limit: int = 100) -> Dict[str, Any]:
+        """Read up to ``limit`` entries of a table or bag together with their field objects"""
+        entries = []
+        fields = with_objects(dynamic_fields(self, parent_id), self.objects)
+        try:
+            async for field, obj in fields:
+                entries.append({"name": field.get("name"), "object": obj.get("data")})
+                if len(entries) >= limit:
+                    break
+        finally:
+            # Stops the prefetching as soon as enough entries are read
+            await fields.aclose()
+        return {"status": "success", "fields": entries}
+
+    async def _get_overview(self) -> Dict[str, Any]:
+        """Get metrics and recent transactions in one round trip"""
+        supply, transactions = await self.batch_call([
+            ("sui_getTotalSupply", []),
+            ("suix_queryTransactionBlocks", [{"options": {"showInput": True, "showEffects": True}}, None, 10, True])
+        ], hedge=True)
+        return {
+            "status": "success",
+            "metrics": {
+                "total_supply": "Unknown" if isinstance(supply, RpcError) else supply
+            },
+            "transactions": transactions.get("data", []) if isinstance(transactions, dict) else []
+        }
+
     async def _get_metrics(self) -> Dict[str, Any]:
         """Get Sui blockchain metrics"""
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                self.rpc_url,
-                json={
-                    "jsonrpc": "2.0",
-                    "id": 1,
-                    "method": "sui_getTotalSupply",
-                    "params": []
-                }
-            ) as response:
-                data = await response.json()
-                return {
-                    "status": "success",
-                    "metrics": {
-                        "total_supply": data.get("result", "Unknown"),
-                        "timestamp": data.get("timestamp", "Unknown")
-                    }
-                }
+        data = await self._rpc("sui_getTotalSupply", [])
+        return {
+            "status": "success",
+            "metrics": {
+                "total_supply": data.get("result", "Unknown"),
+                "timestamp": data.get("timestamp", "Unknown")
+            }
+        }
 
     async def _get_recent_transactions(self) -> Dict[str, Any]:
         """Get recent transactions"""
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                self.rpc_url,
-                json={
-                    "jsonrpc": "2.0",
-                    "id": 1,
-                    "method": "sui_getRecentTransactions",
-                    "params": [10]  # Get last 10 transactions
-                }
-            ) as response:
-                data = await response.json()
-                return {
-                    "status": "success",
-                    "transactions": data.get("result", [])
-                }
+        # Last 10 transaction blocks, newest first
+        page = await self.call("suix_queryTransactionBlocks", [
+            {"options": {"showInput": True, "showEffects": True, "showBalanceChanges": True}},
+            None, 10, True
+        ])
+        return {
+            "status": "success",
+            "transactions": (page or {}).get("data", [])
+        }
 
     async def _get_token_price(self, token_id: str) -> Dict[str, Any]:
         """Get token price"""
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                self.rpc_url,
-                json={
-                    "jsonrpc": "2.0",
-                    "id": 1,
-                    "method": "sui_getTokenPrice",
-                    "params": [token_id]
-                }
-            ) as response:
-                data = await response.json()
-                return {
-                    "status": "success",
-                    "price": data.get("result", "Unknown")
-                } 
\ No newline at end of file
+        data = await self._rpc("sui_getTokenPrice", [token_id])
+        return {
+            "status": "success",
+            "price": data.get("result", "Unknown")
+        } 
\ No newline at end of file
@@ -2,6 +2,7 @@ import tweepy
 import logging
 from datetime import datetime, timedelta
 from typing import List, Dict, Any
+from src.utils.rate_limiter import RateLimitedClient, rate_limiters
 from config.settings import (
     TWITTER_API_KEY,
     TWITTER_API_SECRET,
@@ -22,12 +23,16 @@ class MemecoinEngagement:
     def __init__(self):
         """Initialize Twitter API client with authentication."""
         try:
-            self.client = tweepy.Client(
-                consumer_key=TWITTER_API_KEY,
-                consumer_secret=TWITTER_API_SECRET,
-                access_token=TWITTER_ACCESS_TOKEN,
-                access_token_secret=TWITTER_ACCESS_TOKEN_SECRET,
-                wait_on_rate_limit=True
+            # Calls queue on the shared twitter_api bucket; wait_on_rate_limit stays as a backstop
+            self.client = RateLimitedClient(
+                tweepy.Client(
+                    consumer_key=TWITTER_API_KEY,
+                    consumer_secret=TWITTER_API_SECRET,
+                    access_token=TWITTER_ACCESS_TOKEN,
+                    access_token_secret=TWITTER_ACCESS_TOKEN_SECRET,
+                    wait_on_rate_limit=True
+                ),
+                rate_limiters.bucket("twitter_api")
             )
             logger.info("Twitter API client initialized successfully for memecoin engagement")
         except Exception as e:
@@ -0,0 +1,96 @@
+"""
+DataLoader-style micro-batching.
+
+Individual ``load(key)`` calls made within a short window are collected and
+sent to a batch function as one request; each caller gets back its own value.
+"""
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+
+from src.utils.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+BATCHES_SENT = registry.counter("batcher_batches_total", "Batch requests sent upstream")
+BATCHED_KEYS = registry.counter("batcher_keys_total", "Keys resolved through batch requests")
+
+BatchFn = Callable[[List[Hashable]], Awaitable[Dict[Hashable, Any]]]
+
+
+class MicroBatcher:
+    """Collect single-key loads into batches of up to ``max_batch_size`` keys."""
+
+    def __init__(self, batch_fn: BatchFn, max_batch_size: int = 50,
+                 max_delay: float = 0.01, name: str = "default"):
+        """
+        Args:
+            batch_fn: Coroutine taking a list of keys and returning a key -> value dict
+            max_batch_size: Flush as soon as this many distinct keys are pending
+            max_delay: Seconds to wait for more keys after the first one arrives
+            name: Label used for metrics
+        """
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.name = name
+        self._pending: Dict[Hashable, asyncio.Future] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    async def load(self, key: Hashable) -> Any:
+        """Return the value for ``key``, batched with other concurrent loads.
+
+        Raises:
+            KeyError: The batch response did not include ``key``
+            Exception: Whatever the batch function raised
+        """
+        future = self._pending.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._pending[key] = future
+            if len(self._pending) >= self.max_batch_size:
+                self._flush()
+            elif self._timer is None:
+                self._timer = asyncio.get_running_loop().call_later(self.max_delay, self._flush)
+        return await asyncio.shield(future)
+
+    async def load_many(self, keys: List[Hashable]) -> List[Any]:
+        return await asyncio.gather(*(self.load(key) for key in keys))
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, {}
+        asyncio.ensure_future(self._dispatch(batch))
+
+    async def _dispatch(self, batch: Dict[Hashable, asyncio.Future]):
+        keys = list(batch)
+        BATCHES_SENT.inc(batcher=self.name)
+        BATCHED_KEYS.inc(len(keys), batcher=self.name)
+        try:
+            results = await self.batch_fn(keys)
+        except Exception as e:
+            logger.warning(f"Batch of {len(keys)} keys failed in {self.name}: {str(e)}")
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for key, future in batch.items():
+            if future.done():
+                continue
+            if key in results:
+                future.set_result(results[key])
+            else:
+                future.set_exception(KeyError(key))
+
+    def stats(self) -> Dict[str, float]:
+        """Return batch and key counters."""
+        return {
+            "batches": BATCHES_SENT.value(batcher=self.name),
+            "keys": BATCHED_KEYS.value(batcher=self.name),
+            "pending": len(self._pending)
+        }
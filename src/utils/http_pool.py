@@ -0,0 +1,146 @@
+"""
+Process-wide pooled HTTP sessions.
+
+Clients and tools borrow long-lived ``aiohttp.ClientSession`` objects from the
+shared ``pool_manager`` instead of opening a new session (and new TCP/TLS
+handshakes) per call. Sessions are keyed by name so callers with different
+default headers can keep separate pools.
+"""
+import asyncio
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+import aiohttp
+
+from src.config.settings import (
+    HTTP_POOL_LIMIT,
+    HTTP_POOL_LIMIT_PER_HOST,
+    HTTP_KEEPALIVE_TIMEOUT,
+    HTTP_DNS_CACHE_TTL,
+    HTTP_REQUEST_TIMEOUT
+)
+from src.utils.metrics import registry
+from src.utils.quota import QuotaLedger, quota_ledger
+
+logger = logging.getLogger(__name__)
+
+POOL_HITS = registry.counter(
+    "http_pool_hits_total", "Requests served over a reused keep-alive connection"
+)
+POOL_MISSES = registry.counter(
+    "http_pool_misses_total", "Requests that had to open a new connection"
+)
+SESSIONS_CREATED = registry.counter(
+    "http_pool_sessions_created_total", "Pooled sessions created"
+)
+
+
+class ConnectionPoolManager:
+    """Owns shared aiohttp sessions with per-host limits, keep-alive and DNS caching."""
+
+    def __init__(self,
+                 limit: int = HTTP_POOL_LIMIT,
+                 limit_per_host: int = HTTP_POOL_LIMIT_PER_HOST,
+                 keepalive_timeout: float = HTTP_KEEPALIVE_TIMEOUT,
+                 ttl_dns_cache: int = HTTP_DNS_CACHE_TTL,
+                 request_timeout: float = HTTP_REQUEST_TIMEOUT,
+                 quota: Optional[QuotaLedger] = None):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.ttl_dns_cache = ttl_dns_cache
+        self.request_timeout = request_timeout
+        # Ledger that every completed request is counted against, if any
+        self.quota = quota
+        self._sessions: Dict[str, Tuple[aiohttp.ClientSession, asyncio.AbstractEventLoop]] = {}
+        self._lock: Optional[asyncio.Lock] = None
+        self._lock_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._names = set()
+
+    def _trace_config(self, name: str) -> aiohttp.TraceConfig:
+        """Count connection reuse (hit) versus new connections (miss) and metered API calls."""
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_reuse(session, ctx, params):
+            POOL_HITS.inc(pool=name)
+
+        async def on_create(session, ctx, params):
+            POOL_MISSES.inc(pool=name)
+
+        trace_config.on_connection_reuseconn.append(on_reuse)
+        trace_config.on_connection_create_end.append(on_create)
+        if self.quota is not None:
+            async def on_request_end(session, ctx, params):
+                self.quota.observe(params.url, params.response.headers)
+
+            trace_config.on_request_end.append(on_request_end)
+        return trace_config
+
+    def _create_session(self, name: str, headers: Optional[Dict[str, str]]) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=self.ttl_dns_cache,
+            use_dns_cache=True
+        )
+        SESSIONS_CREATED.inc(pool=name)
+        logger.info(f"Creating pooled HTTP session '{name}'")
+        return aiohttp.ClientSession(
+            connector=connector,
+            headers=headers,
+            timeout=aiohttp.ClientTimeout(total=self.request_timeout),
+            trace_configs=[self._trace_config(name)]
+        )
+
+    async def get_session(self, name: str = "default",
+                          headers: Optional[Dict[str, str]] = None) -> aiohttp.ClientSession:
+        """Borrow the shared session for ``name``, creating it on first use.
+
+        Args:
+            name: Pool name, e.g. ``"suivision"`` or ``"blockvision"``
+            headers: Default headers applied when the session is created
+
+        Returns:
+            An open ``aiohttp.ClientSession`` bound to the running loop
+        """
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        async with self._lock:
+            entry = self._sessions.get(name)
+            if entry is not None:
+                session, session_loop = entry
+                if not session.closed and session_loop is loop:
+                    return session
+                # Sessions are bound to the loop that created them; a session
+                # left behind by a finished loop is dropped and rebuilt.
+            session = self._create_session(name, headers)
+            self._sessions[name] = (session, loop)
+            self._names.add(name)
+            return session
+
+    def stats(self) -> Dict[str, Any]:
+        """Return pool counters and open sessions."""
+        return {
+            "sessions": sorted(name for name, (s, _) in self._sessions.items() if not s.closed),
+            "hits": sum(POOL_HITS.value(pool=name) for name in self._names),
+            "misses": sum(POOL_MISSES.value(pool=name) for name in self._names)
+        }
+
+    async def close(self):
+        """Close every pooled session and its connector."""
+        sessions, self._sessions = self._sessions, {}
+        for name, (session, session_loop) in sessions.items():
+            if session.closed or session_loop.is_closed():
+                continue
+            try:
+                await session.close()
+                logger.info(f"Closed pooled HTTP session '{name}'")
+            except Exception as e:
+                logger.error(f"Error closing pooled HTTP session '{name}': {str(e)}")
+
+
+# Process-wide pool shared by all clients and tools
+pool_manager = ConnectionPoolManager(quota=quota_ledger)
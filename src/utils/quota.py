@@ -0,0 +1,239 @@
+"""
+Quota accounting for metered data providers.
+
+Every response from a metered upstream (BlockVision, SuiVision) is recorded
+against that upstream's daily and monthly budget from ``API_QUOTAS``; when
+the provider reports its own quota in ``X-RateLimit-*``/``RateLimit-*``
+headers that figure is used as well. Pollers ask :meth:`QuotaLedger.stretch`
+for their next interval: while usage keeps pace with the calendar the
+interval is unchanged, and as a budget is spent faster than its window
+elapses (or a reported quota drops below ``QUOTA_LOW_WATER``) the interval
+grows, up to ``QUOTA_MAX_STRETCH`` times.
+"""
+import json
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Mapping, Optional
+from urllib.parse import urlparse
+
+from src.config.settings import (
+    API_QUOTAS,
+    QUOTA_LEDGER_PATH,
+    QUOTA_SAVE_INTERVAL,
+    QUOTA_LOW_WATER,
+    QUOTA_MAX_STRETCH
+)
+from src.utils.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+QUOTA_REMAINING = registry.gauge(
+    "api_quota_remaining", "Calls left per metered upstream and window (daily, monthly, reported)"
+)
+QUOTA_STRETCH = registry.gauge(
+    "api_quota_poll_stretch", "Current polling interval multiplier per metered upstream"
+)
+
+_HEADER_PREFIXES = ("x-ratelimit-", "ratelimit-")
+# Reset headers below this are seconds from now rather than epoch timestamps
+_EPOCH_THRESHOLD = 1e9
+
+
+def _window_left(now: float) -> Dict[str, float]:
+    """Fraction of the current UTC day and month still to come."""
+    moment = datetime.fromtimestamp(now, timezone.utc)
+    day_start = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    month_start = day_start.replace(day=1)
+    if month_start.month == 12:
+        month_end = month_start.replace(year=month_start.year + 1, month=1)
+    else:
+        month_end = month_start.replace(month=month_start.month + 1)
+    elapsed_day = (moment - day_start).total_seconds()
+    return {
+        "daily": 1.0 - elapsed_day / 86400,
+        "monthly": (month_end - moment).total_seconds() / (month_end - month_start).total_seconds()
+    }
+
+
+def _window_keys(now: float) -> Dict[str, str]:
+    moment = datetime.fromtimestamp(now, timezone.utc)
+    return {"daily": moment.strftime("%Y-%m-%d"), "monthly": moment.strftime("%Y-%m")}
+
+
+class QuotaLedger:
+    """Per-upstream call counts against daily and monthly budgets."""
+
+    def __init__(self, budgets: Optional[Dict[str, Dict[str, Any]]] = None,
+                 path: Optional[str] = QUOTA_LEDGER_PATH,
+                 low_water: float = QUOTA_LOW_WATER,
+                 max_stretch: float = QUOTA_MAX_STRETCH,
+                 save_interval: float = QUOTA_SAVE_INTERVAL,
+                 clock: Callable[[], float] = time.time):
+        """
+        Args:
+            budgets: ``{upstream: {"base_url", "daily", "monthly"}}``; a missing or zero
+                budget is not enforced
+            path: JSON file counts persist to across restarts, or None
+            low_water: Reported remaining fraction below which polling slows down
+            max_stretch: Largest multiplier applied to a polling interval
+            save_interval: Seconds between writes of the counts
+            clock: Wall-clock source, replaceable in tests
+        """
+        self.budgets = dict(API_QUOTAS if budgets is None else budgets)
+        self.path = path
+        self.low_water = low_water
+        self.max_stretch = max_stretch
+        self.save_interval = save_interval
+        self.clock = clock
+        self._hosts = {
+            urlparse(budget["base_url"]).hostname: name
+            for name, budget in self.budgets.items() if budget.get("base_url")
+        }
+        # upstream -> {"daily": [window key, count], "monthly": [window key, count]}
+        self._counts: Dict[str, Dict[str, list]] = {}
+        # upstream -> (remaining, limit, reset timestamp or None) from response headers
+        self._reported: Dict[str, tuple] = {}
+        self._loaded = path is None
+        self._saved_at = 0.0
+        self._dirty = False
+
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            with open(self.path) as f:
+                self._counts = json.load(f)
+        except FileNotFoundError:
+            return
+        except ValueError as e:
+            logger.warning(f"Ignoring unreadable quota ledger {self.path}: {str(e)}")
+
+    def _save(self):
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._counts, f)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+    def flush(self):
+        """Write pending counts now, e.g. at shutdown."""
+        if self._dirty:
+            self._save()
+
+    def upstream_for(self, url: str) -> Optional[str]:
+        return self._hosts.get(urlparse(str(url)).hostname)
+
+    def observe(self, url: str, headers: Optional[Mapping[str, str]] = None):
+        """Record a response from ``url`` if it belongs to a metered upstream."""
+        upstream = self.upstream_for(url)
+        if upstream is not None:
+            self.record(upstream, headers)
+
+    def record(self, upstream: str, headers: Optional[Mapping[str, str]] = None):
+        """Count one call to ``upstream`` and take in any quota it reported."""
+        self._load()
+        now = self.clock()
+        counts = self._counts.setdefault(upstream, {})
+        for window, key in _window_keys(now).items():
+            current = counts.get(window)
+            if not current or current[0] != key:
+                counts[window] = [key, 0]
+            counts[window][1] += 1
+        if headers:
+            self._read_headers(upstream, headers, now)
+        self._dirty = True
+        if now - self._saved_at >= self.save_interval:
+            self._saved_at = now
+            try:
+                self._save()
+            except OSError as e:
+                logger.warning(f"Could not persist quota ledger {self.path}: {str(e)}")
+        self._publish(upstream)
+
+    def _read_headers(self, upstream: str, headers: Mapping[str, str], now: float):
+        values = {}
+        for name, value in headers.items():
+            name = name.lower()
+            for prefix in _HEADER_PREFIXES:
+                if name.startswith(prefix):
+                    values.setdefault(name[len(prefix):], value)
+        try:
+            remaining = float(values["remaining"])
+            limit = float(values["limit"].split(",")[0].split(";")[0])
+        except (KeyError, ValueError):
+            return
+        reset_at = None
+        if "reset" in values:
+            try:
+                reset = float(values["reset"])
+                reset_at = reset if reset > _EPOCH_THRESHOLD else now + reset
+            except ValueError:
+                pass
+        if limit > 0:
+            self._reported[upstream] = (remaining, limit, reset_at)
+
+    def remaining(self, upstream: str) -> Dict[str, float]:
+        """Calls left per window; ``reported`` is present while a provider figure is current."""
+        self._load()
+        now = self.clock()
+        keys = _window_keys(now)
+        budget = self.budgets.get(upstream, {})
+        counts = self._counts.get(upstream, {})
+        left = {}
+        for window in ("daily", "monthly"):
+            if budget.get(window):
+                current = counts.get(window)
+                used = current[1] if current and current[0] == keys[window] else 0
+                left[window] = max(0.0, float(budget[window] - used))
+        reported = self._reported.get(upstream)
+        if reported is not None and (reported[2] is None or now < reported[2]):
+            left["reported"] = max(0.0, reported[0])
+        return left
+
+    def stretch_factor(self, upstream: str) -> float:
+        """Multiplier for ``upstream``'s polling intervals given how fast its quota is going."""
+        left = self.remaining(upstream)
+        time_left = _window_left(self.clock())
+        budget = self.budgets.get(upstream, {})
+        factor = 1.0
+        for window, calls in left.items():
+            if window == "reported":
+                fraction = calls / self._reported[upstream][1]
+                headroom = fraction / self.low_water if self.low_water > 0 else 1.0
+            else:
+                # Budget share left against share of the window left: below 1 means overspending
+                headroom = (calls / budget[window]) / max(time_left[window], 1e-6)
+            if headroom < 1.0:
+                factor = max(factor, 1.0 / headroom if headroom > 0 else self.max_stretch)
+        return min(factor, self.max_stretch)
+
+    def stretch(self, interval: float, *upstreams: str) -> float:
+        """``interval`` lengthened for the most constrained of ``upstreams``."""
+        factor = 1.0
+        for upstream in upstreams:
+            upstream_factor = self.stretch_factor(upstream)
+            QUOTA_STRETCH.set(upstream_factor, upstream=upstream)
+            factor = max(factor, upstream_factor)
+        if factor > 1.0:
+            logger.info(f"Quota running low for {', '.join(upstreams)}; polling every {interval * factor:.0f}s")
+        return interval * factor
+
+    def _publish(self, upstream: str):
+        for window, calls in self.remaining(upstream).items():
+            QUOTA_REMAINING.set(calls, upstream=upstream, window=window)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Remaining calls per upstream and window."""
+        return {upstream: self.remaining(upstream) for upstream in self.budgets}
+
+
+# Process-wide ledger fed by the pooled HTTP sessions
+quota_ledger = QuotaLedger()
@@ -0,0 +1,210 @@
+"""
+Token-bucket rate limiting for outbound API calls.
+
+Limits come from the ``rate_limits`` section of ``config/security.yml``:
+each entry gives a request count per window (``requests_per_minute``,
+``requests_per_3min``, ...) and a ``burst_size``. Callers reserve a token
+before each request; when the bucket is empty the reservation is queued
+behind earlier ones and the caller sleeps until its slot, so requests are
+served in arrival order instead of racing into 429 responses.
+"""
+import asyncio
+import functools
+import logging
+import re
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import yaml
+
+from src.config.settings import SECURITY_CONFIG_PATH
+from src.utils.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+LIMITER_WAIT = registry.histogram(
+    "rate_limiter_wait_seconds", "Time spent waiting for a rate limiter token"
+)
+LIMITER_THROTTLED = registry.counter(
+    "rate_limiter_throttled_total", "Requests that had to wait for a rate limiter token"
+)
+
+_WINDOW_UNITS = {"s": 1, "sec": 1, "second": 1, "m": 60, "min": 60, "minute": 60,
+                 "h": 3600, "hour": 3600, "d": 86400, "day": 86400}
+_RATE_KEY = re.compile(r"^requests_per_(\d*)_?([a-z]+?)s?$")
+
+
+def parse_rate(limits: Dict[str, Any]) -> Optional[float]:
+    """Return requests per second from a ``requests_per_<n><unit>`` entry, if present."""
+    for key, value in limits.items():
+        match = _RATE_KEY.match(key)
+        if match and match.group(2) in _WINDOW_UNITS:
+            window = int(match.group(1) or 1) * _WINDOW_UNITS[match.group(2)]
+            return float(value) / window
+    return None
+
+
+class TokenBucket:
+    """Token bucket refilled at ``rate`` tokens per second, holding at most ``capacity``.
+
+    Tokens are reserved up front and the balance may go negative; a negative
+    balance is the queue of callers already waiting, so each new caller
+    waits behind them. Safe to use from async code and from threads.
+    """
+
+    def __init__(self, name: str, rate: float, capacity: float):
+        self.name = name
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: float) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self.tokens -= tokens
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        LIMITER_WAIT.observe(wait, bucket=self.name)
+        if wait:
+            LIMITER_THROTTLED.inc(bucket=self.name)
+        return wait
+
+    def _refund(self, tokens: float):
+        with self._lock:
+            self.tokens = min(self.capacity, self.tokens + tokens)
+
+    async def acquire(self, tokens: float = 1.0) -> float:
+        """Wait for ``tokens`` and return the time spent waiting."""
+        wait = self._reserve(tokens)
+        if wait:
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                # Give the slot back to the callers queued behind us
+                self._refund(tokens)
+                raise
+        return wait
+
+    def acquire_blocking(self, tokens: float = 1.0) -> float:
+        """Blocking variant of :meth:`acquire` for synchronous clients.
+
+        Raises:
+            RuntimeError: Called on a thread running an event loop, where sleeping
+                would stall every coroutine; run the client in an executor instead
+        """
+        _ensure_off_loop(self.name)
+        wait = self._reserve(tokens)
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    def stats(self) -> Dict[str, float]:
+        """Return configuration plus wait counters for this bucket."""
+        waits = LIMITER_WAIT.count(bucket=self.name)
+        total_wait = LIMITER_WAIT.sum(bucket=self.name)
+        return {
+            "rate_per_second": self.rate,
+            "burst": self.capacity,
+            "requests": waits,
+            "throttled": LIMITER_THROTTLED.value(bucket=self.name),
+            "total_wait_seconds": round(total_wait, 3),
+            "avg_wait_seconds": round(total_wait / waits, 4) if waits else 0.0
+        }
+
+
+def _ensure_off_loop(name: str):
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    raise RuntimeError(
+        f"Blocking acquire on '{name}' from the event loop thread; run the client with run_in_executor"
+    )
+
+
+class _Unlimited:
+    """Stand-in for upstreams without a configured limit."""
+
+    name = "unlimited"
+
+    async def acquire(self, tokens: float = 1.0) -> float:
+        return 0.0
+
+    def acquire_blocking(self, tokens: float = 1.0) -> float:
+        return 0.0
+
+
+UNLIMITED = _Unlimited()
+
+
+class RateLimiterRegistry:
+    """Named token buckets built from the ``rate_limits`` configuration."""
+
+    def __init__(self, limits: Optional[Dict[str, Dict[str, Any]]] = None):
+        self._buckets: Dict[str, TokenBucket] = {}
+        for name, settings in (limits or {}).items():
+            rate = parse_rate(settings or {})
+            if not rate:
+                logger.warning(f"Ignoring rate limit {name}: no requests_per_<window> entry")
+                continue
+            burst = float(settings.get("burst_size") or 1)
+            self._buckets[name] = TokenBucket(name, rate, burst)
+
+    @classmethod
+    def from_config(cls, path: str = SECURITY_CONFIG_PATH) -> "RateLimiterRegistry":
+        """Load the ``rate_limits`` section of a security config file."""
+        try:
+            with open(path) as f:
+                config = yaml.safe_load(f) or {}
+        except (OSError, yaml.YAMLError) as e:
+            logger.warning(f"Rate limits not loaded from {path}: {str(e)}")
+            config = {}
+        return cls(config.get("rate_limits"))
+
+    def bucket(self, name: str):
+        """Return the bucket for ``name``, or a no-op limiter when none is configured."""
+        return self._buckets.get(name, UNLIMITED)
+
+    def limited(self, name: str, fn: Callable[[], Awaitable[Any]]) -> Callable[[], Awaitable[Any]]:
+        """Wrap a zero-argument coroutine function so every call first takes a token."""
+        bucket = self.bucket(name)
+
+        async def call():
+            await bucket.acquire()
+            return await fn()
+        return call
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Return per-bucket wait statistics."""
+        return {name: bucket.stats() for name, bucket in self._buckets.items()}
+
+
+class RateLimitedClient:
+    """Proxy that takes a token from ``bucket`` before every method call of a synchronous client.
+
+    Calls may sleep until a token is free, so from async code they must run on
+    a worker thread (``loop.run_in_executor``), never on the event loop.
+    """
+
+    def __init__(self, client: Any, bucket):
+        self._client = client
+        self._bucket = bucket
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._client, name)
+        if not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        def call(*args, **kwargs):
+            self._bucket.acquire_blocking()
+            return attr(*args, **kwargs)
+        return call
+
+
+# Process-wide limiters shared by all clients and tools
+rate_limiters = RateLimiterRegistry.from_config()
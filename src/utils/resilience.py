@@ -0,0 +1,228 @@
+"""
+Retry, backoff and circuit-breaker policy for outbound calls.
+
+Every upstream (SuiVision, BlockVision, Sui RPC, ...) gets a circuit breaker
+that fails fast while the upstream is down, and every endpoint gets a retry
+budget so retries can never multiply load on a struggling API. Retries use
+exponential backoff with full jitter.
+"""
+import asyncio
+import logging
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+import aiohttp
+
+from src.config.settings import (
+    MAX_RETRIES,
+    RETRY_DELAY,
+    RETRY_BASE_DELAY,
+    RETRY_BUDGET_RATIO,
+    RETRY_BUDGET_MIN_PER_SECOND,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RECOVERY_TIMEOUT
+)
+from src.utils.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+BREAKER_STATE = registry.gauge(
+    "circuit_breaker_state", "Circuit breaker state per upstream (0 closed, 1 half-open, 2 open)"
+)
+BREAKER_REJECTIONS = registry.counter(
+    "circuit_breaker_rejections_total", "Calls rejected because the circuit was open"
+)
+RETRIES = registry.counter("outbound_retries_total", "Retried outbound calls")
+BUDGET_EXHAUSTED = registry.counter(
+    "retry_budget_exhausted_total", "Retries skipped because the endpoint's retry budget was spent"
+)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit is open."""
+
+    def __init__(self, upstream: str, retry_in: float):
+        super().__init__(f"Circuit open for {upstream}, retry in {retry_in:.1f}s")
+        self.upstream = upstream
+        self.retry_in = retry_in
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Transient network failures, timeouts, 429 and 5xx responses are retried."""
+    if isinstance(exc, CircuitOpenError):
+        return False
+    if isinstance(exc, (asyncio.TimeoutError, aiohttp.ClientConnectionError)):
+        return True
+    status = getattr(exc, "status", None) or getattr(exc, "status_code", None)
+    if status is None:
+        response = getattr(exc, "response", None)
+        status = getattr(response, "status_code", None)
+    return status is not None and (status == 429 or status >= 500)
+
+
+class CircuitBreaker:
+    """Closed -> open after consecutive failures, half-open probe after a cool-down."""
+
+    CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+    _STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+    def __init__(self, name: str, failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+                 recovery_timeout: float = CIRCUIT_RECOVERY_TIMEOUT):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+        BREAKER_STATE.set(0, upstream=name)
+
+    def _set_state(self, state: str):
+        if state != self.state:
+            logger.warning(f"Circuit for {self.name} is now {state}")
+        self.state = state
+        BREAKER_STATE.set(self._STATE_VALUES[state], upstream=self.name)
+
+    def before_call(self):
+        """Raise CircuitOpenError unless a call may go through."""
+        if self.state == self.OPEN:
+            elapsed = time.monotonic() - self.opened_at
+            if elapsed < self.recovery_timeout:
+                BREAKER_REJECTIONS.inc(upstream=self.name)
+                raise CircuitOpenError(self.name, self.recovery_timeout - elapsed)
+            self._set_state(self.HALF_OPEN)
+        if self.state == self.HALF_OPEN:
+            if self._probe_in_flight:
+                BREAKER_REJECTIONS.inc(upstream=self.name)
+                raise CircuitOpenError(self.name, 0.0)
+            self._probe_in_flight = True
+
+    def record_success(self):
+        self._probe_in_flight = False
+        self.failures = 0
+        self._set_state(self.CLOSED)
+
+    def record_failure(self):
+        self._probe_in_flight = False
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+            self._set_state(self.OPEN)
+
+    def release(self):
+        """Forget a probe that ended without a verdict (e.g. a non-retryable error)."""
+        self._probe_in_flight = False
+
+
+class RetryBudget:
+    """Token bucket of retries: each request deposits ``ratio`` tokens, each retry spends one."""
+
+    def __init__(self, ratio: float = RETRY_BUDGET_RATIO,
+                 min_per_second: float = RETRY_BUDGET_MIN_PER_SECOND, max_tokens: float = 10.0):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.max_tokens, self.tokens + (now - self._updated) * self.min_per_second)
+        self._updated = now
+
+    def deposit(self):
+        self._refill()
+        self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        self._refill()
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+
+class ResilienceRegistry:
+    """Shared breakers and retry budgets, plus the retry loop that uses them."""
+
+    def __init__(self, max_retries: int = MAX_RETRIES, base_delay: float = RETRY_BASE_DELAY,
+                 max_delay: float = RETRY_DELAY):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._budgets: Dict[Tuple[str, str], RetryBudget] = {}
+
+    def breaker(self, upstream: str) -> CircuitBreaker:
+        if upstream not in self._breakers:
+            self._breakers[upstream] = CircuitBreaker(upstream)
+        return self._breakers[upstream]
+
+    def budget(self, upstream: str, endpoint: str) -> RetryBudget:
+        key = (upstream, endpoint)
+        if key not in self._budgets:
+            self._budgets[key] = RetryBudget()
+        return self._budgets[key]
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for retry number ``attempt`` (0-based)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    async def call(self, upstream: str, endpoint: str, fn: Callable[[], Awaitable[Any]],
+                   retryable: Callable[[BaseException], bool] = is_retryable) -> Any:
+        """Run ``fn`` under the upstream's breaker, retrying transient failures.
+
+        Args:
+            upstream: Upstream name the circuit breaker is keyed by
+            endpoint: Endpoint name the retry budget is keyed by
+            fn: Zero-argument coroutine function performing one attempt
+            retryable: Decides which exceptions are worth retrying
+
+        Raises:
+            CircuitOpenError: The upstream's circuit is open
+            Exception: The last error once retries or the budget run out
+        """
+        breaker = self.breaker(upstream)
+        budget = self.budget(upstream, endpoint)
+        budget.deposit()
+        attempt = 0
+        while True:
+            breaker.before_call()
+            try:
+                result = await fn()
+            except asyncio.CancelledError:
+                breaker.release()
+                raise
+            except Exception as e:
+                if not retryable(e):
+                    breaker.release()
+                    raise
+                breaker.record_failure()
+                if attempt >= self.max_retries or breaker.state == CircuitBreaker.OPEN:
+                    raise
+                if not budget.try_spend():
+                    BUDGET_EXHAUSTED.inc(upstream=upstream, endpoint=endpoint)
+                    raise
+                delay = self.backoff(attempt)
+                attempt += 1
+                RETRIES.inc(upstream=upstream, endpoint=endpoint)
+                logger.warning(
+                    f"Retrying {upstream} {endpoint} in {delay:.2f}s "
+                    f"(attempt {attempt}/{self.max_retries}): {str(e)}"
+                )
+                await asyncio.sleep(delay)
+                continue
+            breaker.record_success()
+            return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Return breaker states and remaining retry budgets."""
+        return {
+            "breakers": {name: b.state for name, b in self._breakers.items()},
+            "budgets": {f"{u}:{e}": round(b.tokens, 2) for (u, e), b in self._budgets.items()}
+        }
+
+
+# Process-wide policy shared by all clients and tools
+resilience = ResilienceRegistry()
@@ -0,0 +1,315 @@
+"""
+TTL response cache with stale-while-revalidate and conditional requests.
+
+Entries are keyed by method, URL and params. A fresh entry is served
+directly; a stale entry is served immediately while a background refresh
+revalidates it with ``If-None-Match``/``If-Modified-Since`` so an unchanged
+upstream answers 304 and the cached body is reused.
+
+Given a ``path``, entries are also written to a gzipped JSON file and read
+back lazily on first use, so a restarted process serves its first requests
+from the previous run's responses (stale ones while they revalidate).
+Changes only mark the cache dirty; it is written at most every
+``save_interval`` seconds on a worker thread, and by :meth:`flush` at
+shutdown.
+"""
+import asyncio
+import gzip
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import aiohttp
+
+from src.utils.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+CACHE_REQUESTS = registry.counter(
+    "response_cache_requests_total", "Response cache lookups by result (hit, stale, miss)"
+)
+CACHE_REVALIDATIONS = registry.counter(
+    "response_cache_revalidations_total", "Conditional revalidations by result (not_modified, updated, error)"
+)
+
+CacheKey = Tuple[str, str, Tuple[Tuple[str, str], ...]]
+# Runs one upstream fetch, e.g. under a retry/circuit-breaker policy
+FetchGuard = Callable[[Callable[[], Awaitable[Any]]], Awaitable[Any]]
+
+
+class CacheEntry:
+    """Cached response body plus its validators."""
+
+    __slots__ = ("body", "etag", "last_modified", "stored_at", "ttl")
+
+    def __init__(self, body: Any, etag: Optional[str], last_modified: Optional[str], ttl: float):
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.stored_at = time.monotonic()
+        self.ttl = ttl
+
+    def age(self) -> float:
+        return time.monotonic() - self.stored_at
+
+    def to_row(self, key: "CacheKey") -> list:
+        """Compact on-disk form; the age is stored as a wall-clock timestamp."""
+        method, url, params = key
+        return [method, url, params, self.body, self.etag, self.last_modified,
+                time.time() - self.age(), self.ttl]
+
+    @classmethod
+    def from_row(cls, row: list) -> Tuple["CacheKey", "CacheEntry"]:
+        method, url, params, body, etag, last_modified, stored_at, ttl = row
+        entry = cls(body, etag, last_modified, ttl)
+        entry.stored_at = time.monotonic() - max(0.0, time.time() - stored_at)
+        return (method, url, tuple(tuple(p) for p in params)), entry
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """Bounded LRU cache of JSON responses with per-endpoint TTLs."""
+
+    def __init__(self, name: str = "default", default_ttl: float = 60.0,
+                 ttls: Optional[Dict[str, float]] = None, max_stale: float = 300.0,
+                 max_entries: int = 1024, path: Optional[str] = None,
+                 save_interval: float = 30.0):
+        """
+        Args:
+            name: Label used for metrics
+            default_ttl: Freshness lifetime in seconds for endpoints without an override
+            ttls: Per-endpoint freshness lifetimes in seconds
+            max_stale: How long past its TTL an entry may still be served while revalidating
+            max_entries: LRU bound on the number of cached responses
+            path: Gzipped JSON file entries persist to across restarts, or None
+            save_interval: Seconds a change may wait before the file is rewritten
+        """
+        self.name = name
+        self.default_ttl = default_ttl
+        self.ttls = dict(ttls or {})
+        self.max_stale = max_stale
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[CacheKey, CacheEntry]" = OrderedDict()
+        self._refreshing: Dict[CacheKey, asyncio.Task] = {}
+        self.path = path
+        self.save_interval = save_interval
+        self._loaded = path is None
+        self._dirty = False
+        self._save_timer: Optional[asyncio.TimerHandle] = None
+        self._save_task: Optional[asyncio.Future] = None
+
+    @staticmethod
+    def make_key(method: str, url: str, params: Optional[Dict[str, Any]] = None) -> CacheKey:
+        return (method.upper(), url, tuple(sorted((k, str(v)) for k, v in (params or {}).items())))
+
+    def ttl_for(self, endpoint: Optional[str]) -> float:
+        return self.ttls.get(endpoint, self.default_ttl) if endpoint else self.default_ttl
+
+    async def get_json(self, session: aiohttp.ClientSession, url: str,
+                       params: Optional[Dict[str, Any]] = None,
+                       endpoint: Optional[str] = None,
+                       decode: Optional[Callable[[bytes], Any]] = None,
+                       guard: Optional[FetchGuard] = None,
+                       headers: Optional[Dict[str, str]] = None) -> Any:
+        """GET ``url`` through the cache.
+
+        Args:
+            session: Session used for upstream requests
+            url: Absolute request URL
+            params: Query parameters (part of the cache key)
+            endpoint: Endpoint name used to look up the TTL
+            decode: Converts the raw body into the cached value (defaults to JSON)
+            guard: Wraps every upstream fetch; cache hits never go through it
+            headers: Extra request headers, e.g. per-caller credentials (not part of the key)
+
+        Returns:
+            Decoded JSON body, possibly stale while a refresh is in flight
+
+        Raises:
+            aiohttp.ClientResponseError: The upstream answered with an error on a miss
+        """
+        self._load()
+        key = self.make_key("GET", url, params)
+        ttl = self.ttl_for(endpoint)
+        entry = self._entries.get(key)
+
+        if entry is not None:
+            age = entry.age()
+            if age < entry.ttl:
+                self._entries.move_to_end(key)
+                CACHE_REQUESTS.inc(cache=self.name, result="hit")
+                return entry.body
+            if age < entry.ttl + self.max_stale:
+                self._entries.move_to_end(key)
+                CACHE_REQUESTS.inc(cache=self.name, result="stale")
+                self._schedule_refresh(key, session, url, params, ttl, decode, guard, headers)
+                return entry.body
+
+        CACHE_REQUESTS.inc(cache=self.name, result="miss")
+        return await self._guarded_fetch(key, session, url, params, ttl, decode, guard, headers)
+
+    async def _guarded_fetch(self, key: CacheKey, session: aiohttp.ClientSession, url: str,
+                             params: Optional[Dict[str, Any]], ttl: float,
+                             decode: Optional[Callable[[bytes], Any]],
+                             guard: Optional[FetchGuard],
+                             headers: Optional[Dict[str, str]] = None) -> Any:
+        fetch = lambda: self._fetch(key, session, url, params, ttl, decode, headers)
+        return await (guard(fetch) if guard else fetch())
+
+    def _schedule_refresh(self, key: CacheKey, session: aiohttp.ClientSession, url: str,
+                          params: Optional[Dict[str, Any]], ttl: float,
+                          decode: Optional[Callable[[bytes], Any]],
+                          guard: Optional[FetchGuard] = None,
+                          headers: Optional[Dict[str, str]] = None):
+        if key in self._refreshing:
+            return
+
+        async def refresh():
+            try:
+                await self._guarded_fetch(key, session, url, params, ttl, decode, guard, headers)
+            except Exception as e:
+                CACHE_REVALIDATIONS.inc(cache=self.name, result="error")
+                logger.warning(f"Background refresh of {url} failed: {str(e)}")
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.ensure_future(refresh())
+
+    async def _fetch(self, key: CacheKey, session: aiohttp.ClientSession, url: str,
+                     params: Optional[Dict[str, Any]], ttl: float,
+                     decode: Optional[Callable[[bytes], Any]] = None,
+                     headers: Optional[Dict[str, str]] = None) -> Any:
+        entry = self._entries.get(key)
+        request_headers = dict(headers or {})
+        if entry is not None:
+            request_headers.update(entry.conditional_headers())
+
+        async with session.get(url, params=params, headers=request_headers) as response:
+            if response.status == 304 and entry is not None:
+                entry.stored_at = time.monotonic()
+                entry.ttl = ttl
+                CACHE_REVALIDATIONS.inc(cache=self.name, result="not_modified")
+                self._mark_dirty()
+                return entry.body
+            response.raise_for_status()
+            body = decode(await response.read()) if decode else await response.json()
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+
+        if entry is not None:
+            CACHE_REVALIDATIONS.inc(cache=self.name, result="updated")
+        self._store(key, CacheEntry(body, etag, last_modified, ttl))
+        return body
+
+    def _store(self, key: CacheKey, entry: CacheEntry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        self._mark_dirty()
+
+    def _load(self):
+        """Read persisted entries once, dropping any too old to be served."""
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            with gzip.open(self.path, "rt") as f:
+                rows = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable response cache {self.path}: {str(e)}")
+            return
+        for row in rows:
+            try:
+                key, entry = CacheEntry.from_row(row)
+            except (TypeError, ValueError):
+                continue
+            if entry.age() < entry.ttl + self.max_stale and key not in self._entries:
+                self._entries[key] = entry
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _mark_dirty(self):
+        """Schedule a write of the file ``save_interval`` seconds from now."""
+        if not self.path:
+            return
+        self._dirty = True
+        if self._save_timer is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # No loop to schedule on; flush() writes it
+        self._save_timer = loop.call_later(self.save_interval, self._start_save)
+
+    def _start_save(self):
+        self._save_timer = None
+        self._save_task = asyncio.ensure_future(self._save_in_background())
+
+    def _snapshot(self) -> list:
+        self._dirty = False
+        return [entry.to_row(key) for key, entry in self._entries.items()]
+
+    async def _save_in_background(self):
+        if self._dirty:
+            rows = self._snapshot()
+            await asyncio.get_running_loop().run_in_executor(None, self._write, rows)
+
+    def flush(self):
+        """Write pending changes now, e.g. at shutdown."""
+        if self._save_timer is not None:
+            self._save_timer.cancel()
+            self._save_timer = None
+        if self._dirty:
+            self._write(self._snapshot())
+
+    def _write(self, rows: list):
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with gzip.open(tmp_path, "wt") as f:
+                json.dump(rows, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Could not persist response cache {self.path}: {str(e)}")
+            try:
+                os.remove(self.path + ".tmp")
+            except OSError:
+                pass
+
+    def invalidate(self, url: Optional[str] = None):
+        """Drop cached entries for ``url``, or everything when no URL is given."""
+        self._load()
+        if url is None:
+            self._entries.clear()
+        else:
+            for key in [k for k in self._entries if k[1] == url]:
+                del self._entries[key]
+        self._mark_dirty()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit, stale, miss and revalidation counters."""
+        self._load()
+        return {
+            "entries": len(self._entries),
+            "hits": CACHE_REQUESTS.value(cache=self.name, result="hit"),
+            "stale_hits": CACHE_REQUESTS.value(cache=self.name, result="stale"),
+            "misses": CACHE_REQUESTS.value(cache=self.name, result="miss"),
+            "revalidated": CACHE_REVALIDATIONS.value(cache=self.name, result="not_modified"),
+            "updated": CACHE_REVALIDATIONS.value(cache=self.name, result="updated"),
+            "refresh_errors": CACHE_REVALIDATIONS.value(cache=self.name, result="error")
+        }
@@ -0,0 +1,62 @@
+"""
+Single-flight request coalescing.
+
+Concurrent callers asking for the same key share one in-flight call: the
+first caller starts it, later callers wait on the same future, and every
+waiter receives the same result or exception.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+from src.utils.metrics import registry
+
+SINGLEFLIGHT_CALLS = registry.counter(
+    "singleflight_calls_total", "Single-flight calls by role (leader starts the call, merged waits on it)"
+)
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key."""
+
+    def __init__(self, name: str = "default"):
+        self.name = name
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run ``fn`` for ``key`` unless a call for the same key is already running.
+
+        Args:
+            key: Coalescing key, e.g. a token address
+            fn: Zero-argument coroutine function performing the upstream call
+
+        Returns:
+            The shared result of the single in-flight call
+
+        Raises:
+            Exception: Whatever ``fn`` raised, delivered to every waiter
+        """
+        future = self._inflight.get(key)
+        if future is not None:
+            SINGLEFLIGHT_CALLS.inc(group=self.name, role="merged")
+        else:
+            SINGLEFLIGHT_CALLS.inc(group=self.name, role="leader")
+            future = asyncio.ensure_future(fn())
+            self._inflight[key] = future
+            future.add_done_callback(lambda done: self._forget(key, done))
+        # Shield so one cancelled waiter does not cancel the call for the others
+        return await asyncio.shield(future)
+
+    def _forget(self, key: Hashable, future: asyncio.Future):
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+
+    def in_flight(self) -> int:
+        return len(self._inflight)
+
+    def stats(self) -> Dict[str, float]:
+        """Return how many calls started upstream requests and how many were merged."""
+        return {
+            "leaders": SINGLEFLIGHT_CALLS.value(group=self.name, role="leader"),
+            "merged": SINGLEFLIGHT_CALLS.value(group=self.name, role="merged"),
+            "in_flight": self.in_flight()
+        }
@@ -0,0 +1,49 @@
+import asyncio
+import pytest
+from src.utils.batcher import MicroBatcher
+
+@pytest.mark.asyncio
+async def test_loads_in_window_are_batched():
+    batches = []
+
+    async def batch_fn(keys):
+        batches.append(list(keys))
+        return {key: key.upper() for key in keys}
+
+    batcher = MicroBatcher(batch_fn, max_delay=0.01, name="test-window")
+    results = await asyncio.gather(*(batcher.load(key) for key in ["sui", "cetus", "navi", "sui"]))
+
+    assert results == ["SUI", "CETUS", "NAVI", "SUI"]
+    assert batches == [["sui", "cetus", "navi"]]
+    assert batcher.stats()["batches"] == 1
+
+@pytest.mark.asyncio
+async def test_full_batch_flushes_immediately():
+    batches = []
+
+    async def batch_fn(keys):
+        batches.append(len(keys))
+        return {key: key for key in keys}
+
+    batcher = MicroBatcher(batch_fn, max_batch_size=2, max_delay=10, name="test-size")
+    results = await asyncio.wait_for(batcher.load_many(["a", "b", "c", "d"]), timeout=1)
+
+    assert results == ["a", "b", "c", "d"]
+    assert batches == [2, 2]
+
+@pytest.mark.asyncio
+async def test_missing_key_and_batch_errors():
+    async def partial(keys):
+        return {"sui": 1.0}
+
+    batcher = MicroBatcher(partial, name="test-missing")
+    ok, missing = await asyncio.gather(batcher.load("sui"), batcher.load("nope"), return_exceptions=True)
+    assert ok == 1.0
+    assert isinstance(missing, KeyError)
+
+    async def failing(keys):
+        raise RuntimeError("batch down")
+
+    batcher = MicroBatcher(failing, name="test-failing")
+    results = await asyncio.gather(batcher.load("a"), batcher.load("b"), return_exceptions=True)
+    assert all(isinstance(r, RuntimeError) for r in results)
@@ -1,8 +1,16 @@
+import asyncio
 import pytest
+import pytest_asyncio
 import aiohttp
+from aiohttp import web
+from aiohttp.test_utils import TestServer
 from unittest.mock import Mock, patch
 from datetime import datetime, timedelta
 from src.eliza.tools.blockvision_tool import BlockvisionTool
+from src.utils.http_pool import ConnectionPoolManager
+from src.utils.rate_limiter import RateLimiterRegistry
+from src.utils.resilience import ResilienceRegistry
+from src.utils.response_cache import ResponseCache
 
 @pytest.fixture
 def mock_response():
@@ -18,7 +26,7 @@ def mock_response():
 
 @pytest.fixture
 def blockvision_tool():
-    return BlockvisionTool(api_key="test_api_key")
+    return BlockvisionTool(api_key="test_api_key", cache=ResponseCache(name="test-mocked", path=None))
 
 @pytest.mark.asyncio
 async def test_get_market_data(blockvision_tool, mock_response):
@@ -182,4 +190,134 @@ async def test_invalid_response_format(blockvision_tool):
         result = await blockvision_tool._execute(action="get_market_data")
         
         assert result["status"] == "error"
-        assert "Invalid response format" in result["message"] 
\ No newline at end of file
+        assert "Invalid response format" in result["message"]
+
+
+BLOCKVISION_DATA = {
+    "/defi/tvl": {"projects": [{"name": "Cetus", "tvl": 300}, {"name": "Navi", "tvl": 200}]},
+    "/defi/projects": {"projects": [{"name": "Cetus", "tvl": 300, "volume": 50}]},
+    "/network/active-accounts": {"active_accounts": 1200},
+    "/network/transactions": {"transaction_count": 99000},
+    "/tokens/top-gainers": {"tokens": [{"symbol": "CETUS", "price_change_24h": 12.5}]},
+    "/defi/pools": {"pools": [{"name": "SUI-USDC", "apr": 18.2, "tvl": 1000}]},
+    "/market/overview": {"volume_24h": 5000000},
+    "/nfts/collections": {"collections": [{"name": "Capys", "volume": 700, "floor_price": 3}]},
+    "/nfts/overview": {"total_volume": 9000, "active_accounts": 450}
+}
+
+@pytest_asyncio.fixture
+async def served_tool():
+    state = {"in_flight": 0, "max_in_flight": 0, "auth": set(), "missing": set(), "data": dict(BLOCKVISION_DATA)}
+
+    async def handler(request):
+        state["auth"].add(request.headers.get("Authorization"))
+        state["in_flight"] += 1
+        state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+        try:
+            await asyncio.sleep(0.02)
+        finally:
+            state["in_flight"] -= 1
+        if request.path in state["missing"] or request.path not in state["data"]:
+            return web.json_response({"error": "not found"}, status=404)
+        return web.json_response(state["data"][request.path])
+
+    app = web.Application()
+    app.router.add_get("/{tail:.*}", handler)
+    server = TestServer(app)
+    await server.start_server()
+    tool = BlockvisionTool(api_key="secret", cache=ResponseCache(name="test-blockvision", default_ttl=0, max_stale=0))
+    tool.base_url = str(server.make_url("")).rstrip("/")
+    tool.pool = ConnectionPoolManager()
+    tool.resilience = ResilienceRegistry(base_delay=0.001)
+    tool.rate_limiters = RateLimiterRegistry()
+    yield tool, state
+    await tool.pool.close()
+    await server.close()
+
+@pytest.mark.asyncio
+async def test_composite_metrics_share_one_session(served_tool):
+    tool, state = served_tool
+    defi, trading, nft = await asyncio.gather(
+        tool._execute(action="get_defi_metrics"),
+        tool._execute(action="get_trading_metrics"),
+        tool._execute(action="get_nft_metrics")
+    )
+
+    assert defi["metrics"]["tvl_by_project"] == {"Cetus": 300, "Navi": 200, "total": 500.0}
+    assert defi["metrics"]["active_accounts"] == 1200
+    assert defi["metrics"]["total_transactions"] == 99000
+    assert trading["metrics"]["top_gainers"] == [{"symbol": "CETUS", "price_change": 12.5}]
+    assert trading["metrics"]["farming_pools"][0]["apr"] == 18.2
+    assert nft["metrics"]["top_collections"][0]["name"] == "Capys"
+    assert nft["metrics"]["active_nft_accounts"] == 450
+    assert "partial" not in defi
+    # Requests ran concurrently over one authenticated pooled session
+    assert state["max_in_flight"] > 3
+    assert state["auth"] == {"Bearer secret"}
+    assert tool.pool.stats()["sessions"] == ["blockvision"]
+
+@pytest.mark.asyncio
+async def test_each_tool_sends_its_own_key_over_the_shared_session(served_tool):
+    tool, state = served_tool
+    other = BlockvisionTool(api_key="other", cache=ResponseCache(name="test-bv-other", default_ttl=0, max_stale=0))
+    other.base_url = tool.base_url
+    other.pool = tool.pool
+    other.resilience = tool.resilience
+    other.rate_limiters = tool.rate_limiters
+
+    await tool._execute(action="get_market_data")
+    assert state["auth"] == {"Bearer secret"}
+    await other._execute(action="get_market_data")
+    assert state["auth"] == {"Bearer secret", "Bearer other"}
+    assert tool.pool.stats()["sessions"] == ["blockvision"]
+
+@pytest.mark.asyncio
+async def test_composite_metrics_tolerate_partial_failures(served_tool):
+    tool, state = served_tool
+    state["missing"].update({"/tokens/top-gainers"})
+    result = await tool._execute(action="get_trading_metrics")
+    assert result["status"] == "success"
+    assert result["partial"] == ["/tokens/top-gainers"]
+    assert result["metrics"]["top_gainers"] == []
+    assert result["metrics"]["volume_24h"] == 5000000
+
+    state["missing"].update({"/nfts/collections", "/nfts/overview"})
+    result = await tool._execute(action="get_nft_metrics")
+    assert result["status"] == "error"
+
+@pytest.mark.asyncio
+async def test_protocol_leaderboard_bounded_fan_out(served_tool):
+    tool, state = served_tool
+    tool.leaderboard_concurrency = 3
+    protocols = [f"p{i}" for i in range(20)]
+    for i, protocol in enumerate(protocols):
+        state["data"][f"/protocols/{protocol}/metrics"] = {"tvl": i * 10, "volume_24h": 100 - i, "fees_24h": None}
+    state["missing"].add("/protocols/p19/metrics")
+
+    result = await tool._execute(action="get_protocol_leaderboard", protocols=protocols, limit=3)
+    assert [row["protocol"] for row in result["leaderboard"]] == ["p18", "p17", "p16"]
+    assert [row["rank"] for row in result["leaderboard"]] == [1, 2, 3]
+    assert result["partial"] == ["p19"]
+    assert result["protocols_ranked"] == 19
+    assert state["max_in_flight"] <= 3
+
+    by_volume = await tool._execute(action="get_protocol_leaderboard", protocols=protocols, rank_by="volume", limit=2)
+    assert [row["protocol"] for row in by_volume["leaderboard"]] == ["p0", "p1"]
+    bad = await tool._execute(action="get_protocol_leaderboard", rank_by="users")
+    assert bad["status"] == "error"
+
+@pytest.mark.asyncio
+async def test_restarted_tool_is_served_from_persisted_cache(served_tool, tmp_path):
+    tool, state = served_tool
+    path = str(tmp_path / "blockvision.json.gz")
+    tool.cache = ResponseCache(name="test-bv-persist", ttls={"/market/overview": 300}, path=path)
+    first = await tool._execute(action="get_market_data")
+    assert first["market_data"]["24h_volume"] == 5000000
+    state["data"]["/market/overview"] = {"volume_24h": 1}
+    tool.close()
+
+    # A new process reads the file lazily and answers without calling the API
+    tool.cache = ResponseCache(name="test-bv-persist-2", ttls={"/market/overview": 300}, path=path)
+    state["missing"].add("/market/overview")
+    second = await tool._execute(action="get_market_data")
+    assert second == first
@@ -1,6 +1,11 @@
+import logging
+import time
 import pytest
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import Mock, patch
 from src.eliza.agents.capybara_agent import CapybaraAgent
+from src.blockchain.decoding import SuiTransaction
+from src.blockchain.tx_index import SUI_COIN_TYPE, TransactionIndex
 from datetime import datetime
 
 @pytest.fixture
@@ -135,4 +140,110 @@ async def test_calculate_tweet_quality(capybara_agent):
     for tweet_text, content in tweets.items():
         score = capybara_agent.tools[2]._calculate_tweet_quality(content)
         assert isinstance(score, float)
-        assert 0 <= score <= 5.0 
\ No newline at end of file
+        assert 0 <= score <= 5.0 
+
+def make_prober(delays):
+    """Agent shell whose endpoint probe sleeps per URL and fails for negative delays"""
+    agent = CapybaraAgent.__new__(CapybaraAgent)
+    agent.logger = logging.getLogger("test")
+
+    def probe(rpc_url, timeout):
+        delay = delays[rpc_url]
+        time.sleep(abs(delay))
+        if delay < 0:
+            raise ConnectionError("refused")
+        return rpc_url
+
+    agent._probe_rpc_endpoint = probe
+    return agent
+
+def test_probe_rpc_endpoints_takes_first_good_answer():
+    """Test startup probing runs in parallel and returns the fastest healthy node"""
+    agent = make_prober({"dead": -0.01, "slow": 0.5, "fast": 0.05})
+    executor = ThreadPoolExecutor(max_workers=3)
+    started = time.monotonic()
+    try:
+        assert agent._probe_rpc_endpoints(executor, ["dead", "slow", "fast"], 1.0) == "fast"
+    finally:
+        executor.shutdown(wait=False)
+    assert time.monotonic() - started < 0.4
+
+def test_probe_rpc_endpoints_respects_deadline():
+    """Test startup probing gives up when no endpoint answers in time"""
+    agent = make_prober({"hung": 1.0, "dead": -0.01})
+    executor = ThreadPoolExecutor(max_workers=2)
+    started = time.monotonic()
+    try:
+        assert agent._probe_rpc_endpoints(executor, ["hung", "dead"], 0.1) is None
+    finally:
+        executor.shutdown(wait=False)
+    assert time.monotonic() - started < 0.5
+
+def test_probe_rpc_endpoints_cancels_queued_probes():
+    """Test probes still queued when probing stops never run"""
+    agent = make_prober({"hung": 0.3, "queued": 0})
+    probe = agent._probe_rpc_endpoint
+    probed = []
+    agent._probe_rpc_endpoint = lambda url, timeout: probed.append(url) or probe(url, timeout)
+    executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        assert agent._probe_rpc_endpoints(executor, ["hung", "queued"], 0.1) is None
+    finally:
+        executor.shutdown(wait=True)
+    assert probed == ["hung"]
+
+@pytest.mark.asyncio
+async def test_run_follows_event_stream_while_active():
+    """Test the agent follows live events for its BlockvisionTool only while running"""
+    import asyncio
+    log = []
+
+    class Stream:
+        async def run(self):
+            log.append("started")
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                log.append("cancelled")
+                raise
+
+    async def stop(**kwargs):
+        await asyncio.sleep(0)
+        raise asyncio.CancelledError
+
+    agent = CapybaraAgent.__new__(CapybaraAgent)
+    agent.logger = logging.getLogger("test")
+    agent.tools = []
+    agent.event_stream = Stream()
+    agent._analyze_sui_metrics = stop
+    with patch("src.eliza.agents.capybara_agent.quota_ledger"):
+        with pytest.raises(asyncio.CancelledError):
+            await agent.run()
+    await asyncio.sleep(0)
+    assert log == ["started", "cancelled"]
+
+def test_rpc_activity_summary_matches_local_index_shape(tmp_path):
+    """Test the RPC fallback reports activity in the same shape as the local index"""
+    block = {
+        "digest": "d1",
+        "checkpoint": "7",
+        "timestampMs": "1700000000000",
+        "transaction": {"data": {"sender": "0xs"}},
+        "effects": {"status": {"status": "success"}},
+        "balanceChanges": [
+            {"owner": {"AddressOwner": "0xs"}, "coinType": SUI_COIN_TYPE, "amount": "-5"},
+            {"owner": {"AddressOwner": "0xr"}, "coinType": SUI_COIN_TYPE, "amount": "5"}
+        ]
+    }
+    tx = SuiTransaction.from_rpc(block)
+    summary = CapybaraAgent._summarize_transactions([tx])
+
+    index = TransactionIndex(str(tmp_path / "tx.sqlite3"), retention=10**12)
+    try:
+        index.add([tx])
+        assert summary["recent_transactions"] == index.recent_transactions()
+        assert summary["large_transfers"] == index.large_transfers(SUI_COIN_TYPE)
+        assert summary["top_senders"] == index.top_senders()
+        assert summary["active_accounts"] == index.active_accounts() == 1
+    finally:
+        index.close()
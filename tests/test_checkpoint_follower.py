@@ -0,0 +1,170 @@
+import asyncio
+import pytest
+from src.blockchain.checkpoint_follower import CheckpointFollower, VolumeStats, WhaleTracker
+from src.blockchain.decoding import SuiTransaction
+
+SUI = "0x2::sui::SUI"
+
+def make_block(digest, sequence, amount=10):
+    return {
+        "digest": digest,
+        "checkpoint": str(sequence),
+        "timestampMs": str(1_700_000_000_000 + sequence * 1000),
+        "transaction": {"data": {"sender": "0xa"}},
+        "effects": {"status": {"status": "success"}},
+        "balanceChanges": [
+            {"owner": {"AddressOwner": "0xa"}, "coinType": SUI, "amount": str(-amount)},
+            {"owner": {"AddressOwner": "0xb"}, "coinType": SUI, "amount": str(amount)}
+        ]
+    }
+
+class FakeChain:
+    """In-memory stand-in for the SuiTool RPC surface the follower uses"""
+
+    def __init__(self, tip, txs_per_checkpoint=2, fetch_delay=0.0):
+        self.tip = tip
+        self.txs_per_checkpoint = txs_per_checkpoint
+        self.fetch_delay = fetch_delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.fetched = []
+
+    def digests(self, sequence):
+        return [f"{sequence}-{i}" for i in range(self.txs_per_checkpoint)]
+
+    async def call(self, method, params):
+        if method == "sui_getLatestCheckpointSequenceNumber":
+            return str(self.tip)
+        assert method == "sui_getCheckpoints"
+        cursor, limit, _ = params
+        start = int(cursor) + 1
+        end = min(self.tip, start + limit - 1)
+        data = [
+            {"sequenceNumber": str(seq), "transactions": self.digests(seq)}
+            for seq in range(start, end + 1)
+        ]
+        return {"data": data, "nextCursor": str(end), "hasNextPage": end < self.tip}
+
+    async def batch_call(self, calls):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.fetch_delay)
+            results = []
+            for method, (digests, _) in calls:
+                assert method == "sui_multiGetTransactionBlocks"
+                self.fetched.extend(digests)
+                results.append([make_block(d, int(d.split("-")[0])) for d in digests])
+            return results
+        finally:
+            self.in_flight -= 1
+
+async def run_until(follower, checkpoint, timeout=2.0):
+    task = asyncio.ensure_future(follower.run())
+    try:
+        deadline = asyncio.get_running_loop().time() + timeout
+        while follower.cursor != checkpoint:
+            assert asyncio.get_running_loop().time() < deadline, f"stuck at {follower.cursor}"
+            await asyncio.sleep(0.01)
+    finally:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+def test_transaction_records_parse_rpc_blocks():
+    tx = SuiTransaction.from_rpc(make_block("abc", 7, amount=5))
+    assert tx.digest == "abc"
+    assert tx.checkpoint == 7
+    assert tx.sender == "0xa"
+    assert tx.status == "success"
+    assert [(c.owner, c.amount) for c in tx.balance_changes] == [("0xa", -5), ("0xb", 5)]
+
+@pytest.mark.asyncio
+async def test_follower_delivers_checkpoints_in_order_and_resumes(tmp_path):
+    cursor_path = str(tmp_path / "cursor.json")
+    chain = FakeChain(tip=100)
+    seen = []
+
+    async def consumer(sequence, transactions):
+        seen.append((sequence, [tx.digest for tx in transactions]))
+
+    follower = CheckpointFollower(chain, cursor_path=cursor_path, page_size=3, prefetch=2, poll_interval=0.01)
+    follower.subscribe(consumer)
+    # First run starts at the tip, then picks up new checkpoints
+    task = asyncio.ensure_future(follower.run())
+    await asyncio.sleep(0.05)
+    chain.tip = 105
+    await asyncio.sleep(0)
+    task.cancel()
+    await run_until(follower, 105)
+
+    assert [s for s, _ in seen] == [101, 102, 103, 104, 105]
+    assert seen[0][1] == ["101-0", "101-1"]
+
+    # A restarted follower continues from the saved cursor without replaying
+    chain.tip = 108
+    chain.fetched.clear()
+    restarted = CheckpointFollower(chain, cursor_path=cursor_path, page_size=3, prefetch=2, poll_interval=0.01)
+    restarted.subscribe(consumer)
+    assert restarted.cursor == 105
+    await run_until(restarted, 108)
+
+    assert [s for s, _ in seen][-3:] == [106, 107, 108]
+    assert min(int(d.split("-")[0]) for d in chain.fetched) == 106
+
+@pytest.mark.asyncio
+async def test_follower_retries_a_failed_tip_lookup(tmp_path):
+    chain = FakeChain(tip=50)
+    tip = chain.call
+    failures = []
+
+    async def flaky_call(method, params):
+        if method == "sui_getLatestCheckpointSequenceNumber" and len(failures) < 2:
+            failures.append(method)
+            raise ConnectionError("node unreachable")
+        return await tip(method, params)
+
+    chain.call = flaky_call
+    follower = CheckpointFollower(chain, cursor_path=str(tmp_path / "c.json"), poll_interval=0.01)
+    await run_until(follower, 50)
+    assert len(failures) == 2
+
+@pytest.mark.asyncio
+async def test_follower_prefetch_is_bounded(tmp_path):
+    chain = FakeChain(tip=0, fetch_delay=0.01)
+    follower = CheckpointFollower(chain, cursor_path=str(tmp_path / "c.json"),
+                                  page_size=50, prefetch=4, poll_interval=0.01)
+    follower.cursor = 0
+    chain.tip = 40
+
+    async def slow_consumer(sequence, transactions):
+        await asyncio.sleep(0.005)
+
+    follower.subscribe(slow_consumer)
+    await run_until(follower, 40, timeout=5.0)
+
+    # Fetches run ahead of the consumer, but never more than ``prefetch`` at once
+    assert 1 < chain.max_in_flight <= 4
+
+@pytest.mark.asyncio
+async def test_volume_stats_and_whale_tracker():
+    stats = VolumeStats(window=5)
+    whales = []
+
+    async def on_whale(tx, change):
+        whales.append((tx.digest, change.amount))
+
+    tracker = WhaleTracker({SUI: 100}, on_whale)
+    early = [SuiTransaction.from_rpc(make_block("a", 1, amount=50))]
+    late = [SuiTransaction.from_rpc(make_block("b", 10, amount=200))]
+
+    for batch in (early, late):
+        await stats(0, batch)
+        await tracker(0, batch)
+
+    # The first transfer fell out of the 5 second window
+    assert stats.volume(SUI) == 200
+    assert stats.top() == [(SUI, 200)]
+    assert whales == [("b", 200)]
@@ -0,0 +1,61 @@
+import pytest
+from src.blockchain.coin_registry import CoinRegistry
+from src.blockchain.decoding import RpcError, canonical_coin_type
+
+SUI = "0x0000000000000000000000000000000000000000000000000000000000000002::sui::SUI"
+USDC = "0xdba34672e30cb065b1f93e3ab55318768fd6fef66c15942c9f7cb846e2f900e7::usdc::USDC"
+METADATA = {
+    SUI: {"decimals": 9, "name": "Sui", "symbol": "SUI", "iconUrl": None},
+    USDC: {"decimals": 6, "name": "USDC", "symbol": "USDC", "iconUrl": "https://example.com/usdc.png"}
+}
+
+class FakeNode:
+    def __init__(self):
+        self.batches = []
+
+    async def batch_call(self, calls):
+        self.batches.append([params[0] for _, params in calls])
+        return [METADATA.get(params[0]) or RpcError(-32602, "not found") for _, params in calls]
+
+def test_canonical_coin_type():
+    assert canonical_coin_type("0x2::sui::SUI") == SUI
+    assert canonical_coin_type(" 2::sui::SUI ") == SUI
+    assert canonical_coin_type("0xDBA34672E30CB065B1F93E3AB55318768FD6FEF66C15942C9F7CB846E2F900E7::usdc::USDC") == USDC
+    for bad in ("SUI", "0x2::sui", "0xzz::m::T"):
+        with pytest.raises(ValueError):
+            canonical_coin_type(bad)
+
+@pytest.mark.asyncio
+async def test_lazy_batched_loading_and_lookup(tmp_path):
+    node = FakeNode()
+    registry = CoinRegistry(node, path=str(tmp_path / "coins.json"))
+    for i in range(1000):
+        registry.track(f"0x{i:x}::coin::C{i}")
+    registry.track("0x2::sui::SUI", aliases=["sui", "Sui Network"])
+    assert node.batches == []
+    assert registry.lookup("sui") is None
+
+    resolved = await registry.resolve(["sui", USDC, "0x1::missing::X"])
+    assert node.batches == [sorted(["0x" + "0" * 63 + "1::missing::X", SUI, USDC])]
+    assert resolved["sui"].decimals == 9
+    assert resolved[USDC].icon_url == "https://example.com/usdc.png"
+    assert "0x1::missing::X" not in resolved
+
+    # Known coins answer by type, alias or symbol without another call
+    assert registry.lookup("0x2::sui::SUI").symbol == "SUI"
+    assert registry.lookup("SUI Network").coin_type == SUI
+    assert registry.lookup("usdc").decimals == 6
+    assert (await registry.get("USDC")).coin_type == USDC
+    assert len(node.batches) == 1
+
+@pytest.mark.asyncio
+async def test_metadata_persists_across_restarts(tmp_path):
+    path = str(tmp_path / "data" / "coins.json")
+    await CoinRegistry(FakeNode(), path=path).resolve([SUI, USDC])
+
+    node = FakeNode()
+    restarted = CoinRegistry(node, path=path)
+    assert restarted.lookup("usdc").decimals == 6
+    assert (await restarted.get("0x2::sui::SUI")).name == "Sui"
+    assert node.batches == []
+    assert len(restarted) == 2
@@ -0,0 +1,49 @@
+import json
+import pytest
+from src.blockchain.decoding import (
+    FarmingPool,
+    TvlProject,
+    WhaleTransfer,
+    RpcError,
+    decode_list,
+    decode_rpc_response
+)
+
+def test_decode_list_keeps_only_read_fields():
+    raw = json.dumps({"pools": [
+        {"name": "SUI-USDC", "apr": "12.5", "tvl": 1000, "pool_id": "0x1", "rewards": [1, 2]},
+        {"name": "CETUS-SUI"}
+    ]}).encode()
+
+    pools = decode_list(raw, "pools", FarmingPool)
+
+    assert pools[0] == FarmingPool.from_dict({"name": "SUI-USDC", "apr": 12.5, "tvl": 1000})
+    assert pools[0].apr == 12.5
+    assert pools[1].tvl == 0.0
+    assert not hasattr(pools[0], "__dict__")
+    with pytest.raises(AttributeError):
+        pools[0].pool_id
+
+def test_blockvision_whale_transfers_use_index_field_names():
+    raw = json.dumps({"whale_movements": [
+        {"from": "0xa", "to": "0xb", "amount": "500000", "timestamp": "2024-03-27T12:00:00Z", "labels": ["cex"]}
+    ]})
+
+    (movement,) = decode_list(raw, "whale_movements", WhaleTransfer)
+
+    assert (movement.sender, movement.recipient, movement.amount) == ("0xa", "0xb", 500000.0)
+    assert movement.digest == ""
+    assert set(movement.to_dict()) == {"digest", "timestamp", "sender", "recipient", "coin_type", "amount"}
+    with pytest.raises(TypeError):
+        hash(movement)
+
+def test_decode_list_handles_missing_key():
+    assert decode_list(b'{"projects": null}', "projects", TvlProject) == []
+    assert decode_list(b"{}", "projects", TvlProject) == []
+
+def test_decode_rpc_response():
+    assert decode_rpc_response(b'{"jsonrpc": "2.0", "id": 1, "result": "42"}') == "42"
+    assert decode_rpc_response({"result": [1]}) == [1]
+    with pytest.raises(RpcError) as info:
+        decode_rpc_response(b'{"error": {"code": -32601, "message": "Method not found"}}')
+    assert info.value.code == -32601
@@ -0,0 +1,161 @@
+import asyncio
+import pytest
+from src.blockchain.decoding import SuiEvent
+from src.blockchain.event_stream import EventFilter, EventStream, WhaleSwaps, swap_input
+
+SWAP = "0xcetus::pool::SwapEvent"
+
+def make_event(seq, amount, sender="0xa", event_type=SWAP):
+    return {
+        "id": {"txDigest": f"tx{seq}", "eventSeq": "0"},
+        "type": event_type,
+        "sender": sender,
+        "timestampMs": str(1_700_000_000_000 + seq * 1000),
+        "parsedJson": {"amount_in": str(amount), "coin_type": {"name": "0x2::sui::SUI"}}
+    }
+
+class FakeEvents:
+    """In-memory stand-in for suix_queryEvents with cursor paging"""
+
+    def __init__(self, events=None):
+        self.events = list(events or [])
+        self.calls = []
+
+    def emit(self, *events):
+        self.events.extend(events)
+
+    async def call(self, method, params):
+        assert method == "suix_queryEvents"
+        self.calls.append(params)
+        query, cursor, limit, descending = params
+        matching = [e for e in self.events if e["type"] == query["MoveEventType"]]
+        if descending:
+            data = matching[::-1][:limit]
+            return {"data": data, "nextCursor": data[-1]["id"] if data else None, "hasNextPage": False}
+        ids = [e["id"] for e in matching]
+        start = ids.index(cursor) + 1 if cursor in ids else 0
+        data = matching[start:start + limit]
+        return {"data": data, "nextCursor": data[-1]["id"] if data else cursor,
+                "hasNextPage": start + limit < len(matching)}
+
+async def wait_for(predicate, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline
+        await asyncio.sleep(0.01)
+
+def test_event_record_extracts_amount_and_coin_type():
+    event = SuiEvent.from_rpc(make_event(3, 500))
+    assert event.amount == 500
+    assert event.coin_type == "0x2::sui::SUI"
+    assert event.timestamp == 1_700_000_003.0
+    assert event.cursor == {"txDigest": "tx3", "eventSeq": "0"}
+
+    generic = SuiEvent.from_rpc({"id": {"txDigest": "t", "eventSeq": "1"},
+                                 "type": "0x1::m::Deposit<0xabc::usdc::USDC>", "parsedJson": {}})
+    assert generic.coin_type == "0xabc::usdc::USDC"
+    assert generic.amount == 0
+
+def test_event_filter_criteria():
+    event = SuiEvent.from_rpc(make_event(1, 500, sender="0xwhale"))
+    assert EventFilter().matches(event)
+    assert EventFilter(min_amount=500, senders=["0xwhale"]).matches(event)
+    assert not EventFilter(min_amount=501).matches(event)
+    assert not EventFilter(event_types=["0xother::pool::SwapEvent"]).matches(event)
+    assert not EventFilter(coin_types=["0xabc::usdc::USDC"]).matches(event)
+
+@pytest.mark.asyncio
+async def test_stream_delivers_only_new_matching_events():
+    chain = FakeEvents([make_event(1, 10_000)])
+    stream = EventStream(chain, [{"MoveEventType": SWAP}], page_size=2, poll_interval=0.01)
+    whales, everything = [], []
+
+    async def on_whale(event):
+        whales.append(event.tx_digest)
+
+    async def on_any(event):
+        everything.append(event.tx_digest)
+
+    stream.subscribe(on_whale, EventFilter(min_amount=1_000))
+    stream.subscribe(on_any)
+    task = asyncio.ensure_future(stream.run())
+    try:
+        await wait_for(lambda: 0 in stream.cursors)
+        chain.emit(make_event(2, 50), make_event(3, 5_000), make_event(4, 20), make_event(5, 9_000))
+        await wait_for(lambda: len(everything) == 4)
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    # History before the stream started is not replayed
+    assert everything == ["tx2", "tx3", "tx4", "tx5"]
+    assert whales == ["tx3", "tx5"]
+    assert [e.tx_digest for e in stream.recent(2)] == ["tx5", "tx4"]
+    assert stream.cursors[0] == {"txDigest": "tx5", "eventSeq": "0"}
+
+@pytest.mark.asyncio
+async def test_subscriber_error_does_not_stop_stream():
+    chain = FakeEvents()
+    stream = EventStream(chain, [{"MoveEventType": SWAP}], poll_interval=0.01)
+    seen = []
+
+    async def broken(event):
+        raise ValueError("boom")
+
+    async def healthy(event):
+        seen.append(event.tx_digest)
+
+    stream.subscribe(broken)
+    stream.subscribe(healthy)
+    task = asyncio.ensure_future(stream.run())
+    try:
+        await wait_for(lambda: 0 in stream.cursors)
+        chain.emit(make_event(1, 1), make_event(2, 2))
+        await wait_for(lambda: len(seen) == 2)
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+    assert seen == ["tx1", "tx2"]
+
+USDC = "0xdba34672e30cb065b1f93e3ab55318768fd6fef66c15942c9f7cb846e2f900e7::usdc::USDC"
+
+class FakePools:
+    """ObjectFetcher stand-in returning pool objects by id"""
+
+    def __init__(self, types):
+        self.types = types
+        self.requests = []
+
+    async def get_objects(self, object_ids):
+        self.requests.extend(object_ids)
+        return [{"data": {"objectId": i, "type": self.types[i]}} for i in object_ids]
+
+def swap_event(seq, parsed):
+    return SuiEvent.from_rpc({"id": {"txDigest": f"tx{seq}", "eventSeq": "0"}, "type": SWAP, "parsedJson": parsed})
+
+def test_swap_input_reads_cetus_and_turbos_events():
+    assert swap_input({"pool": "0xp", "atob": False, "amount_in": "7", "amount_out": "9"}) == ("0xp", False, 7)
+    assert swap_input({"pool": "0xp", "a_to_b": False, "amount_a": "9", "amount_b": "7"}) == ("0xp", False, 7)
+    assert swap_input({"amount": "7"}) is None
+
+@pytest.mark.asyncio
+async def test_whale_swaps_use_the_input_coin_threshold():
+    pools = FakePools({
+        "0xcetus": f"0x1eab::pool::Pool<0x2::sui::SUI, {USDC}>",
+        "0xturbos": f"0x91bf::pool::Pool<0x2::sui::SUI, {USDC}, 0x91bf::fee3000bps::FEE3000BPS>"
+    })
+    seen = []
+
+    async def on_whale(event, coin_type, amount):
+        seen.append((event.tx_digest, coin_type.rsplit("::", 1)[-1], amount))
+
+    whales = WhaleSwaps(pools, {"0x2::sui::SUI": 100 * 10**9, USDC: 100 * 10**6}, on_whale)
+    # 100 USDC in (6 decimals) is a whale; the same raw amount of SUI is 0.1 SUI
+    await whales(swap_event(1, {"pool": "0xcetus", "atob": False, "amount_in": str(100 * 10**6)}))
+    await whales(swap_event(2, {"pool": "0xcetus", "atob": True, "amount_in": str(100 * 10**6)}))
+    await whales(swap_event(3, {"pool": "0xturbos", "a_to_b": True, "amount_a": str(100 * 10**9), "amount_b": "1"}))
+    await whales(swap_event(4, {"pool": "0xturbos", "a_to_b": False, "amount_a": str(10**12), "amount_b": "5"}))
+
+    assert seen == [("tx1", "USDC", 100 * 10**6), ("tx3", "SUI", 100 * 10**9)]
+    # Pool coin types are looked up once per pool
+    assert pools.requests == ["0xcetus", "0xturbos"]
@@ -0,0 +1,54 @@
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from src.utils.http_pool import ConnectionPoolManager
+
+@pytest_asyncio.fixture
+async def server():
+    async def handler(request):
+        return web.json_response({"ok": True})
+
+    app = web.Application()
+    app.router.add_get("/ping", handler)
+    server = TestServer(app)
+    await server.start_server()
+    yield server
+    await server.close()
+
+@pytest.mark.asyncio
+async def test_session_is_reused():
+    pool = ConnectionPoolManager()
+    first = await pool.get_session("test-reuse")
+    second = await pool.get_session("test-reuse")
+
+    assert first is second
+    await pool.close()
+    assert first.closed
+
+@pytest.mark.asyncio
+async def test_keepalive_counts_hits_and_misses(server):
+    pool = ConnectionPoolManager()
+    session = await pool.get_session("test-keepalive")
+
+    for _ in range(3):
+        async with session.get(server.make_url("/ping")) as response:
+            assert (await response.json())["ok"]
+
+    stats = pool.stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 2
+    assert stats["sessions"] == ["test-keepalive"]
+    await pool.close()
+
+@pytest.mark.asyncio
+async def test_closed_session_is_recreated():
+    pool = ConnectionPoolManager()
+    first = await pool.get_session("test-recreate")
+    await first.close()
+
+    second = await pool.get_session("test-recreate")
+
+    assert second is not first
+    assert not second.closed
+    await pool.close()
@@ -0,0 +1,98 @@
+import pytest
+from src.blockchain.decoding import RpcError
+from src.blockchain.object_cache import ObjectFetcher
+
+def make_object(object_id, version, owner=None, payload=""):
+    return {"data": {"objectId": object_id, "version": str(version),
+                     "owner": owner or {"AddressOwner": "0xa"},
+                     "content": {"fields": {"payload": payload}}}}
+
+class FakeNode:
+    """Records every multi-get call and serves objects at their current version"""
+
+    def __init__(self):
+        self.versions = {}
+        self.owners = {}
+        self.calls = []
+
+    async def batch_call(self, calls):
+        results = []
+        for method, (keys, options) in calls:
+            self.calls.append((method, list(keys)))
+            if method == "sui_multiGetObjects":
+                results.append([
+                    make_object(k, self.versions[k], self.owners.get(k)) if k in self.versions
+                    else {"error": {"code": "notExists", "object_id": k}}
+                    for k in keys
+                ])
+            elif method == "sui_tryMultiGetPastObjects":
+                results.append([
+                    {"status": "VersionFound", "details": make_object(k["objectId"], k["version"])["data"]}
+                    if int(k["version"]) <= self.versions.get(k["objectId"], -1)
+                    else {"status": "VersionNotFound", "details": [k["objectId"], k["version"]]}
+                    for k in keys
+                ])
+            else:
+                results.append(RpcError(-32601, "Method not found"))
+        return results
+
+@pytest.mark.asyncio
+async def test_misses_are_chunked_into_one_batch():
+    node = FakeNode()
+    node.versions = {f"0x{i}": 1 for i in range(7)}
+    fetcher = ObjectFetcher(node, batch_limit=3)
+
+    objects = await fetcher.get_objects([f"0x{i}" for i in range(7)] + ["0xmissing"])
+    assert [o.get("data", {}).get("objectId") for o in objects] == [f"0x{i}" for i in range(7)] + [None]
+    assert [len(keys) for _, keys in node.calls] == [3, 3, 2]
+
+@pytest.mark.asyncio
+async def test_latest_lookups_expire_but_versions_are_permanent():
+    node = FakeNode()
+    node.versions = {"0xpool": 1, "0xpkg": 1}
+    node.owners = {"0xpkg": "Immutable"}
+    fetcher = ObjectFetcher(node, latest_ttl=0)
+
+    await fetcher.get_objects(["0xpool", "0xpkg"])
+    node.versions["0xpool"] = 2
+    node.calls.clear()
+    [pool, package] = await fetcher.get_objects(["0xpool", "0xpkg"])
+    # The mutable object is re-read; the immutable one never is
+    assert node.calls == [("sui_multiGetObjects", ["0xpool"])]
+    assert pool["data"]["version"] == "2"
+    assert package["data"]["version"] == "1"
+
+    node.calls.clear()
+    past = await fetcher.get_past_objects([("0xpool", 1), ("0xpool", 2), ("0xpool", 3)])
+    assert [p.get("data", {}).get("version") for p in past] == ["1", "2", None]
+    assert node.calls == [("sui_tryMultiGetPastObjects", [{"objectId": "0xpool", "version": "3"}])]
+    assert fetcher.stats()["versions"] == 3
+
+@pytest.mark.asyncio
+async def test_memory_budget_evicts_least_recently_used():
+    node = FakeNode()
+    node.versions = {"0xa": 1, "0xb": 1, "0xc": 1}
+    fetcher = ObjectFetcher(node, latest_ttl=60)
+    await fetcher.get_objects(["0xa"])
+    fetcher.max_bytes = fetcher.size * 2
+
+    await fetcher.get_objects(["0xb"])
+    await fetcher.get_objects(["0xa"])  # refreshes 0xa
+    await fetcher.get_objects(["0xc"])
+    assert fetcher.size <= fetcher.max_bytes
+    assert set(ref[0] for ref in fetcher._versions) == {"0xa", "0xc"}
+
+    node.calls.clear()
+    await fetcher.get_objects(["0xa", "0xb"])
+    assert node.calls == [("sui_multiGetObjects", ["0xb"])]
+
+@pytest.mark.asyncio
+async def test_failed_batch_is_reported_per_object():
+    class Broken(FakeNode):
+        async def batch_call(self, calls):
+            return [RpcError(-32000, "overloaded") for _ in calls]
+
+    fetcher = ObjectFetcher(Broken())
+    objects = await fetcher.get_objects(["0x1", "0x2"])
+    assert [o["error"]["message"] for o in objects] == ["overloaded", "overloaded"]
+    assert fetcher.stats()["versions"] == 0
@@ -0,0 +1,92 @@
+import asyncio
+import pytest
+from src.blockchain.decoding import RpcError
+from src.blockchain.object_cache import ObjectFetcher
+from src.blockchain.pagination import dynamic_fields, flatten, paginate, query_events, with_objects
+
+class FakeTable:
+    """Dynamic-field table of ``size`` entries served in cursor pages"""
+
+    def __init__(self, size, delay=0.0, fail_at=None):
+        self.size = size
+        self.delay = delay
+        self.fail_at = fail_at
+        self.pages_served = 0
+        self.object_fetches = 0
+        self.fetches_in_flight = 0
+        self.max_fetches_in_flight = 0
+        self.params = []
+
+    async def call(self, method, params):
+        self.params.append((method, params))
+        await asyncio.sleep(self.delay)
+        if method == "suix_getDynamicFields":
+            _, cursor, limit = params
+        else:
+            _, cursor, limit, _ = params
+        start = 0 if cursor is None else int(cursor)
+        if start == self.fail_at:
+            raise RpcError(-32000, "node went away")
+        self.pages_served += 1
+        end = min(self.size, start + limit)
+        return {
+            "data": [{"name": {"type": "u64", "value": str(i)}, "objectId": f"0x{i}"} for i in range(start, end)],
+            "nextCursor": str(end) if end < self.size else None,
+            "hasNextPage": end < self.size
+        }
+
+    async def batch_call(self, calls):
+        self.object_fetches += 1
+        self.fetches_in_flight += 1
+        self.max_fetches_in_flight = max(self.max_fetches_in_flight, self.fetches_in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            return [[{"data": {"objectId": oid, "version": "1"}} for oid in ids] for _, (ids, _) in calls]
+        finally:
+            self.fetches_in_flight -= 1
+
+@pytest.mark.asyncio
+async def test_pages_stream_in_order():
+    table = FakeTable(23)
+    names = [item["name"]["value"] async for item in flatten(dynamic_fields(table, "0xtable", page_size=5))]
+    assert names == [str(i) for i in range(23)]
+    assert table.pages_served == 5
+
+@pytest.mark.asyncio
+async def test_early_stop_bounds_prefetch():
+    table = FakeTable(10_000)
+    items = flatten(dynamic_fields(table, "0xtable", page_size=10, prefetch=2))
+    try:
+        async for item in items:
+            if item["objectId"] == "0x14":
+                break
+    finally:
+        await items.aclose()
+    await asyncio.sleep(0.02)
+    # Two consumed pages plus at most the prefetch window and one page in hand
+    assert table.pages_served <= 2 + 2 + 1
+
+@pytest.mark.asyncio
+async def test_child_objects_fetched_concurrently_within_bound():
+    table = FakeTable(40)
+    fetcher = ObjectFetcher(table)
+    pairs = [pair async for pair in with_objects(dynamic_fields(table, "0xt", page_size=4), fetcher, concurrency=3)]
+    assert [field["objectId"] for field, _ in pairs] == [f"0x{i}" for i in range(40)]
+    assert all(field["objectId"] == obj["data"]["objectId"] for field, obj in pairs)
+    assert 1 < table.max_fetches_in_flight <= 3
+
+@pytest.mark.asyncio
+async def test_page_error_surfaces_after_earlier_pages():
+    table = FakeTable(30, fail_at=20)
+    seen = []
+    with pytest.raises(RpcError):
+        async for item in flatten(query_events(table, {"MoveEventType": "0x1::m::E"}, page_size=10)):
+            seen.append(item)
+    assert len(seen) == 20
+    assert table.params[0] == ("suix_queryEvents", [{"MoveEventType": "0x1::m::E"}, None, 10, False])
+
+@pytest.mark.asyncio
+async def test_custom_params_builder():
+    table = FakeTable(3)
+    pages = [page async for page in paginate(table, "suix_getDynamicFields", lambda c: ["0xp", c, 2])]
+    assert [len(page) for page in pages] == [2, 1]
@@ -0,0 +1,102 @@
+import math
+import numpy as np
+import pytest
+from src.blockchain.decoding import ClmmPool, normalize_type, type_params
+from src.blockchain.object_cache import ObjectFetcher
+from src.blockchain.pool_pricing import PoolPriceOracle, sqrt_prices_to_prices
+
+USDC = "0xdba34672e30cb065b1f93e3ab55318768fd6fef66c15942c9f7cb846e2f900e7::usdc::USDC"
+CETUS = "0x6864a6f921804860930db6ddbe2e16acdf8504495ea7481637a1c8b9a8fe54b::cetus::CETUS"
+CETUS_POOL = "0x1eabed72c53feb3805120a081dc15963c204dc8d091542592abaf7a35689b2fb::pool::Pool"
+TURBOS_POOL = "0x91bfbc386a41afcfd9b2533058d7e915a1d3829089cc268ff4333d54d6339ca1::pool::Pool"
+FEE = "0x91bfbc386a41afcfd9b2533058d7e915a1d3829089cc268ff4333d54d6339ca1::fee3000bps::FEE3000BPS"
+
+def sqrt_price(raw_price):
+    return int(math.sqrt(raw_price) * 2 ** 64)
+
+def pool_object(object_id, pool_type, fields):
+    return {"data": {"objectId": object_id, "version": "7", "type": pool_type,
+                     "content": {"dataType": "moveObject", "type": pool_type, "fields": fields}}}
+
+# SUI at $2: one raw USDC unit is worth 0.5 * 10**3 raw MIST
+OBJECTS = {
+    "0xsui": pool_object("0xsui", f"{CETUS_POOL}<{USDC}, 0x2::sui::SUI>",
+                         {"current_sqrt_price": str(sqrt_price(500)), "liquidity": "10"}),
+    # CETUS at 0.05 SUI, i.e. $0.10, in the deeper Turbos pool
+    "0xcetus_deep": pool_object("0xcetus_deep", f"{TURBOS_POOL}<{CETUS}, 0x2::sui::SUI, {FEE}>",
+                                {"sqrt_price": str(sqrt_price(0.05)), "liquidity": "1000"}),
+    "0xcetus_thin": pool_object("0xcetus_thin", f"{CETUS_POOL}<{CETUS}, 0x2::sui::SUI>",
+                                {"current_sqrt_price": str(sqrt_price(0.5)), "liquidity": "1"}),
+}
+
+class FakeRpc:
+    def __init__(self):
+        self.calls = []
+
+    async def batch_call(self, calls):
+        decimals = {normalize_type(USDC): 6, normalize_type(CETUS): 9, normalize_type("0x2::sui::SUI"): 9}
+        results = []
+        for method, params in calls:
+            self.calls.append((method, params[0]))
+            if method == "sui_multiGetObjects":
+                results.append([OBJECTS.get(pid, {"error": {"code": "notExists", "object_id": pid}})
+                                for pid in params[0]])
+            else:
+                assert method == "suix_getCoinMetadata"
+                results.append({"decimals": decimals[params[0]]})
+        return results
+
+def test_type_helpers_and_pool_record():
+    assert normalize_type("0x2::sui::SUI") == "0x" + "0" * 63 + "2::sui::SUI"
+    assert type_params(f"{TURBOS_POOL}<{CETUS}, 0x2::sui::SUI, {FEE}>") == [CETUS, "0x2::sui::SUI", FEE]
+    assert type_params("0x1::a::B<0x1::c::D<0x2::e::F, 0x3::g::H>, 0x4::i::J>") == [
+        "0x1::c::D<0x2::e::F, 0x3::g::H>", "0x4::i::J"
+    ]
+    pool = ClmmPool.from_rpc(OBJECTS["0xcetus_deep"])
+    assert pool.coin_a == normalize_type(CETUS) and pool.coin_b == normalize_type("0x2::sui::SUI")
+    assert pool.liquidity == 1000
+    with pytest.raises(ValueError):
+        ClmmPool.from_rpc({"error": {"code": "notExists"}})
+
+def test_sqrt_price_conversion_is_vectorized():
+    prices = sqrt_prices_to_prices([sqrt_price(500), sqrt_price(0.05)], [6, 9], [9, 9])
+    assert isinstance(prices, np.ndarray)
+    assert prices == pytest.approx([0.5, 0.05])
+
+@pytest.mark.asyncio
+async def test_prices_from_pools_with_cached_pool_ids():
+    rpc = FakeRpc()
+    oracle = PoolPriceOracle(rpc, pools={"sui": ["0xsui"], "cetus": ["0xcetus_deep", "0xcetus_thin", "0xgone"]},
+                             stablecoins=[USDC], objects=ObjectFetcher(rpc, latest_ttl=0))
+
+    prices = await oracle.prices(["cetus", "SUI"])
+    assert prices == pytest.approx({"cetus": 0.1, "sui": 2.0})
+    assert [c[0] for c in rpc.calls] == ["sui_multiGetObjects"] + ["suix_getCoinMetadata"] * 3
+
+    rpc.calls.clear()
+    assert await oracle.prices(["cetus"]) == pytest.approx({"cetus": 0.1})
+    # One round-trip, and the missing pool is no longer requested
+    assert rpc.calls == [("sui_multiGetObjects", ["0xsui", "0xcetus_deep", "0xcetus_thin"])]
+
+@pytest.mark.asyncio
+async def test_sui_priced_from_a_turbos_pool():
+    # Turbos Pool<SUI, USDC, Fee>: SUI is coin A and the price is read from sqrt_price
+    OBJECTS["0xturbos_sui"] = pool_object(
+        "0xturbos_sui", f"{TURBOS_POOL}<0x2::sui::SUI, {USDC}, {FEE}>",
+        {"sqrt_price": str(sqrt_price(2.1 / 10**3)), "liquidity": "500", "fee": "3000", "tick_spacing": 60}
+    )
+    try:
+        pool = ClmmPool.from_rpc(OBJECTS["0xturbos_sui"])
+        assert (pool.coin_a, pool.coin_b) == (normalize_type("0x2::sui::SUI"), normalize_type(USDC))
+        assert pool.liquidity == 500
+
+        oracle = PoolPriceOracle(FakeRpc(), pools={"sui": ["0xsui", "0xturbos_sui"]}, stablecoins=[USDC])
+        # The deeper Turbos pool wins over the thin Cetus one
+        assert await oracle.prices(["sui"]) == pytest.approx({"sui": 2.1})
+    finally:
+        del OBJECTS["0xturbos_sui"]
+
+@pytest.mark.asyncio
+async def test_unknown_token_has_no_price():
+    oracle = PoolPriceOracle(FakeRpc(), pools={"sui": ["0xsui"]}, stablecoins=[USDC])
+    assert await oracle.prices(["navi"]) == {}
@@ -0,0 +1,81 @@
+import pytest
+from src.blockchain.price_alerts import PriceAlertEngine
+
+@pytest.mark.asyncio
+async def test_above_and_below_alerts_fire_when_crossed():
+    engine = PriceAlertEngine()
+    engine.add_alert("0xsui", 2.0, is_above=True)
+    engine.add_alert("0xsui", 3.0, is_above=True)
+    engine.add_alert("0xsui", 1.0, is_above=False)
+    engine.add_alert("0xsui", 0.5, is_above=False)
+
+    fired = await engine.on_price("0xsui", 2.5)
+    assert [a.target for a in fired] == [2.0]
+
+    fired = await engine.on_price("0xsui", 0.9)
+    assert [a.target for a in fired] == [1.0]
+
+    fired = await engine.on_price("0xsui", 10.0)
+    assert [a.target for a in fired] == [3.0]
+    assert len(engine) == 1
+
+@pytest.mark.asyncio
+async def test_alerts_are_one_shot_and_callbacks_run():
+    engine = PriceAlertEngine()
+    seen = []
+
+    async def subscriber(alert, price):
+        seen.append(("sub", alert.alert_id, price))
+
+    async def own(alert, price):
+        seen.append(("own", alert.alert_id, price))
+
+    async def broken(alert, price):
+        raise RuntimeError("callback failed")
+
+    engine.subscribe(subscriber)
+    engine.subscribe(broken)
+    alert = engine.add_alert("0xsui", 1.5, callback=own)
+
+    assert await engine.on_price("0xsui", 1.6)
+    assert await engine.on_price("0xsui", 1.7) == []
+    assert sorted(seen) == [("own", alert.alert_id, 1.6), ("sub", alert.alert_id, 1.6)]
+
+@pytest.mark.asyncio
+async def test_removed_alert_does_not_fire():
+    engine = PriceAlertEngine()
+    keep = engine.add_alert("0xsui", 1.0)
+    drop = engine.add_alert("0xsui", 1.0)
+
+    assert engine.remove_alert(drop.alert_id)
+    assert not engine.remove_alert(drop.alert_id)
+
+    fired = await engine.on_price("0xsui", 1.0)
+    assert [a.alert_id for a in fired] == [keep.alert_id]
+
+@pytest.mark.asyncio
+async def test_alerts_compare_against_the_price_level():
+    engine = PriceAlertEngine()
+    assert await engine.on_price("0xsui", 5.0) == []
+    # Registered while the price is already above: fires on the next tick
+    late = engine.add_alert("0xsui", 2.0, is_above=True)
+    engine.add_alert("0xsui", 4.0, is_above=True)
+    engine.add_alert("0xsui", 6.0, is_above=True)
+    assert [a.target for a in engine.alerts_for("0xsui")] == [2.0, 4.0, 6.0]
+
+    fired = await engine.on_price("0xsui", 5.0)
+    assert [a.target for a in fired] == [2.0, 4.0]
+    assert fired[0] is late
+    assert [a.target for a in engine.alerts_for("0xsui")] == [6.0]
+
+@pytest.mark.asyncio
+async def test_many_alerts_only_crossed_ones_fire():
+    engine = PriceAlertEngine()
+    for i in range(10000):
+        engine.add_alert("0xsui", 1.0 + i / 1000, is_above=True)
+
+    fired = await engine.on_price("0xsui", 1.0105)
+
+    assert len(fired) == 11
+    assert len(engine) == 10000 - 11
+    assert await engine.on_price("0xother", 5.0) == []
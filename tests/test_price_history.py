@@ -0,0 +1,72 @@
+import os
+import time
+import pytest
+from src.blockchain.price_history import PriceHistoryStore, parse_timestamp
+
+TOKEN = "0x2::sui::SUI"
+
+def test_append_only_grows_at_the_tail(tmp_path):
+    store = PriceHistoryStore(str(tmp_path))
+    assert store.append(TOKEN, [(100, 1.0), (200, 1.1)], covered_from=100) == 2
+    assert store.append(TOKEN, [(150, 9.9), (200, 9.9), (300, 1.2)]) == 1
+
+    ts, prices = store.range(TOKEN, 0)
+    assert ts.tolist() == [100, 200, 300]
+    assert prices.tolist() == [1.0, 1.1, 1.2]
+
+def test_range_queries_are_views(tmp_path):
+    store = PriceHistoryStore(str(tmp_path))
+    store.append(TOKEN, [(t, float(t)) for t in range(0, 1000, 10)], covered_from=0)
+
+    ts, prices = store.range(TOKEN, 95, 205)
+
+    assert ts.tolist() == list(range(100, 210, 10))
+    assert not ts.flags.owndata and not prices.flags.owndata
+    assert store.price_at(TOKEN, 105) == 100.0
+    assert store.price_at(TOKEN, -1) is None
+
+def test_reload_after_restart(tmp_path):
+    PriceHistoryStore(str(tmp_path)).append(TOKEN, [(10, 2.0), (20, 3.0)], covered_from=10)
+
+    reopened = PriceHistoryStore(str(tmp_path))
+
+    assert reopened.last_timestamp(TOKEN) == 20
+    assert reopened.covers(TOKEN, 10)
+    assert not reopened.covers(TOKEN, 5)
+
+def test_wider_window_is_merged(tmp_path):
+    store = PriceHistoryStore(str(tmp_path))
+    store.append(TOKEN, [(50, 1.0), (60, 1.0)], covered_from=50)
+    store.append(TOKEN, [(10, 0.5), (50, 7.0), (60, 7.0), (70, 1.5)], covered_from=10)
+
+    ts, prices = store.range(TOKEN, 0)
+    assert ts.tolist() == [10, 50, 60, 70]
+    assert prices.tolist() == [0.5, 1.0, 1.0, 1.5]
+
+def test_rebuild_leaves_existing_views_intact(tmp_path):
+    store = PriceHistoryStore(str(tmp_path))
+    store.append(TOKEN, [(t, float(t)) for t in range(50, 1050, 10)], covered_from=50)
+    ts, prices = store.range(TOKEN, 0)
+
+    store.append(TOKEN, [(10, 0.5)], covered_from=10)
+
+    # The old mapping still reads the replaced file's contents
+    assert ts.tolist() == list(range(50, 1050, 10))
+    assert prices[-1] == 1040.0
+    assert store.range(TOKEN, 0)[0][:2].tolist() == [10, 50]
+    assert not any(name.endswith(".tmp") for name in os.listdir(tmp_path))
+
+def test_local_price_change(tmp_path):
+    store = PriceHistoryStore(str(tmp_path))
+    now = time.time()
+    store.append(TOKEN, [(now - 7200, 1.0), (now - 60, 1.5)], covered_from=now - 7200)
+
+    change = store.price_change(TOKEN, hours=1, max_lag=900, now=now)
+    assert change == {"price_change_percent": pytest.approx(50.0), "current_price": 1.5}
+    assert store.price_change(TOKEN, hours=24, max_lag=900, now=now) is None
+    assert store.price_change(TOKEN, hours=1, max_lag=10, now=now) is None
+
+def test_parse_timestamp():
+    assert parse_timestamp(1700000000) == 1700000000
+    assert parse_timestamp(1700000000000) == 1700000000
+    assert parse_timestamp("2024-03-27T12:00:00Z") == 1711540800
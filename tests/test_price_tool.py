@@ -0,0 +1,68 @@
+import asyncio
+import pytest
+from src.eliza.tools.price_tool import PriceTool
+from src.eliza.tools.sui_tool import SuiTool
+from src.utils.metrics import registry
+
+def fake_source(log, name, delay, price=None):
+    async def fetch(client, token_info):
+        log.append(("start", name))
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            log.append(("cancelled", name))
+            raise
+        if price is None:
+            return {"status": "error", "message": f"{name} down"}
+        return {"status": "success", "price": price, "change": 0, "mcap": 0}
+    return fetch
+
+def price_tool(log, coingecko, binance, sui, hedged=True):
+    tool = PriceTool()
+    tool.hedged = hedged
+    tool.hedge_delay = 0.02
+    tool._fetch_coingecko_data = fake_source(log, "coingecko", *coingecko)
+    tool._fetch_binance_data = fake_source(log, "binance", *binance)
+    tool._fetch_sui_data = fake_source(log, "sui", *sui)
+    return tool
+
+def test_on_chain_prices_share_the_given_sui_tool():
+    sui = SuiTool("http://localhost:9000")
+    tool = PriceTool(sui)
+    assert tool.pool_prices.objects is sui.objects
+    assert tool.coins.rpc is sui and tool.pool_prices.rpc is sui
+
+@pytest.mark.asyncio
+async def test_slow_primary_is_hedged_and_cancelled():
+    log = []
+    tool = price_tool(log, coingecko=(1.0, 1.5), binance=(0.01, 1.4), sui=(1.0, 1.3))
+    latency = registry.get("price_source_latency_seconds")
+    before = latency.count(source="binance", outcome="success")
+    cancelled = latency.count(source="coingecko", outcome="cancelled")
+
+    result = await tool._execute("get_price", token="sui")
+    assert result["price"] == 1.4
+    # Losers have finished unwinding by the time the lookup returns
+    assert log == [("start", "coingecko"), ("start", "binance"), ("cancelled", "coingecko")]
+    assert latency.count(source="binance", outcome="success") == before + 1
+    assert latency.count(source="coingecko", outcome="cancelled") == cancelled + 1
+
+@pytest.mark.asyncio
+async def test_failure_starts_next_source_without_waiting():
+    log = []
+    tool = price_tool(log, coingecko=(0, None), binance=(0, None), sui=(0, 1.3))
+    tool.hedge_delay = 10
+    result = await asyncio.wait_for(tool._execute("get_price", token="sui"), timeout=1)
+    assert result["price"] == 1.3
+    assert [name for event, name in log if event == "start"] == ["coingecko", "binance", "sui"]
+
+@pytest.mark.asyncio
+async def test_sequential_mode_and_total_failure():
+    log = []
+    tool = price_tool(log, coingecko=(0.05, 1.5), binance=(0, 1.4), sui=(0, 1.3), hedged=False)
+    assert (await tool._execute("get_price", token="sui"))["price"] == 1.5
+    assert log == [("start", "coingecko")]
+
+    tool = price_tool([], coingecko=(0, None), binance=(0.03, None), sui=(0, None))
+    result = await tool._execute("get_price", token="sui")
+    assert result["status"] == "error"
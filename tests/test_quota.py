@@ -0,0 +1,92 @@
+import pytest
+from datetime import datetime, timezone
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from src.utils.http_pool import ConnectionPoolManager
+from src.utils.metrics import registry
+from src.utils.quota import QuotaLedger
+
+BUDGETS = {"blockvision": {"base_url": "https://api.blockvision.org/v1", "daily": 100, "monthly": 1000}}
+
+class Clock:
+    def __init__(self, when):
+        self.now = when.timestamp()
+
+    def __call__(self):
+        return self.now
+
+def noon(day=15):
+    return datetime(2026, 6, day, 12, 0, tzinfo=timezone.utc)
+
+def test_counts_stretch_polling_when_overspending():
+    clock = Clock(noon())
+    ledger = QuotaLedger(BUDGETS, path=None, max_stretch=8, clock=clock)
+    for _ in range(50):
+        ledger.observe("https://api.blockvision.org/v1/market/overview")
+    ledger.observe("https://api.suivision.io/v1/coins/price")  # not metered here
+
+    assert ledger.remaining("blockvision") == {"daily": 50.0, "monthly": 950.0}
+    # Half the day's budget gone by noon is on pace
+    assert ledger.stretch(1800, "blockvision") == 1800
+    for _ in range(25):
+        ledger.record("blockvision")
+    # A quarter of the budget left for half the day: poll half as often
+    assert ledger.stretch(1800, "blockvision") == pytest.approx(3600)
+    assert registry.get("api_quota_remaining").value(upstream="blockvision", window="daily") == 25
+
+    for _ in range(25):
+        ledger.record("blockvision")
+    assert ledger.stretch(1800, "blockvision") == 1800 * 8
+
+    # A new day starts a new daily window; the month keeps counting
+    clock.now = noon(16).timestamp()
+    assert ledger.remaining("blockvision") == {"daily": 100.0, "monthly": 900.0}
+
+def test_reported_quota_headers():
+    clock = Clock(noon())
+    ledger = QuotaLedger({"blockvision": dict(BUDGETS["blockvision"], daily=0, monthly=0)},
+                         path=None, low_water=0.2, clock=clock)
+    ledger.record("blockvision", {"X-RateLimit-Limit": "1000", "X-RateLimit-Remaining": "500",
+                                  "X-RateLimit-Reset": "3600"})
+    assert ledger.remaining("blockvision") == {"reported": 500.0}
+    assert ledger.stretch_factor("blockvision") == 1.0
+
+    ledger.record("blockvision", {"RateLimit-Limit": "1000", "RateLimit-Remaining": "50"})
+    assert ledger.stretch_factor("blockvision") == pytest.approx(4.0)
+
+    ledger.record("blockvision", {"X-RateLimit-Limit": "1000", "X-RateLimit-Remaining": "0",
+                                  "X-RateLimit-Reset": str(clock.now + 60)})
+    clock.now += 120
+    # Past the reported reset the provider figure no longer applies
+    assert ledger.remaining("blockvision") == {}
+
+def test_counts_persist_across_restarts(tmp_path):
+    path = str(tmp_path / "quota.json")
+    clock = Clock(noon())
+    ledger = QuotaLedger(BUDGETS, path=path, save_interval=3600, clock=clock)
+    for _ in range(10):
+        ledger.record("blockvision")
+    ledger.flush()
+
+    restarted = QuotaLedger(BUDGETS, path=path, clock=clock)
+    assert restarted.remaining("blockvision")["daily"] == 90
+
+@pytest.mark.asyncio
+async def test_pooled_sessions_feed_the_ledger():
+    async def handler(request):
+        return web.json_response({}, headers={"X-RateLimit-Limit": "100", "X-RateLimit-Remaining": "7"})
+
+    app = web.Application()
+    app.router.add_get("/v1/market/overview", handler)
+    server = TestServer(app)
+    await server.start_server()
+    ledger = QuotaLedger({"blockvision": {"base_url": str(server.make_url("/v1")), "daily": 10}}, path=None)
+    pool = ConnectionPoolManager(quota=ledger)
+    session = await pool.get_session("test-quota")
+    for _ in range(3):
+        async with session.get(server.make_url("/v1/market/overview")) as response:
+            await response.json()
+    await pool.close()
+    await server.close()
+
+    assert ledger.remaining("blockvision") == {"daily": 7.0, "reported": 7.0}
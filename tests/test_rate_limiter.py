@@ -0,0 +1,108 @@
+import asyncio
+import time
+import pytest
+from src.utils.rate_limiter import (
+    RateLimitedClient,
+    RateLimiterRegistry,
+    TokenBucket,
+    UNLIMITED,
+    parse_rate
+)
+
+def test_parse_rate_windows():
+    assert parse_rate({"requests_per_minute": 120, "burst_size": 5}) == 2.0
+    assert parse_rate({"requests_per_3min": 300}) == pytest.approx(300 / 180)
+    assert parse_rate({"requests_per_second": 4}) == 4.0
+    assert parse_rate({"burst_size": 5}) is None
+
+def test_registry_loads_security_config(tmp_path):
+    path = tmp_path / "security.yml"
+    path.write_text(
+        "rate_limits:\n"
+        "  sui_rpc:\n"
+        "    requests_per_minute: 600\n"
+        "    burst_size: 50\n"
+    )
+    limiters = RateLimiterRegistry.from_config(str(path))
+
+    bucket = limiters.bucket("sui_rpc")
+    assert bucket.rate == 10.0
+    assert bucket.capacity == 50.0
+    assert limiters.bucket("unknown_api") is UNLIMITED
+
+def test_missing_config_means_unlimited(tmp_path):
+    limiters = RateLimiterRegistry.from_config(str(tmp_path / "missing.yml"))
+    assert limiters.bucket("sui_rpc") is UNLIMITED
+
+@pytest.mark.asyncio
+async def test_bucket_allows_burst_then_queues_in_order():
+    bucket = TokenBucket("test_fifo", rate=50.0, capacity=2)
+    order = []
+
+    async def request(i):
+        await bucket.acquire()
+        order.append(i)
+
+    start = time.monotonic()
+    await asyncio.gather(*(request(i) for i in range(5)))
+    elapsed = time.monotonic() - start
+
+    assert order == [0, 1, 2, 3, 4]
+    # Two burst tokens, then three more at 50/s
+    assert elapsed >= 0.05
+    stats = bucket.stats()
+    assert stats["requests"] == 5
+    assert stats["throttled"] == 3
+    assert stats["total_wait_seconds"] > 0
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_returns_its_slot():
+    bucket = TokenBucket("test_cancel", rate=10.0, capacity=1)
+    await bucket.acquire()
+    waiter = asyncio.ensure_future(bucket.acquire())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert bucket.tokens > -0.5
+
+def test_rate_limited_client_takes_a_token_per_call():
+    class Client:
+        version = "2"
+
+        def get_user(self, username):
+            return username
+
+    bucket = TokenBucket("test_proxy", rate=1000.0, capacity=10)
+    client = RateLimitedClient(Client(), bucket)
+
+    assert client.get_user("SuiNetwork") == "SuiNetwork"
+    assert client.version == "2"
+    assert bucket.stats()["requests"] == 1
+
+@pytest.mark.asyncio
+async def test_rate_limited_client_never_sleeps_on_the_loop():
+    class Client:
+        def get_user(self, username):
+            return username
+
+    bucket = TokenBucket("test_proxy_loop", rate=20.0, capacity=1)
+    client = RateLimitedClient(Client(), bucket)
+    with pytest.raises(RuntimeError):
+        client.get_user("SuiNetwork")
+
+    # On a worker thread the throttled calls wait without stalling the loop
+    loop = asyncio.get_running_loop()
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    task = asyncio.ensure_future(ticker())
+    results = [await loop.run_in_executor(None, client.get_user, f"u{i}") for i in range(3)]
+    task.cancel()
+    assert results == ["u0", "u1", "u2"]
+    assert ticks >= 5
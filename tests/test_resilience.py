@@ -0,0 +1,83 @@
+import asyncio
+import pytest
+from src.utils.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    ResilienceRegistry,
+    RetryBudget,
+    is_retryable
+)
+
+class UpstreamError(Exception):
+    def __init__(self, status):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+
+def flaky(failures, status=503):
+    calls = {"count": 0}
+
+    async def fn():
+        calls["count"] += 1
+        if calls["count"] <= failures:
+            raise UpstreamError(status)
+        return "ok"
+    return fn, calls
+
+def test_is_retryable():
+    assert is_retryable(UpstreamError(503))
+    assert is_retryable(UpstreamError(429))
+    assert is_retryable(asyncio.TimeoutError())
+    assert not is_retryable(UpstreamError(404))
+    assert not is_retryable(ValueError("bad payload"))
+    assert not is_retryable(CircuitOpenError("sui", 1.0))
+
+@pytest.mark.asyncio
+async def test_call_retries_transient_failures():
+    policy = ResilienceRegistry(max_retries=3, base_delay=0.001)
+    fn, calls = flaky(2)
+
+    assert await policy.call("sui", "/coins/price", fn) == "ok"
+    assert calls["count"] == 3
+    assert policy.breaker("sui").state == CircuitBreaker.CLOSED
+
+@pytest.mark.asyncio
+async def test_call_does_not_retry_client_errors():
+    policy = ResilienceRegistry(max_retries=3, base_delay=0.001)
+    fn, calls = flaky(5, status=404)
+
+    with pytest.raises(UpstreamError):
+        await policy.call("sui", "/coins/price", fn)
+    assert calls["count"] == 1
+    assert policy.breaker("sui").failures == 0
+
+@pytest.mark.asyncio
+async def test_breaker_opens_and_recovers_through_probe():
+    policy = ResilienceRegistry(max_retries=0, base_delay=0.001)
+    breaker = policy.breaker("sui")
+    breaker.failure_threshold = 2
+    breaker.recovery_timeout = 0.05
+    fn, calls = flaky(2)
+
+    for _ in range(2):
+        with pytest.raises(UpstreamError):
+            await policy.call("sui", "/defi/tvl", fn)
+    assert breaker.state == CircuitBreaker.OPEN
+
+    with pytest.raises(CircuitOpenError):
+        await policy.call("sui", "/defi/tvl", fn)
+    assert calls["count"] == 2
+
+    await asyncio.sleep(0.06)
+    assert await policy.call("sui", "/defi/tvl", fn) == "ok"
+    assert breaker.state == CircuitBreaker.CLOSED
+
+@pytest.mark.asyncio
+async def test_retry_budget_caps_retries():
+    policy = ResilienceRegistry(max_retries=5, base_delay=0.001)
+    policy._budgets[("sui", "/defi/tvl")] = RetryBudget(ratio=0.0, min_per_second=0.0, max_tokens=1.0)
+    fn, calls = flaky(10)
+
+    with pytest.raises(UpstreamError):
+        await policy.call("sui", "/defi/tvl", fn)
+    # One budgeted retry, then the original error surfaces
+    assert calls["count"] == 2
@@ -0,0 +1,139 @@
+import asyncio
+import os
+import pytest
+import pytest_asyncio
+import aiohttp
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from src.utils.response_cache import ResponseCache, CacheEntry
+
+@pytest_asyncio.fixture
+async def etag_server():
+    state = {"calls": 0, "conditional": 0, "version": 1}
+
+    async def handler(request):
+        state["calls"] += 1
+        etag = f'"v{state["version"]}"'
+        if request.headers.get("If-None-Match") == etag:
+            state["conditional"] += 1
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.json_response({"tvl": state["version"]}, headers={"ETag": etag})
+
+    async def broken(request):
+        return web.json_response({}, status=503)
+
+    app = web.Application()
+    app.router.add_get("/defi/tvl", handler)
+    app.router.add_get("/broken", broken)
+    server = TestServer(app)
+    await server.start_server()
+    async with aiohttp.ClientSession() as session:
+        yield server, session, state
+    await server.close()
+
+@pytest.mark.asyncio
+async def test_fresh_entry_is_served_from_cache(etag_server):
+    server, session, state = etag_server
+    cache = ResponseCache(name="test-fresh", default_ttl=60)
+    url = str(server.make_url("/defi/tvl"))
+
+    assert await cache.get_json(session, url) == {"tvl": 1}
+    assert await cache.get_json(session, url) == {"tvl": 1}
+
+    assert state["calls"] == 1
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+@pytest.mark.asyncio
+async def test_params_are_part_of_the_key(etag_server):
+    server, session, state = etag_server
+    cache = ResponseCache(name="test-params", default_ttl=60)
+    url = str(server.make_url("/defi/tvl"))
+
+    await cache.get_json(session, url, params={"days": 1})
+    await cache.get_json(session, url, params={"days": 7})
+
+    assert state["calls"] == 2
+
+@pytest.mark.asyncio
+async def test_stale_entry_is_served_while_revalidating(etag_server):
+    server, session, state = etag_server
+    cache = ResponseCache(name="test-swr", ttls={"/defi/tvl": 0}, max_stale=60)
+    url = str(server.make_url("/defi/tvl"))
+
+    await cache.get_json(session, url, endpoint="/defi/tvl")
+    state["version"] = 2
+    stale = await cache.get_json(session, url, endpoint="/defi/tvl")
+    assert stale == {"tvl": 1}
+
+    await asyncio.gather(*cache._refreshing.values())
+    assert cache.stats()["updated"] == 1
+    key = cache.make_key("GET", url)
+    assert cache._entries[key].body == {"tvl": 2}
+
+@pytest.mark.asyncio
+async def test_not_modified_reuses_cached_body(etag_server):
+    server, session, state = etag_server
+    cache = ResponseCache(name="test-304", default_ttl=0, max_stale=0)
+    url = str(server.make_url("/defi/tvl"))
+
+    first = await cache.get_json(session, url)
+    second = await cache.get_json(session, url)
+
+    assert second == first
+    assert state["conditional"] == 1
+    assert cache.stats()["revalidated"] == 1
+
+@pytest.mark.asyncio
+async def test_error_on_miss_raises(etag_server):
+    server, session, state = etag_server
+    cache = ResponseCache(name="test-error")
+
+    with pytest.raises(aiohttp.ClientResponseError):
+        await cache.get_json(session, str(server.make_url("/broken")))
+
+def test_lru_bound():
+    cache = ResponseCache(name="test-lru", max_entries=2)
+    for i in range(3):
+        cache._store(cache.make_key("GET", f"/u{i}"), CacheEntry(i, None, None, 60))
+
+    assert [k[1] for k in cache._entries] == ["/u1", "/u2"]
+
+@pytest.mark.asyncio
+async def test_entries_survive_a_restart(etag_server, tmp_path):
+    server, session, state = etag_server
+    path = str(tmp_path / "cache" / "responses.json.gz")
+    url = str(server.make_url("/defi/tvl"))
+    cache = ResponseCache(name="test-persist", ttls={"/defi/tvl": 60}, path=path)
+    await cache.get_json(session, url, params={"days": 7}, endpoint="/defi/tvl")
+    cache._store(cache.make_key("GET", "/expired"), CacheEntry("old", None, None, 0))
+    assert state["calls"] == 1
+    # Requests only mark the cache dirty; the file is written on flush
+    assert not os.path.exists(path)
+    cache.flush()
+
+    restarted = ResponseCache(name="test-persist-2", ttls={"/defi/tvl": 60}, max_stale=0, path=path)
+    assert not restarted._entries
+    assert await restarted.get_json(session, url, params={"days": 7}, endpoint="/defi/tvl") == {"tvl": 1}
+    assert state["calls"] == 1
+    assert restarted._entries[restarted.make_key("GET", url, {"days": 7})].etag == '"v1"'
+    assert restarted.make_key("GET", "/expired") not in restarted._entries
+
+def test_unreadable_cache_file_is_ignored(tmp_path):
+    path = tmp_path / "responses.json.gz"
+    path.write_bytes(b"not gzip")
+    assert ResponseCache(name="test-corrupt", path=str(path)).stats()["entries"] == 0
+
+@pytest.mark.asyncio
+async def test_changes_are_saved_in_the_background(etag_server, tmp_path):
+    server, session, state = etag_server
+    path = str(tmp_path / "responses.json.gz")
+    cache = ResponseCache(name="test-save-timer", path=path, save_interval=0.01)
+    for days in range(3):
+        await cache.get_json(session, str(server.make_url("/defi/tvl")), params={"days": days})
+    assert not os.path.exists(path)
+
+    await asyncio.sleep(0.05)
+    await cache._save_task
+    assert ResponseCache(name="test-save-timer-2", path=path).stats()["entries"] == 3
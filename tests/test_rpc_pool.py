@@ -0,0 +1,170 @@
+import asyncio
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from src.blockchain.decoding import RpcError
+from src.blockchain.rpc_pool import RpcEndpointPool
+from src.utils.http_pool import ConnectionPoolManager
+
+class NodeDown(Exception):
+    status = 503
+
+def node(latency=0.0, fail=False):
+    async def call():
+        await asyncio.sleep(latency)
+        if fail:
+            raise NodeDown("unavailable")
+        return "ok"
+    return call
+
+def routed(nodes, calls=None):
+    async def fn(url):
+        if calls is not None:
+            calls.append(url)
+        return await nodes[url]()
+    return fn
+
+@pytest.mark.asyncio
+async def test_routes_to_fastest_node():
+    pool = RpcEndpointPool(["slow", "fast"], recheck_interval=60)
+    nodes = {"slow": node(0.03), "fast": node(0.0)}
+    calls = []
+
+    for _ in range(5):
+        await pool.call(routed(nodes, calls))
+
+    # Each node is tried once, then traffic follows the lower latency
+    assert calls[:2] == ["slow", "fast"]
+    assert calls[2:] == ["fast"] * 3
+    assert pool.best().url == "fast"
+    await pool.close()
+
+@pytest.mark.asyncio
+async def test_failing_node_is_marked_down_and_skipped():
+    pool = RpcEndpointPool(["bad", "good"], failure_threshold=1, recheck_interval=60)
+    nodes = {"bad": node(fail=True), "good": node(0.01)}
+    calls = []
+
+    with pytest.raises(NodeDown):
+        await pool.call(routed(nodes, calls))
+    assert not pool.endpoints[0].healthy
+    assert [e.url for e in pool.ranked()] == ["good"]
+
+    assert await pool.call(routed(nodes, calls)) == "ok"
+    assert calls == ["bad", "good"]
+    await pool.close()
+
+@pytest.mark.asyncio
+async def test_hedge_fires_after_delay_and_takes_the_faster_answer():
+    pool = RpcEndpointPool(["primary", "backup"], hedge_default_delay=0.02, recheck_interval=60)
+    nodes = {"primary": node(0.5), "backup": node(0.0)}
+
+    result = await asyncio.wait_for(pool.call(routed(nodes), hedge=True), timeout=0.3)
+
+    assert result == "ok"
+    # The cancelled primary is charged for the time it spent
+    assert pool.endpoints[0].latency >= 0.02
+    assert pool.best().url == "backup"
+    await pool.close()
+
+@pytest.mark.asyncio
+async def test_no_hedge_when_primary_is_fast():
+    pool = RpcEndpointPool(["primary", "backup"], hedge_default_delay=0.2, recheck_interval=60)
+    calls = []
+
+    await pool.call(routed({"primary": node(0.0), "backup": node(0.0)}, calls), hedge=True)
+
+    assert calls == ["primary"]
+    await pool.close()
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_leak_the_primary_attempt():
+    pool = RpcEndpointPool(["primary", "backup"], hedge_default_delay=0.2, recheck_interval=60)
+    cancelled = []
+
+    async def primary():
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append("primary")
+            raise
+
+    call = asyncio.ensure_future(pool.call(routed({"primary": primary, "backup": node(0.0)}), hedge=True))
+    await asyncio.sleep(0.02)
+    call.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await call
+    await asyncio.sleep(0)
+    assert cancelled == ["primary"]
+    await pool.close()
+
+@pytest.mark.asyncio
+async def test_background_recheck_restores_down_node():
+    async def handler(request):
+        return web.json_response({"jsonrpc": "2.0", "id": 0, "result": "100"})
+
+    app = web.Application()
+    app.router.add_post("/", handler)
+    server = TestServer(app)
+    await server.start_server()
+    connections = ConnectionPoolManager()
+    url = str(server.make_url("/"))
+    pool = RpcEndpointPool([url, "other"], pool=connections, failure_threshold=1, recheck_interval=0.02)
+    try:
+        with pytest.raises(NodeDown):
+            await pool.call(routed({url: node(fail=True), "other": node()}))
+        assert not pool.endpoints[0].healthy
+
+        await asyncio.sleep(0.1)
+        assert pool.endpoints[0].healthy
+    finally:
+        await pool.close()
+        await connections.close()
+        await server.close()
+
+@pytest.mark.asyncio
+async def test_rejecting_node_leaves_rotation_and_stays_out():
+    async def forbidden(request):
+        return web.json_response({"error": "forbidden"}, status=403)
+
+    app = web.Application()
+    app.router.add_post("/", forbidden)
+    server = TestServer(app)
+    await server.start_server()
+    connections = ConnectionPoolManager()
+    url = str(server.make_url("/"))
+    pool = RpcEndpointPool([url, "other"], pool=connections, failure_threshold=1, recheck_interval=0.02)
+
+    async def send(target):
+        if target == "other":
+            return "ok"
+        session = await connections.get_session("sui_rpc")
+        async with session.post(target, json={}) as response:
+            response.raise_for_status()
+            return await response.json()
+
+    try:
+        with pytest.raises(Exception):
+            await pool.call(send)
+        assert not pool.endpoints[0].healthy
+        # Health probes get the same 403, so the recheck loop keeps it out
+        await asyncio.sleep(0.1)
+        assert not pool.endpoints[0].healthy
+        assert await pool.call(send) == "ok"
+    finally:
+        await pool.close()
+        await connections.close()
+        await server.close()
+
+@pytest.mark.asyncio
+async def test_rpc_error_counts_as_an_answer():
+    pool = RpcEndpointPool(["node"], failure_threshold=1, recheck_interval=60)
+
+    async def fn(url):
+        raise RpcError(-32602, "invalid params")
+
+    with pytest.raises(RpcError):
+        await pool.call(fn)
+    assert pool.endpoints[0].healthy
+    assert pool.endpoints[0].error_rate == 0.0
+    await pool.close()
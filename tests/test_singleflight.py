@@ -0,0 +1,84 @@
+import asyncio
+import pytest
+from unittest.mock import patch
+from src.utils.singleflight import SingleFlight
+from src.eliza.tools.price_tool import PriceTool
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_flight():
+    flight = SingleFlight("test-share")
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return {"price": 1.5}
+
+    results = await asyncio.gather(*(flight.do("sui", fetch) for _ in range(10)))
+
+    assert calls == 1
+    assert all(r == {"price": 1.5} for r in results)
+    stats = flight.stats()
+    assert stats["leaders"] == 1
+    assert stats["merged"] == 9
+    assert stats["in_flight"] == 0
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_waiter():
+    flight = SingleFlight("test-errors")
+
+    async def fetch():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream down")
+
+    results = await asyncio.gather(*(flight.do("sui", fetch) for _ in range(3)), return_exceptions=True)
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+@pytest.mark.asyncio
+async def test_different_keys_do_not_merge():
+    flight = SingleFlight("test-keys")
+    seen = []
+
+    async def fetch(key):
+        seen.append(key)
+        await asyncio.sleep(0.01)
+        return key
+
+    results = await asyncio.gather(flight.do("sui", lambda: fetch("sui")), flight.do("cetus", lambda: fetch("cetus")))
+
+    assert results == ["sui", "cetus"]
+    assert sorted(seen) == ["cetus", "sui"]
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_cancel_flight():
+    flight = SingleFlight("test-cancel")
+
+    async def fetch():
+        await asyncio.sleep(0.05)
+        return 42
+
+    first = asyncio.ensure_future(flight.do("sui", fetch))
+    second = asyncio.ensure_future(flight.do("sui", fetch))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await second == 42
+
+@pytest.mark.asyncio
+async def test_price_tool_coalesces_token_lookups():
+    tool = PriceTool()
+    calls = 0
+
+    async def fake_fetch(token, token_info):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.02)
+        return {"status": "success", "price": 1.0}
+
+    with patch.object(tool, "_fetch_token_price", side_effect=fake_fetch):
+        results = await asyncio.gather(*(tool._get_token_price("SUI") for _ in range(5)))
+
+    assert calls == 1
+    assert all(r["price"] == 1.0 for r in results)
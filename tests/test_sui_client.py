@@ -0,0 +1,145 @@
+import asyncio
+import time
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from src.blockchain.sui_client import SuiClient, DashboardSnapshot
+from src.blockchain.price_history import PriceHistoryStore
+from src.utils.http_pool import ConnectionPoolManager
+from src.utils.resilience import ResilienceRegistry
+from src.utils.rate_limiter import RateLimiterRegistry
+
+def make_app(routes):
+    app = web.Application()
+    for path, handler in routes.items():
+        app.router.add_route("*", path, handler)
+    return app
+
+def json_handler(payload, delay=0.0, status=200):
+    async def handler(request):
+        if delay:
+            await asyncio.sleep(delay)
+        return web.json_response(payload, status=status)
+    return handler
+
+@pytest_asyncio.fixture
+async def make_client():
+    servers = []
+    pools = []
+
+    async def factory(routes):
+        server = TestServer(make_app(routes))
+        await server.start_server()
+        servers.append(server)
+        pool = ConnectionPoolManager()
+        pools.append(pool)
+        client = SuiClient(
+            pool=pool,
+            resilience=ResilienceRegistry(base_delay=0.001),
+            rate_limiters=RateLimiterRegistry()
+        )
+        base = str(server.make_url("")).rstrip("/")
+        client.suivision_api = base
+        client.blockvision_api = base
+        return client
+
+    yield factory
+    for pool in pools:
+        await pool.close()
+    for server in servers:
+        await server.close()
+
+DASHBOARD_ROUTES = {
+    "/defi/tvl": json_handler({"projects": [{"name": "Cetus", "tvl": 100}]}),
+    "/defi/projects": json_handler({"projects": [{"name": "Navi", "volume": 5}]}),
+    "/coins/pairs": json_handler({"pairs": [{"pair": "SUI/USDC", "volume": 9}]}),
+    "/defi/pools": json_handler({"pools": [{"name": "SUI-USDC", "apr": 12}]}),
+    "/nfts/collections": json_handler({"collections": [{"name": "Capys", "volume": 3}]}),
+}
+
+@pytest.mark.asyncio
+async def test_dashboard_snapshot_fetches_all_endpoints(make_client):
+    client = await make_client(DASHBOARD_ROUTES)
+    async with client:
+        snapshot = await client.get_dashboard_snapshot()
+
+    assert isinstance(snapshot, DashboardSnapshot)
+    assert not snapshot.is_partial
+    assert snapshot.tvl_data[0].name == "Cetus"
+    assert snapshot.trading_pairs[0].pair == "SUI/USDC"
+    assert snapshot.nft_collections[0].name == "Capys"
+
+@pytest.mark.asyncio
+async def test_dashboard_snapshot_records_partial_failures(make_client):
+    routes = dict(DASHBOARD_ROUTES)
+    routes["/defi/pools"] = json_handler({}, status=500)
+    routes["/nfts/collections"] = json_handler({"collections": []}, delay=1.0)
+    client = await make_client(routes)
+
+    async with client:
+        snapshot = await client.get_dashboard_snapshot(timeout=0.2)
+
+    assert snapshot.is_partial
+    assert set(snapshot.errors) == {"farming_pools", "nft_collections"}
+    assert "500" in snapshot.errors["farming_pools"]
+    assert "timed out" in snapshot.errors["nft_collections"]
+    assert snapshot.farming_pools == []
+    assert snapshot.tvl_data[0].tvl == 100
+
+@pytest.mark.asyncio
+async def test_dashboard_snapshot_runs_endpoints_concurrently(make_client):
+    routes = {path: json_handler({"projects": [], "pairs": [], "pools": [], "collections": []}, delay=0.2)
+              for path in DASHBOARD_ROUTES}
+    client = await make_client(routes)
+
+    async with client:
+        start = asyncio.get_running_loop().time()
+        snapshot = await client.get_dashboard_snapshot(timeout=2)
+        elapsed = asyncio.get_running_loop().time() - start
+
+    assert not snapshot.is_partial
+    assert elapsed < 0.8
+
+@pytest.mark.asyncio
+async def test_token_prices_are_micro_batched(make_client):
+    requests = []
+
+    async def batch(request):
+        body = await request.json()
+        requests.append(body["tokens"])
+        return web.json_response({"prices": {token: 2.5 for token in body["tokens"] if token != "0xmissing"}})
+
+    client = await make_client({"/coins/prices/batch": batch})
+    async with client:
+        prices = await asyncio.gather(
+            client.get_token_price("0xsui"),
+            client.get_token_price("0xcetus"),
+            client.get_token_price("0xmissing"),
+        )
+
+    assert prices == [2.5, 2.5, 0.0]
+    assert len(requests) == 1
+    assert sorted(requests[0]) == ["0xcetus", "0xmissing", "0xsui"]
+
+@pytest.mark.asyncio
+async def test_price_history_fetches_only_the_missing_tail(make_client, tmp_path):
+    requested_days = []
+    now = time.time()
+
+    async def history(request):
+        requested_days.append(int(request.query["days"]))
+        points = [{"timestamp": now - hours * 3600, "price": 1.0 + hours} for hours in range(0, 24 * 7, 6)]
+        return web.json_response({"history": points})
+
+    client = await make_client({"/coins/price/history/{token}": history})
+    client.price_history = PriceHistoryStore(str(tmp_path))
+    client.cache = None
+    async with client:
+        first = await client.get_token_price_history("0xsui", days=7)
+        second = await client.get_token_price_history("0xsui", days=7)
+        day = await client.get_token_price_history("0xsui", days=1)
+
+    assert requested_days == [7]
+    assert len(first) == len(second) == 28
+    assert all(point["timestamp"] >= now - 86400 for point in day)
@@ -0,0 +1,112 @@
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from src.blockchain.decoding import RpcError
+from src.eliza.tools.sui_tool import SuiTool
+from src.utils.http_pool import ConnectionPoolManager
+from src.utils.rate_limiter import RateLimiterRegistry
+from src.utils.resilience import ResilienceRegistry
+
+def rpc_app(max_batch=None, received=None):
+    async def handler(request):
+        body = await request.json()
+        if received is not None:
+            received.append(body)
+        if isinstance(body, dict):
+            return web.json_response({"jsonrpc": "2.0", "id": body["id"], "result": body["method"]})
+        if max_batch is not None and len(body) > max_batch:
+            return web.json_response({
+                "jsonrpc": "2.0", "id": None,
+                "error": {"code": -32600, "message": f"Batch size limit {max_batch} exceeded"}
+            })
+        # Answer out of order to make sure results are matched by id
+        responses = []
+        for call in reversed(body):
+            if call["method"] == "sui_broken":
+                responses.append({"jsonrpc": "2.0", "id": call["id"],
+                                  "error": {"code": -32000, "message": "boom"}})
+            else:
+                responses.append({"jsonrpc": "2.0", "id": call["id"],
+                                  "result": [call["method"], call["params"]]})
+        return web.json_response(responses)
+
+    app = web.Application()
+    app.router.add_post("/", handler)
+    return app
+
+@pytest_asyncio.fixture
+async def make_tool():
+    servers = []
+    pools = []
+    tools = []
+
+    async def factory(**kwargs):
+        server = TestServer(rpc_app(**kwargs))
+        await server.start_server()
+        servers.append(server)
+        tool = SuiTool(str(server.make_url("/")))
+        tool.pool = ConnectionPoolManager()
+        pools.append(tool.pool)
+        tools.append(tool)
+        tool.resilience = ResilienceRegistry(base_delay=0.001)
+        tool.rate_limiters = RateLimiterRegistry()
+        return tool
+
+    yield factory
+    for tool in tools:
+        await tool.endpoints.close()
+    for pool in pools:
+        await pool.close()
+    for server in servers:
+        await server.close()
+
+@pytest.mark.asyncio
+async def test_batch_call_matches_responses_by_id(make_tool):
+    received = []
+    tool = await make_tool(received=received)
+
+    results = await tool.batch_call([
+        ("sui_getTotalSupply", []),
+        ("sui_broken", []),
+        ("sui_getObject", ["0x2"])
+    ])
+
+    assert len(received) == 1
+    assert results[0] == ["sui_getTotalSupply", []]
+    assert isinstance(results[1], RpcError) and results[1].message == "boom"
+    assert results[2] == ["sui_getObject", ["0x2"]]
+
+@pytest.mark.asyncio
+async def test_batch_call_splits_oversized_batches(make_tool):
+    received = []
+    tool = await make_tool(max_batch=4, received=received)
+
+    calls = [("sui_getObject", [str(i)]) for i in range(10)]
+    results = await tool.batch_call(calls)
+
+    assert [r[1] for r in results] == [[str(i)] for i in range(10)]
+    assert tool.batch_size <= 4
+    # Rejected batches are resent in halves until each call went out once in an accepted batch
+    assert sum(len(body) for body in received if len(body) <= 4) == 10
+
+@pytest.mark.asyncio
+async def test_batch_call_respects_configured_size(make_tool):
+    received = []
+    tool = await make_tool(received=received)
+    tool.batch_size = 3
+
+    await tool.batch_call([("sui_getObject", [str(i)]) for i in range(7)])
+
+    assert sorted(len(body) for body in received) == [1, 3, 3]
+
+@pytest.mark.asyncio
+async def test_overview_uses_one_round_trip(make_tool):
+    received = []
+    tool = await make_tool(received=received)
+
+    result = await tool._execute(action="get_overview")
+
+    assert result["status"] == "success"
+    assert result["metrics"]["total_supply"] == ["sui_getTotalSupply", []]
+    assert len(received) == 1
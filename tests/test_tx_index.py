@@ -0,0 +1,95 @@
+import threading
+import pytest
+from src.blockchain.decoding import SuiTransaction
+from src.blockchain.tx_index import TransactionIndex
+
+SUI = "0x2::sui::SUI"
+USDC = "0xusdc::usdc::USDC"
+BASE = 1_700_000_000
+
+def make_tx(digest, sender, ts, amount, coin_type=SUI, recipient="0xr"):
+    return SuiTransaction.from_rpc({
+        "digest": digest,
+        "checkpoint": "1",
+        "timestampMs": str((BASE + ts) * 1000),
+        "transaction": {"data": {"sender": sender}},
+        "effects": {"status": {"status": "success"}},
+        "balanceChanges": [
+            {"owner": {"AddressOwner": sender}, "coinType": coin_type, "amount": str(-amount)},
+            {"owner": {"AddressOwner": recipient}, "coinType": coin_type, "amount": str(amount)}
+        ]
+    })
+
+@pytest.fixture
+def index(tmp_path):
+    index = TransactionIndex(str(tmp_path / "db" / "tx.sqlite3"), retention=100)
+    yield index
+    index.close()
+
+def test_index_uses_wal_and_skips_duplicates(index):
+    tx = make_tx("a", "0x1", 0, 5)
+    index.add([tx, tx])
+    index.add([tx])
+    assert index._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert index._conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0] == 1
+    assert index._conn.execute("SELECT COUNT(*) FROM balance_changes").fetchone()[0] == 2
+
+def test_activity_queries(index):
+    index.add([
+        make_tx("a", "0x1", 0, 5),
+        make_tx("b", "0x1", 10, 500),
+        make_tx("c", "0x2", 20, 50),
+        make_tx("d", "0x3", 30, 2_000, coin_type=USDC),
+        # Above the signed 64-bit range SQLite integers can hold
+        make_tx("e", "0x3", 40, 2**64 - 1, coin_type=USDC)
+    ])
+
+    assert index.latest_timestamp() == BASE + 40
+    assert index.has_activity_since(BASE + 40)
+    assert not index.has_activity_since(BASE + 41)
+    assert [t["digest"] for t in index.large_transfers(SUI, min_amount=50)] == ["b", "c"]
+    assert index.large_transfers(USDC, limit=1)[0]["amount"] == 2**64 - 1
+    assert [t["digest"] for t in index.large_transfers(SUI, since=BASE + 15)] == ["c"]
+    whales = index.whale_transfers({SUI: 100, USDC: 1_000})
+    assert [t["digest"] for t in whales] == ["e", "d", "b"]
+    assert index.top_senders(limit=2) == [
+        {"address": "0x1", "transactions": 2}, {"address": "0x3", "transactions": 2}
+    ]
+    assert index.active_accounts(since=BASE + 10) == 3
+    assert [t["digest"] for t in index.recent_transactions(2)] == ["e", "d"]
+
+def test_prune_drops_rows_past_retention(index):
+    index.add([make_tx("old", "0x1", 0, 5), make_tx("new", "0x1", 150, 5)])
+    assert index.prune(now=BASE + 200) == 3
+    assert [t["digest"] for t in index.recent_transactions()] == ["new"]
+    assert index.prune(now=BASE + 200) == 0
+
+@pytest.mark.asyncio
+async def test_follower_consumer_and_other_readers(tmp_path):
+    path = str(tmp_path / "tx.sqlite3")
+    writer = TransactionIndex(path, retention=10**12)
+    reader = TransactionIndex(path)
+    try:
+        await writer(1, [make_tx("a", "0x1", 0, 5)])
+        assert [t["digest"] for t in reader.recent_transactions()] == ["a"]
+    finally:
+        writer.close()
+        reader.close()
+
+@pytest.mark.asyncio
+async def test_ingestion_writes_on_the_writer_thread(tmp_path):
+    index = TransactionIndex(str(tmp_path / "tx.sqlite3"), retention=10**12)
+    writers = []
+    ingest = index._ingest
+
+    def recording_ingest(transactions):
+        writers.append(threading.current_thread().name)
+        ingest(transactions)
+
+    index._ingest = recording_ingest
+    try:
+        await index(1, [make_tx("a", "0x1", 0, 5)])
+        assert writers and writers[0].startswith("tx-index-writer")
+        assert [t["digest"] for t in index.recent_transactions()] == ["a"]
+    finally:
+        index.close()